@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import os
@@ -107,9 +109,14 @@ def run_eval_case(case, *, now) -> dict:
     }
 
 
-def run_all(*, now) -> dict:
+def run_all(*, now, max_workers: int | None = None) -> dict:
     cases = load_cases()
-    result = [run_eval_case(c, now=now) for c in cases]
+    if max_workers and max_workers > 1 and len(cases) > 1:
+        # Cases are independent; map() keeps results in case order.
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            result = list(pool.map(lambda c: run_eval_case(c, now=now), cases))
+    else:
+        result = [run_eval_case(c, now=now) for c in cases]
     total = len(result)
     passed = sum(1 for r in result if r["pass"])
     failed = total - passed
@@ -149,7 +156,7 @@ def format_report(out: dict) -> str:
 
     return "\n".join(lines)
 
-def write_eval_report(out: dict, *, day: str, run_id: str | None = None) -> str:
+def write_eval_report(out: dict, *, day: str, run_id: str | None = None, summary_stats: dict | None = None) -> str:
     os.makedirs("artifacts", exist_ok=True)
     path = os.path.join("artifacts", f"eval_report_{day}.md")
 
@@ -159,16 +166,13 @@ def write_eval_report(out: dict, *, day: str, run_id: str | None = None) -> str:
     pass_rate = (passed / total) if total else 0.0
 
     # Breakdown by error_code
-    breakdown: dict[str, int] = {}
-    for r in out["results"]:
-        if r["pass"]:
-            continue
-        code = r.get("error_code") or "UNKNOWN"
-        breakdown[code] = breakdown.get(code, 0) + 1
+    breakdown: dict[str, int] = dict(Counter(
+        r.get("error_code") or "UNKNOWN" for r in out["results"] if not r["pass"]
+    ))
 
-    # Run summary quality evals
-    summary_results = run_summary_cases()
-    summary_stats = summarize_summary_results(summary_results)
+    # Run summary quality evals (unless the caller already has them)
+    if summary_stats is None:
+        summary_stats = summarize_summary_results(run_summary_cases())
 
     # Calculate combined totals
     combined_total = total + summary_stats["total"]
@@ -5,11 +5,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import argparse
-import json
 import os
 
 from datetime import date, datetime, timezone
-from src.db import get_conn, init_db
+from src.db import db_conn, get_conn, init_db
 from src.repo import (
     get_news_items_by_date,
     get_run_by_day,
@@ -17,13 +16,10 @@ from src.repo import (
     get_cached_summary,
     insert_cached_summary,
     update_run_llm_stats,
-    get_positive_feedback_items,
-    get_all_historical_items,
 )
-from src.ai_score import build_tfidf_model, compute_ai_scores
 from src.scoring import rank_items
 from src.explain import explain_item
-from src.views import get_effective_rank_config
+from src.views import get_effective_rank_config, compute_item_ai_scores
 from src.artifacts import render_digest_html
 from src.clients.llm_openai import summarize, MODEL
 from src.grounding import validate_grounding
@@ -57,13 +53,7 @@ def main(argv: list[str] | None = None) -> int:
         cfg = get_effective_rank_config(conn, user_id=user_id)
 
         # Compute ai_scores (Milestone 3c)
-        # Fit TF-IDF on all historical items (richer vocabulary), similarity against positives only
-        corpus = get_all_historical_items(conn, as_of_date=day)
-        positives = get_positive_feedback_items(conn, as_of_date=day, user_id=user_id)
-        model = build_tfidf_model(corpus) if corpus else None
-        item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in items]
-        scores = compute_ai_scores(model, positives, item_dicts)
-        ai_scores = {item_dicts[i]["url"]: scores[i] for i in range(len(scores))}
+        ai_scores = compute_item_ai_scores(conn, items, as_of_date=day, user_id=user_id)
 
         ranked = rank_items(items, now=now, top_n=top_n, cfg=cfg, ai_scores=ai_scores)
         explanations = [explain_item(it, now=now, cfg=cfg) for it in ranked]
@@ -89,8 +79,7 @@ def main(argv: list[str] | None = None) -> int:
             cached = get_cached_summary(conn, cache_key=cache_key)
             if cached:
                 # CACHE HIT - deserialize and use
-                cached_data = json.loads(cached["summary_json"])
-                result = SummaryResult(**cached_data)
+                result = SummaryResult.model_validate_json(cached["summary_json"])
                 log_event("llm_cache_hit", cache_key=cache_key, saved_cost_usd=cached["cost_usd"], saved_latency_ms=cached["latency_ms"])
                 #Update run stats
                 llm_stats["cache_hits"] +=1
@@ -106,7 +95,7 @@ def main(argv: list[str] | None = None) -> int:
                         conn,
                         cache_key=cache_key,
                         model_name=MODEL,
-                        summary_json=json.dumps(validated.model_dump()),
+                        summary_json=validated.model_dump_json(),
                         prompt_tokens=usage["prompt_tokens"],
                         completion_tokens=usage["completion_tokens"],
                         cost_usd=usage["cost_usd"],
@@ -151,12 +140,8 @@ def main(argv: list[str] | None = None) -> int:
 
     # 3. Record artifact (fresh connection)
     if run:
-        conn2 = get_conn()
-        try:
-            init_db(conn2)
+        with db_conn(fresh=True) as conn2:
             insert_run_artifact(conn2, run_id=run["run_id"], kind="digest", path=path)
-        finally:
-            conn2.close()
 
     print(f"WROTE path={path} count={len(ranked)}")
     return 0
@@ -5,13 +5,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import argparse
-import json
 import os
 import time
 import uuid
 from datetime import date, datetime, time as dt_time, timezone
 
-from src.db import get_conn, init_db
+from src.db import db_conn, get_conn, init_db
 from src.error_codes import PARSE_ERROR
 from src.feeds import FEEDS
 from src.logging_utils import log_event
@@ -23,7 +22,7 @@ from src.weekly_report import write_weekly_report
 # Ranking + explanation
 from src.scoring import rank_items
 from src.explain import explain_item
-from src.views import get_effective_rank_config
+from src.views import get_effective_rank_config, compute_item_ai_scores
 
 # LLM summarization + caching
 from src.clients.llm_openai import summarize, MODEL
@@ -51,10 +50,7 @@ from src.repo import (
     insert_cached_summary,
     insert_run_artifact,
     update_run_llm_stats,
-    get_positive_feedback_items,
-    get_all_historical_items,
 )
-from src.ai_score import build_tfidf_model, compute_ai_scores
 
 TOP_N = 10  # Number of items to rank and summarize
 
@@ -81,12 +77,8 @@ def main() -> int:
     # Handle --all-users mode
     if args.all_users:
         from src.repo import get_all_users
-        conn = get_conn()
-        try:
-            init_db(conn)
+        with db_conn(fresh=True) as conn:
             users = get_all_users(conn)
-        finally:
-            conn.close()
 
         if not users:
             print("NO_USERS: No users found in database")
@@ -257,13 +249,7 @@ def run_for_user(day: str, mode: str, force: bool, user_id: str | None) -> int:
         cfg = get_effective_rank_config(conn, user_id=user_id)
         try:
             # Compute ai_scores (Milestone 3c)
-            # Fit TF-IDF on all historical items (richer vocabulary), similarity against positives only
-            corpus = get_all_historical_items(conn, as_of_date=day)
-            positives = get_positive_feedback_items(conn, as_of_date=day, user_id=user_id)
-            model = build_tfidf_model(corpus) if corpus else None
-            item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in deduped]
-            scores = compute_ai_scores(model, positives, item_dicts)
-            ai_scores = {item_dicts[i]["url"]: scores[i] for i in range(len(scores))}
+            ai_scores = compute_item_ai_scores(conn, deduped, as_of_date=day, user_id=user_id)
 
             ranked = rank_items(deduped, now=now, top_n=TOP_N, cfg=cfg, ai_scores=ai_scores)
             explanations = [explain_item(it, now=now, cfg=cfg) for it in ranked]
@@ -295,7 +281,7 @@ def run_for_user(day: str, mode: str, force: bool, user_id: str | None) -> int:
                 cached = get_cached_summary(conn, cache_key=cache_key)
 
                 if cached:
-                    result = SummaryResult(**json.loads(cached["summary_json"]))
+                    result = SummaryResult.model_validate_json(cached["summary_json"])
                     llm_stats["cache_hits"] += 1
                     llm_stats["saved_cost_usd"] += cached["cost_usd"]
                 else:
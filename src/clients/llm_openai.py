@@ -2,17 +2,20 @@ from __future__ import annotations
 
 import json
 import os 
+import random
 import time 
 import urllib.request 
 import urllib.error 
 
+from pydantic import BaseModel, ValidationError
+
 from src.schemas import NewsItem
 from src.llm_schemas.summary import SummaryResult
-from src.json_utils import safe_parse_json
-from src.logging_utils import log_event
-from src.error_codes import LLM_PARSE_FAIL, LLM_API_FAIL, LLM_DISABLED, COST_BUDGET_EXCEEDED
-from src.db import db_conn
-from src.repo import get_daily_spend
+from src.json_utils import safe_parse_json, strip_code_fences
+from src.logging_utils import log_event, log_event_deferred
+from src.error_codes import (
+    LLM_PARSE_FAIL, LLM_API_FAIL, LLM_DISABLED, COST_BUDGET_EXCEEDED, NO_EVIDENCE,
+)
 
 
 #Config
@@ -27,29 +30,38 @@ COST_PER_1K_COMPLETION = 0.0006
 # Daily spend cap (default $1.00, configurable via env var)
 LLM_DAILY_CAP_USD = float(os.environ.get("LLM_DAILY_CAP_USD", "5.00"))
 
-SYSTEM_PROMPT = """You are a news summarization assistant. Given a news item and evidence, produce a JSON object.       
-
-STRICT RULES (violations will be rejected):
-1. Use ONLY the provided evidence. Do not use prior knowledge or external information.
-2. If evidence is insufficient to write a factual summary, return: {"refusal": "insufficient evidence"}
-3. Every factual claim in the summary MUST have a citation.
-4. Citation evidence_snippet MUST be an EXACT quote from the provided evidence (copy-paste, not paraphrase).
-5. Do not infer, extrapolate, or add information not explicitly stated in evidence.
-
-Output JSON structure:
-{
-"summary": "1-2 sentence summary using only provided evidence",
-"tags": ["tag1", "tag2"],
-"citations": [
-    {"source_url": "the item's URL", "evidence_snippet": "EXACT quote from evidence"}
-],
-"confidence": 0.0 to 1.0
+SYSTEM_PROMPT = """Summarize the news item as JSON using ONLY the provided evidence.
+Rules: no prior knowledge or inference; cite every claim; evidence_snippet must be an EXACT quote from the evidence.
+If evidence is insufficient or any rule can't be met, return {"refusal": "insufficient evidence"}.
+Output: {"summary": "1-2 sentences", "tags": ["tag"], "citations": [{"source_url": "item URL", "evidence_snippet": "exact quote"}], "confidence": 0.0-1.0}
+JSON only, no markdown.
+"""
+
+# Static request pieces, built once at import instead of per call
+# Evidence first, item metadata last: the provider caches shared prompt
+# prefixes, so the stable part has to lead.
+_USER_TEMPLATE = (
+    "Evidence:\n{evidence}\n\n"
+    "News item:\nTitle: {title}\nSource: {source}\nURL: {url}\nPublished: {published}\n"
+)
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+# JSON mode constrains the model to emit a valid JSON object, so the
+# fix-JSON retry in summarize() is only a rare fallback.
+_SUMMARY_PARAMS = {
+    "model": MODEL,
+    "temperature": 0.0,
+    "max_tokens": 500,
+    "response_format": {"type": "json_object"},
 }
 
-If you cannot comply with all rules, return: {"refusal": "reason"}
 
-Respond with ONLY the JSON object. No markdown, no explanation, no preamble.
-"""
+def _headers() -> dict:
+    """Request headers for the OpenAI API (key read at call time so it can be patched)."""
+    return {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
 
 def summarize(item: NewsItem, evidence: str, *, day: str | None = None) -> tuple[SummaryResult, dict]:
     """
@@ -77,15 +89,26 @@ def summarize(item: NewsItem, evidence: str, *, day: str | None = None) -> tuple
         log_event("llm_disabled", reason="OPENAI_API_KEY not set")
         return _refuse(LLM_DISABLED)
 
-    # Check daily spend cap if day is provided
+    # Nothing to cite: validate_grounding would refuse NO_EVIDENCE anyway,
+    # so skip the round trip. Short (but non-empty) RSS blurbs still go through.
+    if not evidence or not evidence.strip():
+        log_event("llm_skip_no_evidence", url=str(item.url))
+        return _refuse(NO_EVIDENCE)
+
+    # Check daily spend cap if day is provided.
+    # Includes a local worst-case estimate for this call, so a call that
+    # would push spend over the cap is refused before the round trip.
     if day is not None:
-        with db_conn() as conn:
-            daily_spend = get_daily_spend(conn, day=day)
-        if daily_spend >= LLM_DAILY_CAP_USD:
-            log_event("llm_budget_exceeded", day=day, spend=daily_spend, cap=LLM_DAILY_CAP_USD)
+        daily_spend = _daily_spend(day)
+        projected = _compute_cost(
+            _estimate_prompt_tokens(item, evidence), _SUMMARY_PARAMS["max_tokens"]
+        )
+        if daily_spend + projected > LLM_DAILY_CAP_USD:
+            log_event("llm_budget_exceeded", day=day, spend=daily_spend,
+                      projected=projected, cap=LLM_DAILY_CAP_USD)
             return _refuse(COST_BUDGET_EXCEEDED)
     
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
 
     # Attempt 1: call API
     try:
@@ -141,6 +164,135 @@ def summarize(item: NewsItem, evidence: str, *, day: str | None = None) -> tuple
     
 
 
+# --- Batched summaries ---
+# One request for up to _MAX_BATCH items shares the system prompt and a
+# single round trip. JSON mode only allows a top-level object, so results
+# come back wrapped as {"results": [...]}, in input order.
+
+_MAX_BATCH = 10
+
+_BATCH_INSTRUCTION = (
+    "Summarize each item below independently, following the rules for each. "
+    'Return {"results": [...]} with exactly one output object per item, in item order.'
+)
+
+
+class _BatchResponse(BaseModel):
+    results: list[SummaryResult]
+
+
+def summarize_batch(
+    items: list[NewsItem], evidences: list[str], *, day: str | None = None
+) -> list[tuple[SummaryResult, dict]]:
+    """
+    Summarize several items with one API call per chunk of _MAX_BATCH.
+
+    Same contract as summarize(), per item: returns one (SummaryResult,
+    usage_dict) per input, in order, and never raises. A chunk's usage is
+    split evenly across its items. If a chunk fails or its response can't
+    be matched back to the items, those items fall back to summarize().
+    """
+    if len(items) != len(evidences):
+        raise ValueError("items and evidences must have the same length")
+
+    if not OPENAI_API_KEY:
+        log_event("llm_disabled", reason="OPENAI_API_KEY not set")
+        return [_refuse(LLM_DISABLED) for _ in items]
+
+    out: list[tuple[SummaryResult, dict] | None] = [None] * len(items)
+    pending = []
+    for i, (item, evidence) in enumerate(zip(items, evidences)):
+        if not evidence or not evidence.strip():
+            log_event("llm_skip_no_evidence", url=str(item.url))
+            out[i] = _refuse(NO_EVIDENCE)
+        else:
+            pending.append(i)
+
+    for start in range(0, len(pending), _MAX_BATCH):
+        chunk = pending[start:start + _MAX_BATCH]
+        results = _summarize_chunk([items[i] for i in chunk], [evidences[i] for i in chunk], day=day)
+        if results is None:
+            results = [summarize(items[i], evidences[i], day=day) for i in chunk]
+        for i, result in zip(chunk, results):
+            out[i] = result
+
+    return out
+
+
+def _summarize_chunk(
+    items: list[NewsItem], evidences: list[str], *, day: str | None
+) -> list[tuple[SummaryResult, dict]] | None:
+    """One batched call. Returns None when the caller should fall back per item."""
+    n = len(items)
+    max_tokens = _SUMMARY_PARAMS["max_tokens"] * n
+
+    if day is not None:
+        daily_spend = _daily_spend(day)
+        projected = _compute_cost(
+            sum(_estimate_prompt_tokens(it, ev) for it, ev in zip(items, evidences)), max_tokens
+        )
+        if daily_spend + projected > LLM_DAILY_CAP_USD:
+            log_event("llm_budget_exceeded", day=day, spend=daily_spend,
+                      projected=projected, cap=LLM_DAILY_CAP_USD)
+            return [_refuse(COST_BUDGET_EXCEEDED) for _ in items]
+
+    blocks = [_BATCH_INSTRUCTION]
+    for k, (item, evidence) in enumerate(zip(items, evidences), start=1):
+        blocks.append(f"[{k}]\n" + _render_item(item, evidence))
+    messages = [_SYSTEM_MESSAGE, {"role": "user", "content": "\n".join(blocks)}]
+
+    t0 = time.perf_counter_ns()
+    try:
+        raw, usage = _post_chat(
+            messages, params={**_SUMMARY_PARAMS, "max_tokens": max_tokens}, timeout=30.0 + 5.0 * n
+        )
+    except Exception as exc:
+        _log_call(latency_ms=_elapsed_ms(t0), status="batch_api_fail", batch_size=n, error=str(exc))
+        return None
+
+    latency = _elapsed_ms(t0)
+    text = strip_code_fences(raw)
+    try:
+        parsed = _BatchResponse.model_validate_json(text or "")
+    except ValidationError:
+        parsed = None
+
+    if parsed is None or len(parsed.results) != n:
+        _log_call(latency_ms=latency, status="batch_parse_fail", batch_size=n, **usage)
+        return None
+
+    _log_call(latency_ms=latency, status="ok_batch", batch_size=n, **usage)
+    shares = _split_usage(usage, latency, n)
+    return list(zip(parsed.results, shares))
+
+
+def _split_usage(usage: dict, latency_ms: int, n: int) -> list[dict]:
+    """Divide one call's usage across n items; integer remainders go to the first item."""
+    prompt, completion = usage["prompt_tokens"], usage["completion_tokens"]
+    shares = []
+    for k in range(n):
+        p = prompt // n + (prompt % n if k == 0 else 0)
+        c = completion // n + (completion % n if k == 0 else 0)
+        shares.append({
+            "prompt_tokens": p,
+            "completion_tokens": c,
+            "cost_usd": _compute_cost(p, c),
+            "latency_ms": latency_ms,
+        })
+    return shares
+
+
+def _daily_spend(day: str) -> float:
+    """Spend so far on day, read through this thread's pooled connection."""
+    # Imported on first budget check: callers that only need prompts/parsing
+    # (views, scripts) don't pull in the DB layer.
+    from src.db import db_conn
+    from src.repo import get_daily_spend
+
+    with db_conn() as conn:
+        return get_daily_spend(conn, day=day)
+
+
 def _refuse(reason: str) -> tuple[SummaryResult, dict]:
     """Return a valid SummaryResult with refusal, plus zero usage."""
     return SummaryResult(refusal=reason), {
@@ -152,56 +304,53 @@ def _refuse(reason: str) -> tuple[SummaryResult, dict]:
 
 def _try_parse(raw):
     """Attempt to parse raw LLM output into SummaryResults. Returns None on failure"""
-    data = safe_parse_json(raw)
-    if data is None:
+    text = strip_code_fences(raw)
+    if text is None:
         return None
 
+    # Single pass: pydantic decodes and validates without an intermediate dict
     try:
-        return SummaryResult(**data)
-    except Exception:
+        return SummaryResult.model_validate_json(text)
+    except ValidationError:
         return None
 
 
-def _call_openai(item: NewsItem, evidence: str) -> tuple[str, dict]:
-    """Make OpenAI API call. Returns (response_text, usage_dict). Raises on error."""
-    user_content = f"""News item:
-Title: {item.title}
-Source: {item.source}
-URL: {item.url}
-Published: {item.published_at.isoformat()}
-
-Evidence:
-{evidence}
-"""
-    payload = {
-        "model": MODEL,
-        "messages": [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_content}
-        ],
-        "temperature": 0.0,
-        "max_tokens": 500
-    }
+def _render_item(item: NewsItem, evidence: str) -> str:
+    """Fill _USER_TEMPLATE for one item."""
+    return _USER_TEMPLATE.format_map({
+        "evidence": evidence,
+        "title": item.title,
+        "source": item.source,
+        "url": item.url,
+        "published": item.published_at.isoformat(),
+    })
+
+
+def _post_chat(messages: list[dict], *, params: dict = _SUMMARY_PARAMS,
+               timeout: float = 30.0) -> tuple[str, dict]:
+    """
+    Single entry point for chat completion requests.
+
+    Builds the payload from params + messages, sends it with transient-error
+    retries, and returns (response_text, usage_dict). Raises on error.
+    """
+    payload = {**params, "messages": messages}
 
     req = urllib.request.Request(
         OPENAI_URL,
-        data=json.dumps(payload).encode("utf-8"),
-        headers ={
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        data=json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+        headers=_headers()
     )
 
-    with urllib.request.urlopen(req, timeout=30.0) as resp:
-        body = json.loads(resp.read().decode("utf-8"))
+    with _urlopen(req, timeout=timeout) as resp:
+        return _read_completion(resp)
 
-    content = body["choices"][0]["message"]["content"]
-    usage = body.get("usage", {})
 
-    return content, {
-        "prompt_tokens": usage.get("prompt_tokens", 0),
-        "completion_tokens": usage.get("completion_tokens", 0)
-    }
+def _call_openai(item: NewsItem, evidence: str) -> tuple[str, dict]:
+    """Make OpenAI API call. Returns (response_text, usage_dict). Raises on error."""
+    return _post_chat(
+        [_SYSTEM_MESSAGE, {"role": "user", "content": _render_item(item, evidence)}]
+    )
 
 
 def _call_openai_fix(malformed_json: str) -> tuple[str, dict]:
@@ -218,32 +367,53 @@ Malformed JSON: {malformed_json}
 
 Return ONLY the corrected JSON, nothing else.
 """
-    
-    payload = {
-        "model": MODEL,
-        "messages": [{"role": "user", "content": fix_prompt}],
-        "temperature": 0.0,
-        "max_tokens": 500
-    }
-    
-    req = urllib.request.Request(
-        OPENAI_URL,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
-    )
+    return _post_chat([{"role": "user", "content": fix_prompt}])
 
-    with urllib.request.urlopen(req, timeout=30.0) as resp:
-        body = json.loads(resp.read().decode("utf-8"))
 
-    content = body["choices"][0]["message"]["content"]
+# Transient statuses worth a short retry; other 4xx fail immediately.
+_TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+_MAX_ATTEMPTS = 3
+_MAX_BACKOFF_S = 2.0
+
+
+def _urlopen(req: urllib.request.Request, *, timeout: float):
+    """
+    urlopen with exponential backoff + jitter on 429/5xx.
+
+    Honors Retry-After (capped at _MAX_BACKOFF_S). Non-HTTP errors and the
+    final failed attempt are re-raised for the caller to handle.
+    """
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            return urllib.request.urlopen(req, timeout=timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code not in _TRANSIENT_STATUS or attempt == _MAX_ATTEMPTS - 1:
+                raise
+            delay = min(2 ** attempt * 0.2, _MAX_BACKOFF_S) + random.random() * 0.1
+            retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            if retry_after and retry_after.isdigit():
+                delay = min(float(retry_after), _MAX_BACKOFF_S)
+            log_event_deferred("llm_http_retry", status=exc.code, attempt=attempt + 1,
+                               delay_s=round(delay, 3))
+            time.sleep(delay)
+
+
+def _read_completion(resp) -> tuple[str, dict]:
+    """
+    Parse a chat completion response into (content, usage_dict).
+
+    Only the message content and token counts are kept; the rest of the
+    body (ids, logprobs, metadata) is dropped as soon as this returns.
+    Bodies are small (max_tokens caps completions), so a single json.loads
+    is cheaper than a streaming parser.
+    """
+    body = json.loads(resp.read())
     usage = body.get("usage", {})
-    
-    return content, {
+    details = usage.get("prompt_tokens_details") or {}
+    return body["choices"][0]["message"]["content"], {
         "prompt_tokens": usage.get("prompt_tokens", 0),
-        "completion_tokens": usage.get("completion_tokens", 0)
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "cached_tokens": details.get("cached_tokens", 0)
     }
 
 
@@ -251,23 +421,27 @@ def _merge_usage(u1: dict, u2: dict) -> dict:
     """Combine token counts from two API calls."""
     return {
         "prompt_tokens": u1.get("prompt_tokens", 0) + u2.get("prompt_tokens", 0),
-        "completion_tokens": u1.get("completion_tokens", 0) + u2.get("completion_tokens", 0)
+        "completion_tokens": u1.get("completion_tokens", 0) + u2.get("completion_tokens", 0),
+        "cached_tokens": u1.get("cached_tokens", 0) + u2.get("cached_tokens", 0)
     }
 
 
 def _log_call(*, latency_ms: int, status: str, 
-            prompt_tokens: int = 0, completion_tokens: int = 0, **extra):
+            prompt_tokens: int = 0, completion_tokens: int = 0,
+            cached_tokens: int = 0, **extra):
     """Log every LLM call with cost + latency."""
     total_tokens = prompt_tokens + completion_tokens
     cost_usd = (prompt_tokens / 1000 * COST_PER_1K_PROMPT + 
                 completion_tokens / 1000 * COST_PER_1K_COMPLETION)
     
     # TODO: attach run_id when summarize() is called from pipeline context
-    log_event("llm_call",
+    # Deferred: this runs on every call, keep serialization off the hot path
+    log_event_deferred("llm_call",
         model=MODEL,
         prompt_tokens=prompt_tokens,
         completion_tokens=completion_tokens,
         total_tokens=total_tokens,
+        cached_tokens=cached_tokens,
         latency_ms=latency_ms,
         cost_usd=round(cost_usd, 6),
         cache_hit=False,
@@ -276,9 +450,23 @@ def _log_call(*, latency_ms: int, status: str,
     )
 
 
-def _elapsed_ms(t0: float) -> int:
-    """Calculate elapsed milliseconds since t0."""
-    return int((time.perf_counter() - t0) * 1000)
+# Local token estimate (OpenAI's ~4 chars/token rule of thumb for English).
+# Only used for the pre-call budget check; billing uses server-reported usage.
+_CHARS_PER_TOKEN = 4
+_SYSTEM_PROMPT_TOKENS = len(SYSTEM_PROMPT) // _CHARS_PER_TOKEN
+_USER_TEMPLATE_TOKENS = 20  # "News item:/Title:/Source:/..." labels + message framing
+
+
+def _estimate_prompt_tokens(item: NewsItem, evidence: str) -> int:
+    """Estimate prompt tokens for a summarize call without calling the API."""
+    chars = (len(item.title) + len(item.source) + len(str(item.url))
+             + len(item.published_at.isoformat()) + len(evidence or ""))
+    return _SYSTEM_PROMPT_TOKENS + _USER_TEMPLATE_TOKENS + chars // _CHARS_PER_TOKEN
+
+
+def _elapsed_ms(t0_ns: int) -> int:
+    """Milliseconds since t0_ns (a time.perf_counter_ns() reading)."""
+    return (time.perf_counter_ns() - t0_ns) // 1_000_000
 
 def _compute_cost(prompt_tokens: int, completion_tokens: int) -> float:
     """Compute cost in USD from token counts."""
@@ -305,7 +493,7 @@ def _sanitize_tag(tag: str) -> str | None:
     tag_lower = tag.lower()
     for blocked in _TAG_BLOCKLIST:
         if blocked in tag_lower:
-            log_event("tag_blocked", tag=tag, reason="blocklist")
+            log_event_deferred("tag_blocked", tag=tag, reason="blocklist")
             return None
     return tag
 
@@ -327,6 +515,13 @@ Return ONLY a JSON array. No markdown.
 """
 
 
+_TAG_PARAMS = {
+    "model": MODEL,
+    "temperature": 0.3,  # Slight variation for diverse tags
+    "max_tokens": 100,
+}
+
+
 def suggest_feedback_tags(item: NewsItem) -> list[str]:
     """
     Suggest 3-5 feedback tags for an item using LLM.
@@ -347,33 +542,19 @@ def suggest_feedback_tags(item: NewsItem) -> list[str]:
         log_event("tag_suggestion_disabled", reason="OPENAI_API_KEY not set")
         return ["Other"]
 
-    t0 = time.perf_counter()
+    if not item.title or not item.title.strip():
+        log_event("tag_suggestion_skipped", reason="empty title", url=str(item.url))
+        return ["Other"]
+
+    t0 = time.perf_counter_ns()
 
     try:
         prompt = TAG_SUGGESTION_PROMPT.format(title=item.title, source=item.source)
 
-        payload = {
-            "model": MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3,  # Slight variation for diverse tags
-            "max_tokens": 100
-        }
-
-        req = urllib.request.Request(
-            OPENAI_URL,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            }
+        content, usage = _post_chat(
+            [{"role": "user", "content": prompt}], params=_TAG_PARAMS, timeout=15.0
         )
 
-        with urllib.request.urlopen(req, timeout=15.0) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
-
-        content = body["choices"][0]["message"]["content"]
-        usage = body.get("usage", {})
-
         # Parse JSON array
         tags = safe_parse_json(content)
 
@@ -397,7 +578,7 @@ def suggest_feedback_tags(item: NewsItem) -> list[str]:
         latency = _elapsed_ms(t0)
         cost = _compute_cost(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
 
-        log_event("tag_suggestion_ok",
+        log_event_deferred("tag_suggestion_ok",
             model=MODEL,
             tags=valid_tags,
             latency_ms=latency,
@@ -1,33 +1,163 @@
 # src/db.py
 from __future__ import annotations
 
+import atexit
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+from src.logging_utils import log_event
+
 
 class InvalidDbPathError(Exception):
     """Raised when NEWS_DB_PATH points to an invalid location."""
     pass
 
 
+# Applied to every connection right after connect, in one executescript call.
+# WAL lets readers (HTTP handlers) run while a writer (ingest) commits, and
+# synchronous=NORMAL is durable under WAL with one fsync per checkpoint
+# instead of two per commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",       # ~64 MB page cache
+    "PRAGMA mmap_size=268435456",     # 256 MB
+)
+
+# How long a connection waits on a locked DB before raising "database is
+# locked". SQLite retries internally, so concurrent writers (ingest + feedback
+# handlers) queue up instead of failing. 5s default; tune via env.
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+# sqlite3 keeps an LRU of prepared statements per connection, keyed by SQL
+# text; a hit skips SQLite's parser and only rebinds parameters. With pooled
+# connections the cache survives across requests. Sized above the ~90
+# distinct statements in repo.py so dynamic IN (...) queries don't evict
+# the hot ones.
+STATEMENT_CACHE_SIZE = 256
+
+# NEWS_DB_SHARED_CACHE=1 opens connections through a file: URI with
+# cache=shared, so all connections in the process share one page cache
+# instead of one per connection. Off by default: SQLite discourages shared
+# cache, it serializes writers at table level on top of WAL, and a writer
+# can then block readers with SQLITE_LOCKED. Benchmark before enabling.
+
+# WAL needs shared memory, which network filesystems don't provide reliably.
+_NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "fuse.sshfs"}
+
+
 @contextmanager
-def db_conn():
+def db_conn(*, fresh: bool = False):
     """
     Context manager for database connections.
-    Opens connection, initializes schema, yields connection, closes on exit.
+
+    By default each thread reuses one pooled connection (schema already
+    initialized) and the connection stays open on exit. Uncommitted work is
+    rolled back when the outermost block exits, matching what close() did.
+    fresh=True opens a dedicated connection and closes it on exit, for
+    scripts/migrations that shouldn't share state.
 
     Usage:
         with db_conn() as conn:
             # use conn
     """
-    conn = get_conn()
+    if fresh:
+        conn = get_conn()
+        try:
+            init_db(conn)
+            yield conn
+        finally:
+            _optimize_and_close(conn)
+        return
+
+    conn = _pooled_conn()
+    _pool.depth += 1
     try:
-        init_db(conn)
         yield conn
     finally:
+        _pool.depth -= 1
+        if _pool.depth == 0:
+            if conn.in_transaction:
+                conn.rollback()
+            _pool.checkouts += 1
+            if _pool.checkouts % OPTIMIZE_EVERY_CHECKOUTS == 0:
+                _optimize(conn)
+
+
+# One connection per thread, keyed by NEWS_DB_PATH so a changed path (tests,
+# CLI overrides) gets a new connection instead of the old file.
+_pool = threading.local()
+_pool_registry: list[sqlite3.Connection] = []
+_pool_registry_lock = threading.Lock()
+
+# Pooled connections live for the whole process, so besides optimizing on
+# close they re-run PRAGMA optimize every N checkouts to keep planner stats
+# current as tables grow.
+OPTIMIZE_EVERY_CHECKOUTS = 1000
+
+
+def _pooled_conn() -> sqlite3.Connection:
+    """Return this thread's pooled connection, (re)opening it if needed."""
+    path = os.environ.get("NEWS_DB_PATH", "./data/news.db")
+    conn = getattr(_pool, "conn", None)
+    if conn is not None and _pool.path == path:
+        return conn
+    if conn is not None and _pool.depth == 0:
+        _release(conn)
+
+    conn = get_conn()
+    init_db(conn)
+    # 0x10002: analyze tables that have never been analyzed, with a row
+    # limit so opening a large DB stays fast.
+    _optimize(conn, "PRAGMA optimize=0x10002;")
+    _pool.conn, _pool.path = conn, path
+    if not hasattr(_pool, "depth"):
+        _pool.depth = 0
+        _pool.checkouts = 0
+    with _pool_registry_lock:
+        _pool_registry.append(conn)
+    return conn
+
+
+def _release(conn: sqlite3.Connection) -> None:
+    with _pool_registry_lock:
+        if conn in _pool_registry:
+            _pool_registry.remove(conn)
+    _optimize_and_close(conn)
+
+
+def _close_pool() -> None:
+    """Close every pooled connection (registered with atexit)."""
+    with _pool_registry_lock:
+        conns = list(_pool_registry)
+        _pool_registry.clear()
+    for conn in conns:
+        _optimize_and_close(conn)
+
+
+def _optimize(conn: sqlite3.Connection, pragma: str = "PRAGMA optimize;") -> None:
+    """Let SQLite refresh planner stats if it thinks they're stale (usually a no-op)."""
+    try:
+        conn.execute(pragma)
+    except sqlite3.ProgrammingError:
+        raise
+    except sqlite3.Error as exc:
+        log_event("db_optimize_failed", error=str(exc))
+
+
+def _optimize_and_close(conn: sqlite3.Connection) -> None:
+    try:
+        _optimize(conn)
         conn.close()
+    except sqlite3.ProgrammingError:
+        pass  # closed already
+
+
+atexit.register(_close_pool)
 
 
 def get_conn() -> sqlite3.Connection:
@@ -35,11 +165,45 @@ def get_conn() -> sqlite3.Connection:
     Open a SQLite connection to the DB path.
     DB path is configured via NEWS_DB_PATH env var, with a safe local default.
     """
-    db_path = os.environ.get("NEWS_DB_PATH", "./data/news.db")
+    path, parent, shared_uri = _resolve_db_path(os.environ.get("NEWS_DB_PATH"))
+
+    # check_same_thread=False: pooled connections are still used by one thread
+    # each, but the pool can close them from the atexit/rotation path.
+    # isolation_level="IMMEDIATE": the implicit transaction sqlite3 opens before
+    # the first INSERT/UPDATE/DELETE takes the write lock up front, so a
+    # contended writer waits in busy_timeout instead of failing mid-transaction.
+    if os.environ.get("NEWS_DB_SHARED_CACHE") == "1":
+        conn = sqlite3.connect(
+            shared_uri, uri=True, isolation_level="IMMEDIATE",
+            cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False,
+        )
+    else:
+        conn = sqlite3.connect(
+            path, isolation_level="IMMEDIATE",
+            cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False,
+        )
+    busy_timeout = int(os.environ.get("NEWS_DB_BUSY_TIMEOUT_MS", DEFAULT_BUSY_TIMEOUT_MS))
+    pragmas = (f"PRAGMA busy_timeout={busy_timeout}",) + CONNECTION_PRAGMAS
+    if not _on_network_fs(parent):
+        pragmas = pragmas + ("PRAGMA journal_mode=WAL",)
+    conn.executescript(";\n".join(pragmas) + ";")
+    return conn
+
+
+@lru_cache(maxsize=32)
+def _resolve_db_path(env_path: str | None) -> tuple[str, str, str]:
+    """
+    Validate the DB path and create its directory, once per NEWS_DB_PATH value.
+
+    Returns (db_path, resolved_parent_dir, shared_cache_uri). Invalid paths
+    raise and are not cached, so fixing the env var takes effect on the next
+    call.
+    """
+    db_path = env_path or "./data/news.db"
     path = Path(db_path)
 
     # Validate: if NEWS_DB_PATH is set, check that the root/drive exists
-    if os.environ.get("NEWS_DB_PATH"):
+    if env_path:
         # Get the root of the path (e.g., "Z:\" on Windows, "/" on Unix)
         root = path.anchor or path.parts[0] if path.parts else None
         if root and not Path(root).exists():
@@ -48,326 +212,379 @@ def get_conn() -> sqlite3.Connection:
                 f"Fix: Clear the env var with: $env:NEWS_DB_PATH = $null"
             )
 
-    # Ensure parent directory exists (e.g., ./data/)
-    if path.parent and not path.parent.exists():
-        path.parent.mkdir(parents=True, exist_ok=True)
+    # Ensure parent directory exists (e.g., ./data/). exist_ok covers the
+    # common case without a separate exists() probe.
+    path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(path))
-    return conn
+    shared_uri = path.resolve().as_uri() + "?cache=shared&mode=rwc"
+    return str(path), str(path.parent.resolve()), shared_uri
+
+
+def _reset_db_path_cache() -> None:
+    """Forget validated paths (e.g. after a DB directory is deleted)."""
+    _resolve_db_path.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _on_network_fs(directory: str) -> bool:
+    """True if directory is on a network mount (UNC path or nfs/cifs/...)."""
+    if directory.startswith("\\\\"):
+        return True
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if line.strip()]
+    except OSError:
+        return False
+    best, fstype = "", ""
+    for mount_point, fs in mounts:
+        prefix = mount_point.rstrip("/") + "/"
+        if (directory + "/").startswith(prefix) and len(mount_point) >= len(best):
+            best, fstype = mount_point, fs
+    return fstype in _NETWORK_FS_TYPES
+
+
+# Every table and index, created in one executescript pass. Column additions
+# for databases created before a column existed live in MIGRATIONS.
+SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id INTEGER PRIMARY KEY,
+    dedupe_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    evidence TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL,
+    received INTEGER NOT NULL DEFAULT 0,
+    after_dedupe INTEGER NOT NULL DEFAULT 0,
+    inserted INTEGER NOT NULL DEFAULT 0,
+    duplicates INTEGER NOT NULL DEFAULT 0,
+    error_type TEXT,
+    error_message TEXT,
+    run_type TEXT NOT NULL DEFAULT 'ingest',
+    llm_cache_hits INTEGER DEFAULT 0,
+    llm_cache_misses INTEGER DEFAULT 0,
+    llm_total_cost_usd REAL DEFAULT 0.0,
+    llm_saved_cost_usd REAL DEFAULT 0.0,
+    llm_total_latency_ms INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS run_failures (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    error_code TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    failed_sources TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS run_artifacts (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE(run_id, kind)
+);
+
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    run_id TEXT,
+    day TEXT,
+    details_json TEXT
+);
+
+-- summary_cache table - LLM summary caching (Day 17)
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key TEXT PRIMARY KEY,
+    model_name TEXT NOT NULL,
+    summary_json TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- idempotency_keys table - prevents duplicate HTTP requests (Day 18)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    endpoint TEXT NOT NULL,
+    response_json TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- run_feedback table - overall digest rating (Day 18)
+CREATE TABLE IF NOT EXISTS run_feedback (
+    feedback_id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL UNIQUE,
+    rating INTEGER NOT NULL CHECK (rating BETWEEN 1 AND 5),
+    comment TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- item_feedback table - per-item usefulness rating (Day 18)
+CREATE TABLE IF NOT EXISTS item_feedback (
+    feedback_id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    item_url TEXT NOT NULL,
+    useful INTEGER NOT NULL CHECK (useful IN (0, 1)),
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE(run_id, item_url)
+);
+
+-- weight_snapshots table - source weight learning loop (Milestone 3b)
+CREATE TABLE IF NOT EXISTS weight_snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    cycle_date TEXT NOT NULL,
+    user_id TEXT,
+    config_version INTEGER NOT NULL DEFAULT 1,
+    weights_before TEXT NOT NULL,
+    weights_after TEXT NOT NULL,
+    feedback_summary TEXT NOT NULL,
+    eval_pass_rate_before REAL,
+    eval_pass_rate_after REAL,
+    applied INTEGER NOT NULL DEFAULT 0,
+    rejected_reason TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE(cycle_date, user_id)
+);
+
+-- users table - Milestone 4 (Multi-User)
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT,
+    role TEXT NOT NULL DEFAULT 'user',
+    created_at TEXT NOT NULL,
+    last_login_at TEXT
+);
+
+-- user_configs table - per-user ranking config overrides (Milestone 4)
+CREATE TABLE IF NOT EXISTS user_configs (
+    config_id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL UNIQUE,
+    config_json TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- sessions table - server-side session management (Milestone 4)
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- config_suggestions table - AI advisor suggestions (Milestone 4.5)
+CREATE TABLE IF NOT EXISTS config_suggestions (
+    suggestion_id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    suggestion_type TEXT NOT NULL,
+    field TEXT NOT NULL,
+    target_key TEXT,
+    current_value TEXT,
+    suggested_value TEXT NOT NULL,
+    evidence_items TEXT NOT NULL,
+    evidence_count INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT NOT NULL,
+    resolved_at TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- suggestion_outcomes table - rich snapshots for learning (Milestone 4.5)
+CREATE TABLE IF NOT EXISTS suggestion_outcomes (
+    outcome_id INTEGER PRIMARY KEY,
+    suggestion_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    suggestion_type TEXT NOT NULL,
+    suggestion_value TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    user_reason TEXT,
+    config_before TEXT,
+    config_after TEXT,
+    evidence_summary TEXT,
+    created_at TEXT NOT NULL,
+    decided_at TEXT,
+    FOREIGN KEY (suggestion_id) REFERENCES config_suggestions(suggestion_id)
+);
+
+-- user_preference_profiles table - computed patterns (Milestone 4.5)
+CREATE TABLE IF NOT EXISTS user_preference_profiles (
+    profile_id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL UNIQUE,
+    acceptance_stats TEXT NOT NULL,
+    patterns TEXT NOT NULL,
+    trends TEXT,
+    total_outcomes INTEGER DEFAULT 0,
+    last_outcome_at TEXT,
+    computed_at TEXT NOT NULL
+);
+
+-- Indexes for config_suggestions (Milestone 4.5)
+CREATE INDEX IF NOT EXISTS idx_suggestions_user
+    ON config_suggestions(user_id, status);
+CREATE INDEX IF NOT EXISTS idx_outcomes_user
+    ON suggestion_outcomes(user_id);
+CREATE INDEX IF NOT EXISTS idx_outcomes_type
+    ON suggestion_outcomes(suggestion_type, outcome);
+CREATE INDEX IF NOT EXISTS idx_outcomes_date
+    ON suggestion_outcomes(created_at);
+"""
+
+
+# Schema changes for databases created before they existed, tracked with
+# PRAGMA user_version. Each entry upgrades a DB to that version. Add new
+# migrations at the end; SCHEMA_VERSION follows the last entry.
+MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    # add target_key to config_suggestions
+    (1, ("ALTER TABLE config_suggestions ADD COLUMN target_key TEXT;",)),
+    # add run_type to runs
+    (2, ("ALTER TABLE runs ADD COLUMN run_type TEXT NOT NULL DEFAULT 'ingest';",)),
+    # LLM stats columns on runs (Day 20)
+    (3, (
+        "ALTER TABLE runs ADD COLUMN llm_cache_hits INTEGER DEFAULT 0;",
+        "ALTER TABLE runs ADD COLUMN llm_cache_misses INTEGER DEFAULT 0;",
+        "ALTER TABLE runs ADD COLUMN llm_total_cost_usd REAL DEFAULT 0.0;",
+        "ALTER TABLE runs ADD COLUMN llm_saved_cost_usd REAL DEFAULT 0.0;",
+        "ALTER TABLE runs ADD COLUMN llm_total_latency_ms INTEGER DEFAULT 0;",
+    )),
+    # failed_sources on run_failures
+    (4, ("ALTER TABLE run_failures ADD COLUMN failed_sources TEXT;",)),
+    # suggested_tags on news_items (Milestone 3a)
+    (5, ("ALTER TABLE news_items ADD COLUMN suggested_tags TEXT;",)),
+    # reason_tag on item_feedback (Milestone 3a)
+    (6, ("ALTER TABLE item_feedback ADD COLUMN reason_tag TEXT;",)),
+    # user_id on runs, item_feedback, run_feedback (Milestone 4)
+    (7, ("ALTER TABLE runs ADD COLUMN user_id TEXT;",)),
+    (8, ("ALTER TABLE item_feedback ADD COLUMN user_id TEXT;",)),
+    (9, ("ALTER TABLE run_feedback ADD COLUMN user_id TEXT;",)),
+    # Indexes matching the repo.py filter shapes. Day lookups filter on
+    # substr(<ts>, 1, 10), so those are expression indexes on that exact form.
+    # Some cover migrated columns (user_id), so they live here, not in DDL.
+    (10, (
+        "CREATE INDEX IF NOT EXISTS idx_news_published_day ON news_items(substr(published_at, 1, 10));",
+        "CREATE INDEX IF NOT EXISTS idx_news_url ON news_items(url);",
+        "CREATE INDEX IF NOT EXISTS idx_runs_started_day ON runs(substr(started_at, 1, 10));",
+        "CREATE INDEX IF NOT EXISTS idx_runs_user_started ON runs(user_id, started_at);",
+        "CREATE INDEX IF NOT EXISTS idx_run_failures_run ON run_failures(run_id);",
+        "CREATE INDEX IF NOT EXISTS idx_item_feedback_user ON item_feedback(user_id, created_at);",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);",
+    )),
+    # Change counter for everything a rendered digest page is built from
+    # (items incl. suggested_tags, item feedback, cached summaries). Every
+    # row write bumps it, so page-cache keys read one row instead of
+    # fingerprinting the tables.
+    (11, (
+        "CREATE TABLE IF NOT EXISTS content_version "
+        "(id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL);",
+        "INSERT OR IGNORE INTO content_version (id, version) VALUES (1, 0);",
+        "CREATE TRIGGER IF NOT EXISTS trg_news_items_insert_version AFTER INSERT ON news_items "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_news_items_update_version AFTER UPDATE ON news_items "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_news_items_delete_version AFTER DELETE ON news_items "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_item_feedback_insert_version AFTER INSERT ON item_feedback "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_item_feedback_update_version AFTER UPDATE ON item_feedback "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_item_feedback_delete_version AFTER DELETE ON item_feedback "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_summary_cache_insert_version AFTER INSERT ON summary_cache "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_summary_cache_update_version AFTER UPDATE ON summary_cache "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+        "CREATE TRIGGER IF NOT EXISTS trg_summary_cache_delete_version AFTER DELETE ON summary_cache "
+        "BEGIN UPDATE content_version SET version = version + 1 WHERE id = 1; END;",
+    )),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# SCHEMA_DDL wrapped in one transaction (one commit on a cold DB instead of
+# one per table/index). Built once at import rather than on every init.
+_SCHEMA_SCRIPT = "BEGIN;\n" + SCHEMA_DDL + "\nCOMMIT;"
+
+
+# DB files whose schema has already been created/migrated in this process.
+# Keyed by the absolute path SQLite reports, so warm calls skip the DDL.
+_INITIALIZED: set[str] = set()
+_INIT_LOCK = threading.Lock()
 
 
 def init_db(conn: sqlite3.Connection) -> None:
     """
     Create required tables if they don't exist.
+
+    Runs once per DB file per process; later calls for the same file
+    return immediately. In-memory databases are always initialized.
     """
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS news_items (
-            id INTEGER PRIMARY KEY,
-            dedupe_key TEXT NOT NULL UNIQUE,
-            source TEXT NOT NULL,
-            url TEXT NOT NULL,
-            published_at TEXT NOT NULL,
-            title TEXT NOT NULL,
-            evidence TEXT NOT NULL,
-            created_at TEXT NOT NULL
-        );
-        """
-    )
-
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS runs (
-            run_id TEXT PRIMARY KEY,
-            started_at TEXT NOT NULL,
-            finished_at TEXT,
-            status TEXT NOT NULL,
-            received INTEGER NOT NULL DEFAULT 0,
-            after_dedupe INTEGER NOT NULL DEFAULT 0,
-            inserted INTEGER NOT NULL DEFAULT 0,
-            duplicates INTEGER NOT NULL DEFAULT 0,
-            error_type TEXT,
-            error_message TEXT,
-            run_type TEXT NOT NULL DEFAULT 'ingest',
-            llm_cache_hits INTEGER DEFAULT 0,
-            llm_cache_misses INTEGER DEFAULT 0,
-            llm_total_cost_usd REAL DEFAULT 0.0,
-            llm_saved_cost_usd REAL DEFAULT 0.0,
-            llm_total_latency_ms INTEGER DEFAULT 0
-        );
-        """
-    )
-
-    conn.execute(
-         """
-        CREATE TABLE IF NOT EXISTS run_failures (
-              id INTEGER PRIMARY KEY,
-              run_id TEXT NOT NULL,
-              error_code TEXT NOT NULL,
-              count INTEGER NOT NULL DEFAULT 0,
-              failed_sources TEXT,
-              created_at TEXT NOT NULL
-        );
-        """
-    )
-
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS run_artifacts (
-            id INTEGER PRIMARY KEY,
-            run_id TEXT NOT NULL,
-            kind TEXT NOT NULL,
-            path TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            UNIQUE(run_id, kind)
-        );
-        """
-    )
-
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS audit_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ts TEXT NOT NULL,
-            event_type TEXT NOT NULL,
-            run_id TEXT,
-            day TEXT,
-            details_json TEXT
-        )
-        """
-    )
-    # summary_cache table - LLM summary caching (Day 17)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS summary_cache (
-            cache_key TEXT PRIMARY KEY,
-            model_name TEXT NOT NULL,
-            summary_json TEXT NOT NULL,
-            prompt_tokens INTEGER NOT NULL,
-            completion_tokens INTEGER NOT NULL,
-            cost_usd REAL NOT NULL,
-            latency_ms INTEGER NOT NULL,
-            created_at TEXT NOT NULL
-        )
-    """
-    )
-
-    # idempotency_keys table - prevents duplicate HTTP requests (Day 18)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS idempotency_keys (
-            id INTEGER PRIMARY KEY,
-            key TEXT NOT NULL UNIQUE,
-            endpoint TEXT NOT NULL,
-            response_json TEXT NOT NULL,
-            created_at TEXT NOT NULL
-        )
-    """)
-
-    # run_feedback table - overall digest rating (Day 18)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS run_feedback (
-            feedback_id INTEGER PRIMARY KEY,
-            run_id TEXT NOT NULL UNIQUE,
-            rating INTEGER NOT NULL CHECK (rating BETWEEN 1 AND 5),
-            comment TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )
-    """)
-
-    # item_feedback table - per-item usefulness rating (Day 18)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS item_feedback (
-            feedback_id INTEGER PRIMARY KEY,
-            run_id TEXT NOT NULL,
-            item_url TEXT NOT NULL,
-            useful INTEGER NOT NULL CHECK (useful IN (0, 1)),
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            UNIQUE(run_id, item_url)
-        )
-    """)
-
-    # weight_snapshots table - source weight learning loop (Milestone 3b)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS weight_snapshots (
-            snapshot_id INTEGER PRIMARY KEY,
-            cycle_date TEXT NOT NULL,
-            user_id TEXT,
-            config_version INTEGER NOT NULL DEFAULT 1,
-            weights_before TEXT NOT NULL,
-            weights_after TEXT NOT NULL,
-            feedback_summary TEXT NOT NULL,
-            eval_pass_rate_before REAL,
-            eval_pass_rate_after REAL,
-            applied INTEGER NOT NULL DEFAULT 0,
-            rejected_reason TEXT,
-            created_at TEXT NOT NULL,
-            UNIQUE(cycle_date, user_id)
-        )
-    """)
-
-    # users table - Milestone 4 (Multi-User)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            user_id TEXT PRIMARY KEY,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT,
-            role TEXT NOT NULL DEFAULT 'user',
-            created_at TEXT NOT NULL,
-            last_login_at TEXT
-        )
-    """)
-
-    # user_configs table - per-user ranking config overrides (Milestone 4)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS user_configs (
-            config_id INTEGER PRIMARY KEY,
-            user_id TEXT NOT NULL UNIQUE,
-            config_json TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
-        )
-    """)
-
-    # sessions table - server-side session management (Milestone 4)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            session_id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            expires_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
-        )
-    """)
-
-    # config_suggestions table - AI advisor suggestions (Milestone 4.5)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS config_suggestions (
-            suggestion_id INTEGER PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            suggestion_type TEXT NOT NULL,
-            field TEXT NOT NULL,
-            target_key TEXT,
-            current_value TEXT,
-            suggested_value TEXT NOT NULL,
-            evidence_items TEXT NOT NULL,
-            evidence_count INTEGER NOT NULL,
-            reason TEXT NOT NULL,
-            status TEXT NOT NULL DEFAULT 'pending',
-            created_at TEXT NOT NULL,
-            resolved_at TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
-        )
-    """)
+    key = _db_file(conn)
+    with _INIT_LOCK:
+        if key and key in _INITIALIZED:
+            return
 
-    # Idempotent migration: add target_key column if missing (for existing DBs)
-    try:
-        conn.execute("ALTER TABLE config_suggestions ADD COLUMN target_key TEXT")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
-    # suggestion_outcomes table - rich snapshots for learning (Milestone 4.5)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS suggestion_outcomes (
-            outcome_id INTEGER PRIMARY KEY,
-            suggestion_id INTEGER NOT NULL,
-            user_id TEXT NOT NULL,
-            suggestion_type TEXT NOT NULL,
-            suggestion_value TEXT NOT NULL,
-            outcome TEXT NOT NULL,
-            user_reason TEXT,
-            config_before TEXT,
-            config_after TEXT,
-            evidence_summary TEXT,
-            created_at TEXT NOT NULL,
-            decided_at TEXT,
-            FOREIGN KEY (suggestion_id) REFERENCES config_suggestions(suggestion_id)
-        )
-    """)
-
-    # user_preference_profiles table - computed patterns (Milestone 4.5)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS user_preference_profiles (
-            profile_id INTEGER PRIMARY KEY,
-            user_id TEXT NOT NULL UNIQUE,
-            acceptance_stats TEXT NOT NULL,
-            patterns TEXT NOT NULL,
-            trends TEXT,
-            total_outcomes INTEGER DEFAULT 0,
-            last_outcome_at TEXT,
-            computed_at TEXT NOT NULL
-        )
-    """)
-
-    # Indexes for config_suggestions (Milestone 4.5)
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_suggestions_user
-        ON config_suggestions(user_id, status)
-    """)
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_outcomes_user
-        ON suggestion_outcomes(user_id)
-    """)
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_outcomes_type
-        ON suggestion_outcomes(suggestion_type, outcome)
-    """)
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_outcomes_date
-        ON suggestion_outcomes(created_at)
-    """)
+    _create_schema(conn)
 
+    if key:
+        with _INIT_LOCK:
+            _INITIALIZED.add(key)
+
+
+def _db_file(conn: sqlite3.Connection) -> str:
+    """Absolute path of the connection's main database ('' for in-memory)."""
+    for _seq, name, file in conn.execute("PRAGMA database_list;"):
+        if name == "main":
+            return file or ""
+    return ""
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Create tables/indexes and apply column migrations."""
+    conn.executescript(_SCHEMA_SCRIPT)
+
+    version = conn.execute("PRAGMA user_version;").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+
+    # All pending migrations + the version stamp commit together: one fsync,
+    # and a failure leaves the DB at its previous version.
+    conn.execute("BEGIN")
+    try:
+        for target, statements in MIGRATIONS:
+            if version >= target:
+                continue
+            for stmt in statements:
+                try:
+                    conn.execute(stmt)
+                except sqlite3.OperationalError as exc:
+                    # Tables created from SCHEMA_DDL, or DBs migrated before
+                    # user_version was tracked, may already have the column.
+                    if "duplicate column name" not in str(exc):
+                        raise
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+    except BaseException:
+        conn.rollback()
+        raise
     conn.commit()
 
-    # Idempotent migration: add run_type column if missing (for existing DBs)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(runs);").fetchall()]
-    if "run_type" not in cols:
-        conn.execute("ALTER TABLE runs ADD COLUMN run_type TEXT NOT NULL DEFAULT 'ingest';")
-        conn.commit()
-
-    # Idempotent migration: add LLM stats columns if missing (Day 20)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(runs);").fetchall()]
-    if "llm_cache_hits" not in cols:
-        conn.execute("ALTER TABLE runs ADD COLUMN llm_cache_hits INTEGER DEFAULT 0;")
-        conn.execute("ALTER TABLE runs ADD COLUMN llm_cache_misses INTEGER DEFAULT 0;")
-        conn.execute("ALTER TABLE runs ADD COLUMN llm_total_cost_usd REAL DEFAULT 0.0;")
-        conn.execute("ALTER TABLE runs ADD COLUMN llm_saved_cost_usd REAL DEFAULT 0.0;")
-        conn.execute("ALTER TABLE runs ADD COLUMN llm_total_latency_ms INTEGER DEFAULT 0;")
-        conn.commit()
-
-    # Idempotent migration: add failed_sources column to run_failures if missing
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(run_failures);").fetchall()]
-    if "failed_sources" not in cols:
-        conn.execute("ALTER TABLE run_failures ADD COLUMN failed_sources TEXT;")
-        conn.commit()
-
-    # Idempotent migration: add suggested_tags column to news_items (Milestone 3a)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(news_items);").fetchall()]
-    if "suggested_tags" not in cols:
-        conn.execute("ALTER TABLE news_items ADD COLUMN suggested_tags TEXT;")
-        conn.commit()
-
-    # Idempotent migration: add reason_tag column to item_feedback (Milestone 3a)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(item_feedback);").fetchall()]
-    if "reason_tag" not in cols:
-        conn.execute("ALTER TABLE item_feedback ADD COLUMN reason_tag TEXT;")
-        conn.commit()
-
-    # Idempotent migration: add user_id column to runs (Milestone 4)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(runs);").fetchall()]
-    if "user_id" not in cols:
-        conn.execute("ALTER TABLE runs ADD COLUMN user_id TEXT;")
-        conn.commit()
-
-    # Idempotent migration: add user_id column to item_feedback (Milestone 4)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(item_feedback);").fetchall()]
-    if "user_id" not in cols:
-        conn.execute("ALTER TABLE item_feedback ADD COLUMN user_id TEXT;")
-        conn.commit()
-
-    # Idempotent migration: add user_id column to run_feedback (Milestone 4)
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(run_feedback);").fetchall()]
-    if "user_id" not in cols:
-        conn.execute("ALTER TABLE run_feedback ADD COLUMN user_id TEXT;")
-        conn.commit()
+    # Schema changed: refresh planner stats for new columns/indexes.
+    conn.execute("ANALYZE;")
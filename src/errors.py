@@ -1,13 +1,28 @@
-from pydantic import BaseModel
+from dataclasses import dataclass, fields
 
 
-class ProblemDetails(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ProblemDetails:
+    # Plain dataclass: built on every error response, and all fields come
+    # from our own handlers, so there is nothing for pydantic to validate.
     status: int
     code: str
     message: str
     request_id: str
     run_id: str | None = None
 
+    def model_dump(self, *, exclude_none: bool = False) -> dict:
+        """Same shape as the pydantic model_dump the handlers relied on."""
+        # Direct field reads: asdict() deep-copies every value, which flat
+        # str/int fields never need
+        data = {name: getattr(self, name) for name in _PROBLEM_FIELDS}
+        if exclude_none:
+            return {k: v for k, v in data.items() if v is not None}
+        return data
+
+
+_PROBLEM_FIELDS = tuple(f.name for f in fields(ProblemDetails))
+
 
 def problem(*, status: int, code: str, message: str, request_id: str, run_id: str | None = None) -> ProblemDetails:
     return ProblemDetails(status=status, code=code, message=message, request_id=request_id, run_id=run_id)
@@ -1,74 +1,78 @@
 import argparse
+import os
+import secrets
 import time
-import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 
-from src.logging_utils import log_event
-from src.db import get_conn, init_db
-from src.repo import upsert_run_failures, start_run, finish_run_ok, insert_run_artifact
-from evals.runner import run_all, write_eval_report
-from evals.summary_runner import run_all_cases as run_summary_cases, summarize_results as summarize_summary_results
+from src.logging_utils import log_event, now_iso
 
 
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument("--date", required=True, help="YYYY-MM-DD")
+    p.add_argument("--parallel", type=int, default=os.cpu_count() or 1, help="worker threads for ranking cases")
     args = p.parse_args()
 
-    # Validate date format
-    date.fromisoformat(args.date)
+    # Imported after argument parsing so --help and bad-argument exits don't
+    # pay for the pydantic models, DB layer and eval suites (~270 ms).
+    from src.db import get_conn, init_db
+    from src.repo import upsert_run_failures, start_run, finish_run_ok, insert_run_artifact
+    from evals.runner import run_all, write_eval_report
+    from evals.summary_runner import run_all_cases as run_summary_cases, summarize_results as summarize_summary_results
+
+    # Validate date format (parsed once, reused for `now` below)
+    parsed_date = date.fromisoformat(args.date)
     day = args.date
 
-    run_id = uuid.uuid4().hex
+    run_id = secrets.token_hex(16)
     t0 = time.perf_counter()
     log_event("eval_started", run_id=run_id, date=day)
 
     # Create timestamp for eval (end of the given day)
-    now = datetime.combine(date.fromisoformat(day), datetime.max.time(), tzinfo=timezone.utc)
+    now = datetime.combine(parsed_date, datetime.max.time(), tzinfo=timezone.utc)
 
     conn = get_conn()
     try:
         init_db(conn)
 
         # 1. Create run record
-        started_at = datetime.now(timezone.utc).isoformat()
+        started_at = now_iso()
         start_run(conn, run_id=run_id, started_at=started_at, received=0, run_type='eval')
-        # 2. Run all eval cases
-        out = run_all(now=now)
-        # 3. Extract stats
-        total = out["total"]
-        passed = out["passed"]
-        failed = out["failed"]
-        pass_rate = passed / total if total > 0 else 0.0
-        # 4. Build failure breakdown
-        breakdown = {}
+        # 2. Run all eval cases; the summary suite runs alongside the ranking suite
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            summary_future = pool.submit(run_summary_cases)
+            out = run_all(now=now, max_workers=args.parallel)
+            summary_stats = summarize_summary_results(summary_future.result())
+        # 3-4. Extract stats and build failure breakdown in one pass
+        passed = failed = 0
+        failure_codes: Counter[str] = Counter()
         for r in out["results"]:
-            if not r["pass"]:
-                code = r.get("error_code") or "UNKNOWN"
-                breakdown[code] = breakdown.get(code, 0) + 1
-        # 5. Mark run complete
-        finished_at = datetime.now(timezone.utc).isoformat()
-        finish_run_ok(conn, run_id=run_id, finished_at=finished_at, after_dedupe=total, inserted=passed, duplicates=failed,)
-
-        # 6. Store breakdown in DB
-        upsert_run_failures(conn, run_id=run_id, breakdown=breakdown)
-
-        # 7. Write eval report artifact
-        report_path = write_eval_report(out, day=day, run_id=run_id)
-
-        # 8. Record artifact in DB
-        insert_run_artifact(conn, run_id=run_id, kind="eval_report", path=report_path)
-
-        # 9. Run summary quality evals for console output
-        summary_results = run_summary_cases()
-        summary_stats = summarize_summary_results(summary_results)
-
-        # 10. Calculate combined totals
+            if r["pass"]:
+                passed += 1
+            else:
+                failed += 1
+                failure_codes[r.get("error_code") or "UNKNOWN"] += 1
+        total = passed + failed
+        pass_rate = passed / total if total > 0 else 0.0
+        breakdown = dict(failure_codes)
+        # 5. Write eval report artifact (file I/O stays outside the DB transaction)
+        report_path = write_eval_report(out, day=day, run_id=run_id, summary_stats=summary_stats)
+
+        # 6. Mark run complete, store breakdown and record the artifact in one commit
+        finished_at = now_iso()
+        with conn:
+            finish_run_ok(conn, run_id=run_id, finished_at=finished_at, after_dedupe=total, inserted=passed, duplicates=failed, commit=False)
+            upsert_run_failures(conn, run_id=run_id, breakdown=breakdown, commit=False)
+            insert_run_artifact(conn, run_id=run_id, kind="eval_report", path=report_path, commit=False)
+
+        # 7. Calculate combined totals
         combined_total = total + summary_stats["total"]
         combined_passed = passed + summary_stats["passed"]
         combined_rate = (combined_passed / combined_total * 100) if combined_total > 0 else 0.0
 
-        # 11. Print and log
+        # 8. Print and log
         print(f"[EVAL] date={day} run_id={run_id}")
         print(f"[EVAL] ranking: {pass_rate:.2%} ({passed}/{total})")
         print(f"[EVAL] summary: {summary_stats['pass_rate']}% ({summary_stats['passed']}/{summary_stats['total']})")
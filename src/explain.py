@@ -5,9 +5,9 @@ from src.schemas import NewsItem
 from src.scoring import RankConfig, compute_score_breakdown
 
 
-def explain_item(item: NewsItem, *, now: datetime, cfg: RankConfig) -> dict:
+def explain_item(item: NewsItem, *, now: datetime, cfg: RankConfig, terms=None) -> dict:
     """Return a dict explaining all score components for an item."""
-    breakdown = compute_score_breakdown(item, now=now, cfg=cfg)
+    breakdown = compute_score_breakdown(item, now=now, cfg=cfg, terms=terms)
     return {
         "matched_topics": breakdown.matched_topics,
         "matched_keywords": breakdown.matched_keywords,
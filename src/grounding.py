@@ -38,10 +38,11 @@ def validate_grounding(result: SummaryResult, evidence: str | None) -> SummaryRe
     if not evidence or not evidence.strip():
         return SummaryResult(refusal=NO_EVIDENCE)
     
-    # Rule 3: Every citation must be exact substring
-    for citation in result.citations:
-        if citation.evidence_snippet not in evidence:
-            return SummaryResult(refusal=GROUNDING_FAIL)
+    # Rule 3: Every citation must be exact substring (repeated snippets
+    # are only searched for once)
+    snippets = {citation.evidence_snippet for citation in result.citations}
+    if not all(snippet in evidence for snippet in snippets):
+        return SummaryResult(refusal=GROUNDING_FAIL)
     
     # All check passed
     return result
\ No newline at end of file
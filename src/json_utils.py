@@ -1,6 +1,30 @@
 import json
 import re
 
+# Strip markdown code fences: ```json ... ``` or ``` ... ```
+_FENCE_RE = re.compile(r'^```(?:json)?\s*\n?(.*?)\n?```$', re.DOTALL)
+
+
+def strip_code_fences(raw: str) -> str | None:
+    """
+    Return the JSON text inside an LLM response, or None if it is blank.
+
+    Removes surrounding whitespace and a single markdown code fence; the
+    text itself is not parsed.
+    """
+    if not raw or not raw.strip():
+        return None
+
+    text = raw.strip()
+    # Bare JSON (the usual case with response_format=json_object) skips the regex
+    if not text.startswith("```"):
+        return text
+    match = _FENCE_RE.match(text)
+    if match:
+        text = match.group(1).strip()
+    return text
+
+
 def safe_parse_json(raw: str) -> dict | None:
     """
     Parse messy LLM JSON safely.
@@ -16,17 +40,10 @@ def safe_parse_json(raw: str) -> dict | None:
     This aligns with refusal > corruption philosophy.
     """
 
-    if not raw or not raw.strip():
+    text = strip_code_fences(raw)
+    if text is None:
         return None
-    
-    text = raw.strip()
-    # Strip markdown code fences: ```json ... ``` or ``` ... ```
-    fence_pattern = r'^```(?:json)?\s*\n?(.*?)\n?```$'
-    match = re.match(fence_pattern, text, re.DOTALL)
-    if match:
-        text = match.group(1).strip()
     try:
         return json.loads(text)
     except json.JSONDecodeError:
         return None
-
@@ -1,18 +1,159 @@
+import atexit
 import json
 import logging
-from datetime import datetime, timezone
+import logging.handlers
+import queue
+import sys
+import threading
+import time
 
 
-logging.basicConfig(level=logging.INFO)
+class _BufferedStreamHandler(logging.handlers.BufferingHandler):
+    """
+    Batches records and writes them to stderr with a single write+flush.
+
+    Flushes when the buffer fills, on WARNING and above, and at least every
+    flush_interval_s: a daemon thread, started with the first record, writes
+    whatever is buffered on that timer, so a lone event on a quiet server
+    still reaches stderr. Anything still buffered is written by logging's
+    own shutdown hook at exit.
+    """
+
+    FLUSH_INTERVAL_S = 2.0
+
+    def __init__(self, capacity: int = 256, flush_interval_s: float | None = None):
+        super().__init__(capacity)
+        self.flush_interval_s = self.FLUSH_INTERVAL_S if flush_interval_s is None else flush_interval_s
+        self._last_flush = time.monotonic()
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        # Called under self.lock, so only one flusher is ever started
+        if self._flusher is None and not self._closed.is_set():
+            self._flusher = threading.Thread(target=self._flush_periodically, name="log_flush", daemon=True)
+            self._flusher.start()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or record.levelno >= logging.WARNING
+            or time.monotonic() - self._last_flush >= self.flush_interval_s
+        )
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval_s):
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        super().close()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.buffer:
+                try:
+                    stream = sys.stderr
+                    stream.write("".join(self.format(r) + "\n" for r in self.buffer))
+                    stream.flush()
+                except Exception:
+                    self.handleError(self.buffer[-1])
+                self.buffer.clear()
+            self._last_flush = time.monotonic()
+
+
+logging.basicConfig(level=logging.INFO, handlers=[_BufferedStreamHandler()])
 
 logger = logging.getLogger("news_digest")
 
 
 def log_event(event: str, **fields):
+    # Skip timestamp + json.dumps entirely when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    _emit(now_iso(), event, fields)
+
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS") for the last formatted timestamp;
+# a single tuple so concurrent callers never see a torn update.
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Current UTC time, formatted like datetime.now(timezone.utc).isoformat()."""
+    return _utc_iso(time.time())
+
+
+def _utc_iso(t: float) -> str:
+    """Format a POSIX timestamp as UTC ISO-8601, reusing the date/time prefix within a second."""
+    global _iso_second
+    sec = int(t)
+    us = int((t - sec) * 1_000_000)
+    cached_sec, prefix = _iso_second
+    if cached_sec != sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{us:06d}+00:00" if us else f"{prefix}+00:00"
+
+
+def _emit(ts: str, event: str, fields: dict) -> None:
     payload = {
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": ts,
         "event": event,
         **fields,
     }
 
     logger.info(json.dumps(payload))
+
+
+# --- Deferred logging (hot paths) ---
+# Events are queued with their timestamp and serialized/written by a daemon
+# thread, so callers don't pay json.dumps + handler I/O on the request path.
+
+_deferred: queue.SimpleQueue = queue.SimpleQueue()
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def log_event_deferred(event: str, **fields) -> None:
+    """Like log_event, but serialization and output happen on a background thread."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    if _worker is None:
+        _start_worker()
+    _deferred.put((time.time(), event, fields))
+
+
+def flush_deferred() -> None:
+    """Block until every queued event has been written (called at exit)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            return
+        _deferred.put(None)
+        _worker.join()
+        _worker = None
+
+
+def _start_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="log_event_deferred", daemon=True)
+            _worker.start()
+
+
+def _drain() -> None:
+    while True:
+        entry = _deferred.get()
+        if entry is None:
+            return
+        t, event, fields = entry
+        try:
+            _emit(_utc_iso(t), event, fields)
+        except Exception:
+            logger.exception("deferred log_event failed: %s", event)
+
+
+atexit.register(flush_deferred)
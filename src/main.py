@@ -2,24 +2,38 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-import copy
+import asyncio
 import json
+import os
+import threading
+import time
 import uuid
 
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime, timezone, date
 
+import anyio.to_thread
+
 from fastapi import FastAPI, Request, HTTPException, Header
-from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from jinja2 import FileSystemBytecodeCache
+from pydantic import TypeAdapter
 
 from src.middleware import request_id_middleware
-from src.logging_utils import log_event
+from src.logging_utils import log_event, log_event_deferred
 from src.errors import problem
 
-from src.schemas import IngestRequest, RunFeedbackRequest, ItemFeedbackRequest
-from src.db import db_conn, get_conn, init_db
+from src.schemas import IngestRequest, NewsItem, RunFeedbackRequest, ItemFeedbackRequest
+from src.db import db_conn
 from src.repo import (
     insert_news_items, start_run, finish_run_ok, finish_run_error,
     get_latest_run, get_news_items_by_date, get_run_by_day, get_run_by_id,
@@ -27,37 +41,68 @@ from src.repo import (
     get_news_item_by_id, get_news_items_by_date_with_ids, get_idempotency_response,
     store_idempotency_response, upsert_run_feedback, upsert_item_feedback,
     get_daily_spend, get_daily_refusal_counts,
-    get_all_item_feedback_for_run,
-    get_positive_feedback_items, get_all_historical_items,
-    create_user, get_user_by_email, get_user_by_id,
-    create_session, get_session, delete_session, update_user_last_login,
+    get_all_item_feedback_for_run, get_content_version,
+    create_user, get_user_by_email,
+    create_session, get_session_user, delete_session, update_user_last_login,
     # Suggestion API (Milestone 4.5 Step 3)
-    get_pending_suggestions, get_suggestion_by_id, update_suggestion_status,
-    get_suggestions_for_today, insert_outcome, get_user_config, upsert_user_config,
-    increment_profile_stats,
+    get_pending_suggestions, list_suggestions, get_suggestion_by_id, update_suggestion_status,
+    get_generate_gate, insert_outcome, get_user_config, upsert_user_config,
+    increment_profile_stats, update_suggestion_statuses, insert_outcomes,
 )
+from src import advisor
 from src.advisor_tools import query_user_feedback
 from src.auth import hash_password, verify_password
-from src.ai_score import build_tfidf_model, compute_ai_scores
 from src.normalize import normalize_and_dedupe
 from src.scoring import RankConfig, rank_items
 from src.artifacts import render_digest_html
 from src.explain import explain_item
-from src.views import build_ranked_display_items, build_homepage_data, build_debug_stats, get_effective_rank_config
+from src.views import (
+    build_ranked_display_items, build_homepage_data, build_debug_stats, get_effective_rank_config,
+    compute_item_ai_scores,
+)
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync endpoints (SQLite, TF-IDF, bcrypt) run on AnyIO's worker threads;
+    # NEWS_API_THREADS resizes that pool (AnyIO default: 40).
+    threads = os.environ.get("NEWS_API_THREADS")
+    if threads:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(threads)
+    yield
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 templates = Jinja2Templates(directory="templates")
+# Compiled templates are cached on disk (NEWS_JINJA_CACHE_DIR, else Jinja's
+# per-user temp dir) so restarted workers skip recompiling them. Production
+# can set NEWS_TEMPLATE_AUTO_RELOAD=0 to drop the per-render mtime check.
+templates.env.bytecode_cache = FileSystemBytecodeCache(os.environ.get("NEWS_JINJA_CACHE_DIR"))
+templates.env.auto_reload = os.environ.get("NEWS_TEMPLATE_AUTO_RELOAD", "1") != "0"
 
 app.mount("/artifacts", StaticFiles(directory="artifacts"), name = "artifacts")
 
 #Register middleware
 app.middleware("http")(request_id_middleware)
+# HTML digests and JSON listings compress 5-10x; bodies under 1 KB and
+# clients without Accept-Encoding: gzip are passed through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+def render_template(request: Request, name: str, context: dict, status_code: int = 200) -> HTMLResponse:
+    """Render a template straight to an HTMLResponse.
+
+    Skips Starlette's TemplateResponse wrapper (context processors and the
+    debug-extension hook), which none of the UI pages use. Compiled
+    templates come from the Environment's own cache.
+    """
+    template = templates.env.get_template(name)
+    return HTMLResponse(template.render(request=request, **context), status_code=status_code)
+
 
 def render_ui_error(request: Request, status: int, message: str) -> HTMLResponse:
     """Return HTML error for UI routes (not JSON)."""
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "error.html",
         {"status": status, "message": message},
@@ -65,8 +110,65 @@ def render_ui_error(request: Request, status: int, message: str) -> HTMLResponse
     )
 
 
+@lru_cache(maxsize=512)
+def _end_of_day_utc(day: str) -> datetime:
+    """Deterministic 'now' for a YYYY-MM-DD day: 23:59:59 UTC."""
+    return datetime.fromisoformat(day).replace(hour=23, minute=59, second=59, tzinfo=timezone.utc)
+
+
+# --- Rendered page cache ---
+
+# Rendered /digest and /ui/date bodies. The key covers everything the page
+# is built from (day, user, top_n, effective config, the day's run and the
+# content_version counter), so any item, tag, feedback, summary or config
+# change simply misses and old entries age out of the LRU; nothing is purged.
+# A body is only stored if the counter didn't move while it was built (e.g.
+# tags generated during the render), since it may not match its key then.
+PAGE_CACHE_MAX = 256
+_page_cache: OrderedDict[tuple, bytes] = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+
+def _page_cache_key(conn, *, page: str, day: str, user_id: str | None, top_n: int, cfg: RankConfig, run: dict | None) -> tuple:
+    return (
+        os.environ.get("NEWS_DB_PATH"), page, day, user_id, top_n,
+        cfg.model_dump_json(),
+        tuple(run.values()) if run else None,
+        get_content_version(conn),
+    )
+
+
+def _page_cache_get(key: tuple) -> bytes | None:
+    with _page_cache_lock:
+        body = _page_cache.get(key)
+        if body is not None:
+            _page_cache.move_to_end(key)
+        return body
+
+
+def _page_cache_key_current(conn, key: tuple) -> bool:
+    """True if nothing was written since the key was taken."""
+    return get_content_version(conn) == key[-1]
+
+
+def _page_cache_put(key: tuple, body: bytes) -> None:
+    with _page_cache_lock:
+        _page_cache[key] = body
+        while len(_page_cache) > PAGE_CACHE_MAX:
+            _page_cache.popitem(last=False)
+
+
 # --- Session Middleware (Milestone 4) ---
 
+# Resolved users by (NEWS_DB_PATH, session_id), so repeat requests skip the
+# session lookup. Entries live SESSION_CACHE_TTL_S at most and never past the
+# session's own expiry; logout drops the entry immediately. Sessions deleted
+# by another process can stay valid here for up to the TTL.
+SESSION_CACHE_TTL_S = 60.0
+SESSION_CACHE_MAX = 10_000
+_session_cache: dict[tuple, tuple[float, dict]] = {}
+
+
 def get_current_user(request: Request, conn) -> dict | None:
     """
     Extract user from session cookie.
@@ -78,11 +180,26 @@ def get_current_user(request: Request, conn) -> dict | None:
     if not session_id:
         return None
 
-    session = get_session(conn, session_id=session_id)
-    if not session:
+    key = (os.environ.get("NEWS_DB_PATH"), session_id)
+    hit = _session_cache.get(key)
+    now = time.monotonic()
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    user = get_session_user(conn, session_id=session_id)
+    if user is None:
+        _session_cache.pop(key, None)
         return None
 
-    return get_user_by_id(conn, user_id=session["user_id"])
+    seconds_left = (datetime.fromisoformat(user.pop("session_expires_at")) - datetime.now(timezone.utc)).total_seconds()
+    if len(_session_cache) >= SESSION_CACHE_MAX:
+        _session_cache.clear()
+    _session_cache[key] = (now + min(SESSION_CACHE_TTL_S, seconds_left), user)
+    return user
+
+
+def _forget_session(session_id: str) -> None:
+    _session_cache.pop((os.environ.get("NEWS_DB_PATH"), session_id), None)
 
 
 def require_admin(request: Request, conn) -> dict:
@@ -106,13 +223,16 @@ def require_admin(request: Request, conn) -> dict:
 
 # --- Auth Endpoints (Milestone 4) ---
 
-@app.post("/auth/register")
-def auth_register(request: Request, email: str, password: str):
-    """
-    Register a new user (admin-only, invite-based system).
+# bcrypt spends 50-300 ms of native time per call; it gets its own pool so
+# logins can't tie up the AnyIO worker threads every sync endpoint shares.
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
 
-    Requires admin session to create new users.
-    """
+
+async def _run_bcrypt(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, fn, *args)
+
+
+def _check_can_register(request: Request, email: str) -> None:
     with db_conn() as conn:
         # Require admin for user creation (invite-only system)
         require_admin(request, conn)
@@ -122,34 +242,59 @@ def auth_register(request: Request, email: str, password: str):
         if existing:
             raise HTTPException(status_code=409, detail="Email already registered")
 
-        # Hash password and create user
-        password_hash = hash_password(password)
-        user_id = create_user(conn, email=email, password_hash=password_hash, role="user")
+
+def _create_registered_user(email: str, password_hash: str) -> str:
+    with db_conn() as conn:
+        return create_user(conn, email=email, password_hash=password_hash, role="user")
+
+
+def _load_login_user(email: str) -> dict | None:
+    with db_conn() as conn:
+        return get_user_by_email(conn, email=email)
+
+
+def _start_login_session(user_id: str) -> str:
+    with db_conn() as conn:
+        # Create session and update last login
+        session_id = create_session(conn, user_id=user_id, expires_hours=24)
+        update_user_last_login(conn, user_id=user_id)
+    return session_id
+
+
+@app.post("/auth/register")
+async def auth_register(request: Request, email: str, password: str):
+    """
+    Register a new user (admin-only, invite-based system).
+
+    Requires admin session to create new users.
+    """
+    await run_in_threadpool(_check_can_register, request, email)
+
+    # Hash password and create user
+    password_hash = await _run_bcrypt(hash_password, password)
+    user_id = await run_in_threadpool(_create_registered_user, email, password_hash)
 
     return {"status": "created", "user_id": user_id, "email": email}
 
 
 @app.post("/auth/login")
-def auth_login(request: Request, email: str, password: str):
+async def auth_login(request: Request, email: str, password: str):
     """
     Log in with email and password.
 
     Sets session cookie on success.
     """
-    with db_conn() as conn:
-        user = get_user_by_email(conn, email=email)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid email or password")
+    user = await run_in_threadpool(_load_login_user, email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        if not user.get("password_hash"):
-            raise HTTPException(status_code=401, detail="Invalid email or password")
+    if not user.get("password_hash"):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        if not verify_password(password, user["password_hash"]):
-            raise HTTPException(status_code=401, detail="Invalid email or password")
+    if not await _run_bcrypt(verify_password, password, user["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        # Create session and update last login
-        session_id = create_session(conn, user_id=user["user_id"], expires_hours=24)
-        update_user_last_login(conn, user_id=user["user_id"])
+    session_id = await run_in_threadpool(_start_login_session, user["user_id"])
 
     # Set cookie and return success
     response = JSONResponse(content={
@@ -178,6 +323,7 @@ def auth_logout(request: Request):
     session_id = request.cookies.get("session_id")
 
     if session_id:
+        _forget_session(session_id)
         with db_conn() as conn:
             delete_session(conn, session_id=session_id)
 
@@ -222,7 +368,7 @@ def root(request: Request):
         return RedirectResponse(url=f"/ui/date/{latest_date}", status_code=302)
 
     # No runs yet for this user - show welcome page
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "welcome.html",
         {}
@@ -246,7 +392,7 @@ def ui_history(request: Request, page: int = 1):
         user_id = user["user_id"] if user else None
         data = build_homepage_data(conn, page=page, per_page=15, user_id=user_id)
 
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "history.html",
         {
@@ -259,7 +405,7 @@ def ui_history(request: Request, page: int = 1):
 @app.get("/ui/config", response_class=HTMLResponse)
 def ui_config(request: Request):
     """Config page (placeholder for future preferences)."""
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "config.html",
         {}
@@ -269,7 +415,7 @@ def ui_config(request: Request):
 @app.get("/ui/settings", response_class=HTMLResponse)
 def ui_settings(request: Request):
     """Settings page (placeholder)."""
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "settings.html",
         {}
@@ -292,7 +438,7 @@ def ui_suggestions(request: Request):
         user_id = user["user_id"]
 
         # Get pending suggestions
-        suggestions = get_pending_suggestions(conn, user_id=user_id, status="pending")
+        suggestions = list_suggestions(conn, user_id=user_id, status="pending")
 
         # Group by type and build display data
         source_suggestions = []
@@ -310,31 +456,18 @@ def ui_suggestions(request: Request):
             source_name = target_key if target_key else "Unknown source"
 
             # Build friendly headline and details
-            if suggestion_type == "boost_source":
-                headline = f"Show me more from {source_name}"
-                icon = "📈"
-                boost_label = _compute_boost_label(current_value, suggested_value, "boost")
-                details_text = _format_weight_details(current_value, suggested_value)
-            elif suggestion_type == "reduce_source":
-                headline = f"Show me less from {source_name}"
-                icon = "📉"
-                boost_label = _compute_boost_label(current_value, suggested_value, "reduction")
-                details_text = _format_weight_details(current_value, suggested_value)
-            elif suggestion_type == "add_topic":
-                headline = f"Add '{suggested_value}' to your interests"
-                icon = "➕"
-                boost_label = None
-                details_text = "This will add the topic to your interests"
-            elif suggestion_type == "remove_topic":
-                headline = f"Remove '{suggested_value}' from your interests"
-                icon = "➖"
-                boost_label = None
-                details_text = "This will remove the topic from your interests"
-            else:
+            display = _SUGGESTION_DISPLAY.get(suggestion_type)
+            if display is None:
                 headline = f"Unknown suggestion type: {suggestion_type}"
                 icon = "❓"
                 boost_label = None
                 details_text = ""
+            else:
+                icon, headline_fmt, direction, details_text = display
+                headline = headline_fmt.format(source=source_name, value=suggested_value)
+                boost_label = None
+                if direction:
+                    boost_label, details_text = _build_display_fields(current_value, suggested_value, direction)
 
             display_item = {
                 "suggestion_id": s["suggestion_id"],
@@ -354,7 +487,7 @@ def ui_suggestions(request: Request):
             else:
                 topic_suggestions.append(display_item)
 
-        return templates.TemplateResponse(
+        return render_template(
             request,
             "suggestions.html",
             {
@@ -365,41 +498,37 @@ def ui_suggestions(request: Request):
         )
 
 
-def _compute_boost_label(current_value: str | None, suggested_value: str | None, direction: str) -> str | None:
-    """
-    Compute friendly boost label (Small/Moderate/Big) based on weight delta.
+# suggestion_type -> (icon, headline format, boost direction, details text).
+# Source suggestions get their label and details from _build_display_fields.
+_SUGGESTION_DISPLAY: dict[str, tuple[str, str, str | None, str]] = {
+    "boost_source": ("📈", "Show me more from {source}", "boost", ""),
+    "reduce_source": ("📉", "Show me less from {source}", "reduction", ""),
+    "add_topic": ("➕", "Add '{value}' to your interests", None, "This will add the topic to your interests"),
+    "remove_topic": ("➖", "Remove '{value}' from your interests", None, "This will remove the topic from your interests"),
+}
 
-    Returns None if either value is missing or non-numeric.
-    """
-    if not current_value or not suggested_value:
-        return None
-    try:
-        current = float(current_value)
-        suggested = float(suggested_value)
-        delta = abs(suggested - current)
+# Upper bounds (inclusive) of the Small and Moderate weight deltas
+_BOOST_THRESHOLDS = (0.15, 0.25)
+_BOOST_SIZES = ("Small", "Moderate", "Big")
 
-        if delta <= 0.15:
-            size = "Small"
-        elif delta <= 0.25:
-            size = "Moderate"
-        else:
-            size = "Big"
-
-        return f"{size} {direction}"
-    except (ValueError, TypeError):
-        return None
 
+def _build_display_fields(current_value: str | None, suggested_value: str | None, direction: str) -> tuple[str | None, str]:
+    """
+    Return (boost_label, details_text) for a weight suggestion.
 
-def _format_weight_details(current_value: str | None, suggested_value: str | None) -> str:
-    """Format weight details for the Details toggle. Returns neutral text if values aren't numeric."""
+    The label is Small/Moderate/Big by weight delta; both fields fall back
+    (None, "Weight adjustment") if either value is missing or non-numeric.
+    """
     if not current_value or not suggested_value:
-        return "Weight adjustment"
+        return None, "Weight adjustment"
     try:
         current = float(current_value)
         suggested = float(suggested_value)
-        return f"Current: {current:.1f} → Proposed: {suggested:.1f}"
     except (ValueError, TypeError):
-        return "Weight adjustment"
+        return None, "Weight adjustment"
+
+    size = _BOOST_SIZES[bisect_left(_BOOST_THRESHOLDS, abs(suggested - current))]
+    return f"{size} {direction}", f"Current: {current:.1f} → Proposed: {suggested:.1f}"
 
 
 @app.get("/health")
@@ -425,31 +554,27 @@ def ingest_raw(payload: IngestRequest, request: Request):
     log_event("ingest_started", request_id=request_id, run_id=run_id, count=received)
     started_at = datetime.now(timezone.utc).isoformat()
 
-    conn = get_conn()
-    try:
-        init_db(conn)
-        start_run(conn, run_id, started_at, received=received)
+    with db_conn() as conn:
+        try:
+            # Committed on its own so a failed ingest still leaves its run row
+            start_run(conn, run_id, started_at, received=received)
 
-        result = insert_news_items(conn, deduped)
+            # Items and the run's final counts commit together
+            with conn:
+                result = insert_news_items(conn, deduped, commit=False)
 
-        inserted = result["inserted"]
-        db_ignored = result["duplicates"]
-        duplicates = python_dupes + db_ignored
+                inserted = result["inserted"]
+                db_ignored = result["duplicates"]
+                duplicates = python_dupes + db_ignored
 
-        finished_at = datetime.now(timezone.utc).isoformat()
+                finished_at = datetime.now(timezone.utc).isoformat()
 
-        finish_run_ok(conn, run_id, finished_at, after_dedupe=after_dedupe, inserted=inserted, duplicates=duplicates,)
+                finish_run_ok(conn, run_id, finished_at, after_dedupe=after_dedupe, inserted=inserted, duplicates=duplicates, commit=False)
 
-    except Exception as exc:
-        finished_at = datetime.now(timezone.utc).isoformat()
-        try:
+        except Exception as exc:
+            finished_at = datetime.now(timezone.utc).isoformat()
             finish_run_error(conn, run_id, finished_at, error_type=type(exc).__name__, error_message=str(exc))
-
-        finally:
-            conn.close()
-        raise
-    else:
-        conn.close()
+            raise
 
 
     out = {"received": received, "after_dedupe": after_dedupe, "inserted": inserted, "duplicates": duplicates, "run_id": run_id,
@@ -473,6 +598,11 @@ def latest_run(request: Request):
     return latest
 
 
+# Dumps a whole ranked list in one pydantic-core call instead of one
+# model_dump() per item; output is identical.
+_news_item_list = TypeAdapter(list[NewsItem])
+
+
 @app.post("/rank/{date_str}")
 def rank_for_date(request: Request, date_str: str, cfg: RankConfig, top_n: int =10):
     try:
@@ -483,7 +613,7 @@ def rank_for_date(request: Request, date_str: str, cfg: RankConfig, top_n: int =
     if top_n < 1:
         raise HTTPException(status_code=400, detail="top_n must be >= 1")
 
-    now = datetime.fromisoformat(f"{date_str}T23:59:59+00:00")
+    now = _end_of_day_utc(date_str)
 
     with db_conn() as conn:
         user = get_current_user(request, conn)
@@ -492,20 +622,14 @@ def rank_for_date(request: Request, date_str: str, cfg: RankConfig, top_n: int =
         items = get_news_items_by_date(conn, day=date_str)
 
         # Compute ai_scores (Milestone 3c)
-        # Fit TF-IDF on all historical items (richer vocabulary), similarity against positives only
-        corpus = get_all_historical_items(conn, as_of_date=date_str)
-        positives = get_positive_feedback_items(conn, as_of_date=date_str, user_id=user_id)
-        model = build_tfidf_model(corpus) if corpus else None
-        item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in items]
-        scores = compute_ai_scores(model, positives, item_dicts)
-        ai_scores = {item_dicts[i]["url"]: scores[i] for i in range(len(scores))}
+        ai_scores = compute_item_ai_scores(conn, items, as_of_date=date_str, user_id=user_id)
 
     ranked = rank_items(items, now=now, top_n=top_n, cfg=cfg, ai_scores=ai_scores)
     return {
         "date": date_str,
         "top_n": top_n,
         "count": len(ranked),
-        "items": [it.model_dump() for it in ranked],
+        "items": _news_item_list.dump_python(ranked),
     }
 
 
@@ -522,7 +646,7 @@ def get_digest(request: Request, date_str: str, top_n: int = 10) -> HTMLResponse
     if top_n < 1:
         raise HTTPException(status_code=400, detail="top_n must be >= 1")
 
-    now = datetime.fromisoformat(f"{day}T23:59:59+00:00")
+    now = _end_of_day_utc(day)
 
     # 2) DB reads
     with db_conn() as conn:
@@ -530,23 +654,24 @@ def get_digest(request: Request, date_str: str, top_n: int = 10) -> HTMLResponse
         user_id = user["user_id"] if user else None
 
         run = get_run_by_day(conn, day=day, user_id=user_id)
+
+        # 3) rank + explain with effective config (merges defaults + user_config + active_weights)
+        cfg = get_effective_rank_config(conn, user_id=user_id)
+
+        cache_key = _page_cache_key(conn, page="digest", day=day, user_id=user_id, top_n=top_n, cfg=cfg, run=run)
+        cached = _page_cache_get(cache_key)
+        if cached is not None:
+            return HTMLResponse(content=cached, status_code=200)
+
         items = get_news_items_by_date(conn, day=day)
 
         # If literally nothing exists, return a 404 (ProblemDetails JSON handled by middleware)
         if run is None and not items:
             raise HTTPException(status_code=404, detail="No data found for this day")
 
-        # 3) rank + explain with effective config (merges defaults + user_config + active_weights)
-        cfg = get_effective_rank_config(conn, user_id=user_id)
-
         # Compute ai_scores (Milestone 3c)
-        # Fit TF-IDF on all historical items (richer vocabulary), similarity against positives only
-        corpus = get_all_historical_items(conn, as_of_date=day)
-        positives = get_positive_feedback_items(conn, as_of_date=day, user_id=user_id)
-        model = build_tfidf_model(corpus) if corpus else None
-        item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in items]
-        scores = compute_ai_scores(model, positives, item_dicts)
-        ai_scores = {item_dicts[i]["url"]: scores[i] for i in range(len(scores))}
+        ai_scores = compute_item_ai_scores(conn, items, as_of_date=day, user_id=user_id)
+        cacheable = _page_cache_key_current(conn, cache_key)
 
     ranked = rank_items(items, now=now, top_n=top_n, cfg=cfg, ai_scores=ai_scores)
     explanations = [explain_item(it, now=now, cfg=cfg) for it in ranked]
@@ -561,7 +686,10 @@ def get_digest(request: Request, date_str: str, top_n: int = 10) -> HTMLResponse
         now=now,
         top_n=top_n,
     )
-    return HTMLResponse(content=html_text, status_code=200)
+    response = HTMLResponse(content=html_text, status_code=200)
+    if cacheable:
+        _page_cache_put(cache_key, response.body)
+    return response
 
 @app.get("/ui/date/{date_str}", response_class=HTMLResponse)
 def ui_date(request: Request, date_str: str, top_n: int = 10):
@@ -574,7 +702,7 @@ def ui_date(request: Request, date_str: str, top_n: int = 10):
     if top_n < 1:
         return render_ui_error(request, 400, "top_n must be >= 1")
 
-    now = datetime.fromisoformat(f"{day}T23:59:59+00:00")
+    now = _end_of_day_utc(day)
 
     with db_conn() as conn:
         # Get user for scoped queries (Milestone 4)
@@ -584,20 +712,20 @@ def ui_date(request: Request, date_str: str, top_n: int = 10):
         # Load effective rank config (merges defaults + user_config + active_weights)
         cfg = get_effective_rank_config(conn, user_id=user_id)
 
-        items_with_ids = get_news_items_by_date_with_ids(conn, day=day)
         run = get_run_by_day(conn, day=day, user_id=user_id)
+        cache_key = _page_cache_key(conn, page="ui_date", day=day, user_id=user_id, top_n=top_n, cfg=cfg, run=run)
+        cached = _page_cache_get(cache_key)
+        if cached is not None:
+            return HTMLResponse(content=cached)
+
+        items_with_ids = get_news_items_by_date_with_ids(conn, day=day)
 
         if not items_with_ids:
             return render_ui_error(request, 404, f"No items found for {day}.")
 
         # Compute ai_scores (user-scoped, Milestone 3c + 4)
-        corpus = get_all_historical_items(conn, as_of_date=day)
-        positives = get_positive_feedback_items(conn, as_of_date=day, user_id=user_id)
-        model = build_tfidf_model(corpus) if corpus else None
         items_only = [item for _, item in items_with_ids]
-        item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in items_only]
-        scores = compute_ai_scores(model, positives, item_dicts)
-        ai_scores = {item_dicts[i]["url"]: scores[i] for i in range(len(scores))}
+        ai_scores = compute_item_ai_scores(conn, items_only, as_of_date=day, user_id=user_id)
 
         display_items = build_ranked_display_items(conn, items_with_ids, now, cfg, top_n, ai_scores=ai_scores)
 
@@ -606,6 +734,7 @@ def ui_date(request: Request, date_str: str, top_n: int = 10):
         item_feedback = {}
         if run_id:
             item_feedback = get_all_item_feedback_for_run(conn, run_id=run_id, user_id=user_id)
+        cacheable = _page_cache_key_current(conn, cache_key)
 
     # Format run timestamp for display (customer-safe)
     run_status = None
@@ -621,11 +750,14 @@ def ui_date(request: Request, date_str: str, top_n: int = 10):
             except (ValueError, AttributeError):
                 pass
 
-    return templates.TemplateResponse(
+    response = render_template(
         request,
         "date.html",
         {"day": day, "items": display_items, "count": len(display_items), "run": run, "run_id": run_id, "run_status": run_status, "item_feedback": item_feedback}
     )
+    if cacheable:
+        _page_cache_put(cache_key, response.body)
+    return response
 
 @app.get("/ui/item/{item_id}", response_class=HTMLResponse)
 def ui_item(request: Request, item_id: int):
@@ -643,14 +775,14 @@ def ui_item(request: Request, item_id: int):
             return render_ui_error(request, 404, f"Item {item_id} not found.")
 
         item, day = result
-        now = datetime.fromisoformat(f"{day}T23:59:59+00:00")
+        now = _end_of_day_utc(day)
 
         # Load effective rank config (merges defaults + user_config + active_weights)
         cfg = get_effective_rank_config(conn, user_id=user_id)
 
     expl = explain_item(item, now=now, cfg=cfg)
 
-    return templates.TemplateResponse(
+    return render_template(
         request,
         "item.html",
         {"item_id": item_id, "item": item, "expl": expl, "day": day}
@@ -726,7 +858,6 @@ def debug_crash(request: Request):
 @app.get("/debug/stats")
 def debug_stats(request: Request):
     """Database stats for operational debugging - scoped to last 10 dates."""
-    import os
     request_id = request.state.request_id
     db_path = os.environ.get("NEWS_DB_PATH", "./data/news.db")
 
@@ -756,7 +887,6 @@ def debug_costs(request: Request, date: str | None = None):
     Returns:
         Daily spend, cap, remaining budget, and refusal counts.
     """
-    import os
     from datetime import date as date_type
 
     request_id = request.state.request_id
@@ -822,8 +952,61 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     resp.headers["X-Request-ID"] = rid
     return resp
 
+
+# Stored idempotent responses by (NEWS_DB_PATH, key), so retries and
+# double-clicks are answered without a DB lookup. Stored keys are never
+# deleted, so the TTL and LRU bound only memory, not correctness.
+IDEMPOTENCY_CACHE_TTL_S = 600.0
+IDEMPOTENCY_CACHE_MAX = 4096
+_idempotency_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+_idempotency_cache_lock = threading.Lock()
+
+
+def _idempotency_cache_get(key: str) -> str | None:
+    cache_key = (os.environ.get("NEWS_DB_PATH"), key)
+    with _idempotency_cache_lock:
+        hit = _idempotency_cache.get(cache_key)
+        if hit is None:
+            return None
+        if hit[0] <= time.monotonic():
+            del _idempotency_cache[cache_key]
+            return None
+        _idempotency_cache.move_to_end(cache_key)
+        return hit[1]
+
+
+def _idempotency_cache_put(key: str, response_json: str) -> None:
+    cache_key = (os.environ.get("NEWS_DB_PATH"), key)
+    with _idempotency_cache_lock:
+        _idempotency_cache[cache_key] = (time.monotonic() + IDEMPOTENCY_CACHE_TTL_S, response_json)
+        _idempotency_cache.move_to_end(cache_key)
+        while len(_idempotency_cache) > IDEMPOTENCY_CACHE_MAX:
+            _idempotency_cache.popitem(last=False)
+
+
+def _replay_idempotent_response(event: str, request_id: str, idempotency_key: str, response_json: str) -> Response:
+    log_event_deferred(event, request_id=request_id, idempotency_key=idempotency_key)
+    return _raw_json_response(response_json, request_id)
+
+
+def _dump_response(data: dict) -> str:
+    """Serialize a response body once, in JSONResponse's compact format."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _raw_json_response(response_json: str, request_id: str) -> Response:
+    """200 response from already-serialized JSON (no parse/re-dump)."""
+    return Response(
+        content=response_json,
+        media_type="application/json",
+        headers={"X-Request-ID": request_id}
+    )
+
+
+# Plain `def` (not async): the handler does blocking SQLite work, which
+# FastAPI then runs on its worker threadpool instead of the event loop.
 @app.post("/feedback/run")
-async def submit_run_feedback(
+def submit_run_feedback(
     request: Request,
     body: RunFeedbackRequest,
     idempotency_key: str | None = Header(None, alias="X-Idempotency-Key"),
@@ -834,71 +1017,80 @@ async def submit_run_feedback(
     Supports idempotency: Include X-Idempotency-Key header for safe retries.
     """
     request_id = request.state.request_id
+
+    # 1. Check idempotency key FIRST (prevents double-click duplicates);
+    #    repeats of a recent key are answered from memory
+    if idempotency_key:
+        response_json = _idempotency_cache_get(idempotency_key)
+        if response_json is not None:
+            return _replay_idempotent_response("run_feedback_idempotency_hit", request_id, idempotency_key, response_json)
+
     with db_conn() as conn:
         # Get current user for scoped feedback
         user = get_current_user(request, conn)
         user_id = user["user_id"] if user else None
 
-        # 1. Check idempotency key FIRST (prevents double-click duplicates)
-        if idempotency_key:
-            cached = get_idempotency_response(conn, key=idempotency_key)
-            if cached:
-                log_event("run_feedback_idempotency_hit",
-                    request_id=request_id,
-                    idempotency_key=idempotency_key
-                )
-                return JSONResponse(
-                    status_code=200,
-                    content=json.loads(cached["response_json"]),
-                    headers={"X-Request-ID": request_id}
-                )
+        # Admission, write and stored response share one transaction. With a
+        # key, BEGIN IMMEDIATE takes the write lock before the lookup, so a
+        # concurrent request with the same key (another worker or process)
+        # waits, then replays this response instead of writing again.
+        with conn:
+            if idempotency_key:
+                conn.execute("BEGIN IMMEDIATE")
+                cached = get_idempotency_response(conn, key=idempotency_key)
+                if cached:
+                    _idempotency_cache_put(idempotency_key, cached["response_json"])
+                    return _replay_idempotent_response("run_feedback_idempotency_hit", request_id, idempotency_key, cached["response_json"])
+
+            # 2. Process: Upsert feedback (only if not cached)
+            now = datetime.now(timezone.utc).isoformat()
+            feedback_id = upsert_run_feedback(
+                conn,
+                run_id=body.run_id,
+                rating=body.rating,
+                comment=body.comment,
+                created_at=now,
+                updated_at=now,
+                user_id=user_id,
+                commit=False,
+            )
 
-        # 2. Process: Upsert feedback (only if not cached)
-        now = datetime.now(timezone.utc).isoformat()
-        feedback_id = upsert_run_feedback(
-            conn,
-            run_id=body.run_id,
-            rating=body.rating,
-            comment=body.comment,
-            created_at=now,
-            updated_at=now,
-            user_id=user_id,
-        )
+            response_data = {
+                "status": "saved",
+                "feedback_id": feedback_id,
+                "run_id": body.run_id,
+                "rating": body.rating,
+                "request_id": request_id,
+            }
 
-        response_data = {
-            "status": "saved",
-            "feedback_id": feedback_id,
-            "run_id": body.run_id,
-            "rating": body.rating,
-            "request_id": request_id,
-        }
+            # 3. Store idempotency key (after successful processing)
+            # Serialized once: the same text is stored and sent
+            response_json = _dump_response(response_data)
+            if idempotency_key:
+                store_idempotency_response(
+                    conn,
+                    key=idempotency_key,
+                    endpoint="/feedback/run",
+                    response_json=response_json,
+                    created_at=now,
+                    commit=False,
+                )
 
-        # 3. Store idempotency key (after successful processing)
         if idempotency_key:
-            store_idempotency_response(
-                conn,
-                key=idempotency_key,
-                endpoint="/feedback/run",
-                response_json=json.dumps(response_data),
-                created_at=now,
-            )
+            _idempotency_cache_put(idempotency_key, response_json)
 
-        log_event("run_feedback_saved",
+        log_event_deferred("run_feedback_saved",
             request_id=request_id,
             feedback_id=feedback_id,
             run_id=body.run_id,
             rating=body.rating,
         )
 
-        return JSONResponse(
-            status_code=200,
-            content=response_data,
-            headers={"X-Request-ID": request_id}
-        )
+        return _raw_json_response(response_json, request_id)
 
 
 @app.post("/feedback/item")
-async def submit_item_feedback(
+def submit_item_feedback(
     request: Request,
     body: ItemFeedbackRequest,
     idempotency_key: str | None = Header(None, alias="X-Idempotency-Key"),
@@ -909,60 +1101,69 @@ async def submit_item_feedback(
     Supports idempotency: Include X-Idempotency-Key header for safe retries.
     """
     request_id = request.state.request_id
+
+    # Check idempotency key (recent keys are answered from memory)
+    if idempotency_key:
+        response_json = _idempotency_cache_get(idempotency_key)
+        if response_json is not None:
+            return _replay_idempotent_response("item_feedback_idempotency_hit", request_id, idempotency_key, response_json)
+
     with db_conn() as conn:
         # Get current user for scoped feedback
         user = get_current_user(request, conn)
         user_id = user["user_id"] if user else None
 
-        # Check idempotency key
-        if idempotency_key:
-            cached = get_idempotency_response(conn, key=idempotency_key)
-            if cached:
-                log_event("item_feedback_idempotency_hit",
-                    request_id=request_id,
-                    idempotency_key=idempotency_key
-                )
-                return JSONResponse(
-                    status_code=200,
-                    content=json.loads(cached["response_json"]),
-                    headers={"X-Request-ID": request_id}
-                )
+        # One transaction: key lookup under the write lock, upsert, stored response
+        with conn:
+            if idempotency_key:
+                conn.execute("BEGIN IMMEDIATE")
+                cached = get_idempotency_response(conn, key=idempotency_key)
+                if cached:
+                    _idempotency_cache_put(idempotency_key, cached["response_json"])
+                    return _replay_idempotent_response("item_feedback_idempotency_hit", request_id, idempotency_key, cached["response_json"])
+
+            # Upsert feedback (insert or update)
+            now = datetime.now(timezone.utc).isoformat()
+            useful_int = 1 if body.useful else 0
+            feedback_id = upsert_item_feedback(
+                conn,
+                run_id=body.run_id,
+                item_url=body.item_url,
+                useful=useful_int,
+                reason_tag=body.reason_tag,
+                created_at=now,
+                updated_at=now,
+                user_id=user_id,
+                commit=False,
+            )
 
-        # Upsert feedback (insert or update)
-        now = datetime.now(timezone.utc).isoformat()
-        useful_int = 1 if body.useful else 0
-        feedback_id = upsert_item_feedback(
-            conn,
-            run_id=body.run_id,
-            item_url=body.item_url,
-            useful=useful_int,
-            reason_tag=body.reason_tag,
-            created_at=now,
-            updated_at=now,
-            user_id=user_id,
-        )
+            response_data = {
+                "status": "saved",
+                "feedback_id": feedback_id,
+                "run_id": body.run_id,
+                "item_url": body.item_url,
+                "useful": body.useful,
+                "reason_tag": body.reason_tag,
+                "request_id": request_id,
+            }
 
-        response_data = {
-            "status": "saved",
-            "feedback_id": feedback_id,
-            "run_id": body.run_id,
-            "item_url": body.item_url,
-            "useful": body.useful,
-            "reason_tag": body.reason_tag,
-            "request_id": request_id,
-        }
+            # Store idempotency key
+            # Serialized once: the same text is stored and sent
+            response_json = _dump_response(response_data)
+            if idempotency_key:
+                store_idempotency_response(
+                    conn,
+                    key=idempotency_key,
+                    endpoint="/feedback/item",
+                    response_json=response_json,
+                    created_at=now,
+                    commit=False,
+                )
 
-        # Store idempotency key
         if idempotency_key:
-            store_idempotency_response(
-                conn,
-                key=idempotency_key,
-                endpoint="/feedback/item",
-                response_json=json.dumps(response_data),
-                created_at=now,
-            )
+            _idempotency_cache_put(idempotency_key, response_json)
 
-        log_event("item_feedback_saved",
+        log_event_deferred("item_feedback_saved",
             request_id=request_id,
             feedback_id=feedback_id,
             run_id=body.run_id,
@@ -970,11 +1171,7 @@ async def submit_item_feedback(
             useful=body.useful,
         )
 
-        return JSONResponse(
-            status_code=200,
-            content=response_data,
-            headers={"X-Request-ID": request_id}
-        )
+        return _raw_json_response(response_json, request_id)
 
 
 # --- Suggestion API Endpoints (Milestone 4.5 Step 3) ---
@@ -993,40 +1190,19 @@ def api_get_suggestions(request: Request):
             raise HTTPException(status_code=401, detail="Authentication required")
 
         user_id = user["user_id"]
-        suggestions = get_pending_suggestions(conn, user_id=user_id, status="pending")
+        suggestions = list_suggestions(conn, user_id=user_id, status="pending")
 
-        return {
-            "suggestions": [
-                {
-                    "suggestion_id": s["suggestion_id"],
-                    "suggestion_type": s["suggestion_type"],
-                    "field": s["field"],
-                    "target_key": s["target_key"],
-                    "current_value": s["current_value"],
-                    "suggested_value": s["suggested_value"],
-                    "reason": s["reason"],
-                    "evidence_count": s["evidence_count"],
-                    "status": s["status"],
-                    "created_at": s["created_at"],
-                }
-                for s in suggestions
-            ],
-            "count": len(suggestions),
-        }
+        return {"suggestions": suggestions, "count": len(suggestions)}
 
 
-@app.post("/api/suggestions/generate")
-def api_generate_suggestions(request: Request):
-    """
-    Trigger suggestion generation for the current user.
+# An advisor run is several LLM round-trips (seconds). It gets its own
+# small pool, like bcrypt, so a few runs can't hold the AnyIO worker threads
+# the sync endpoints share; each worker thread uses its own pooled conn.
+_advisor_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="advisor")
 
-    Check order:
-    1. If pending suggestions exist → blocked_pending
-    2. If suggestions created today → already_generated
-    3. Check data sufficiency → skipped or ready
 
-    Auth required.
-    """
+def _check_can_generate(request: Request) -> tuple[str, dict | None]:
+    """Run the cheap generate checks; returns (user_id, early result or None)."""
     with db_conn() as conn:
         user = get_current_user(request, conn)
         if not user:
@@ -1034,43 +1210,63 @@ def api_generate_suggestions(request: Request):
 
         user_id = user["user_id"]
 
+        # Checks 1 and 2 share one query: pending ids and ids created today
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        pending_ids, today_ids = get_generate_gate(conn, user_id=user_id, day=today)
+
         # Check 1: Any pending suggestions?
-        pending = get_pending_suggestions(conn, user_id=user_id, status="pending")
-        if pending:
-            return {
+        if pending_ids:
+            return user_id, {
                 "status": "blocked_pending",
-                "pending_count": len(pending),
-                "suggestion_ids": [s["suggestion_id"] for s in pending],
+                "pending_count": len(pending_ids),
+                "suggestion_ids": pending_ids,
             }
 
         # Check 2: Any suggestions created today (any status)?
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        today_suggestions = get_suggestions_for_today(conn, user_id=user_id, day=today)
-        if today_suggestions:
-            return {
+        if today_ids:
+            return user_id, {
                 "status": "already_generated",
-                "suggestion_ids": [s["suggestion_id"] for s in today_suggestions],
+                "suggestion_ids": today_ids,
             }
 
         # Check 3: Data sufficiency
         feedback_result = query_user_feedback(conn, user_id=user_id)
         if feedback_result.get("insufficient_data"):
-            return {
+            return user_id, {
                 "status": "skipped",
                 "reason": feedback_result.get("reason", "Insufficient feedback data"),
             }
 
         # Check 4: Can we run the advisor?
-        try:
-            from src.advisor import run_advisor, OPENAI_API_KEY as _advisor_key
-            if not _advisor_key:
-                return {"status": "ready", "can_generate": True}
-        except Exception:
-            return {"status": "ready", "can_generate": True}
+        if not advisor.OPENAI_API_KEY:
+            return user_id, {"status": "ready", "can_generate": True}
+
+        return user_id, None
 
-        # Run the advisor agent (sync, blocking)
-        result = run_advisor(user_id, conn)
-        return result
+
+def _run_advisor_for(user_id: str) -> dict:
+    with db_conn() as conn:
+        return advisor.run_advisor(user_id, conn)
+
+
+@app.post("/api/suggestions/generate")
+async def api_generate_suggestions(request: Request):
+    """
+    Trigger suggestion generation for the current user.
+
+    Check order:
+    1. If pending suggestions exist → blocked_pending
+    2. If suggestions created today → already_generated
+    3. Check data sufficiency → skipped or ready
+
+    Auth required.
+    """
+    user_id, early = await run_in_threadpool(_check_can_generate, request)
+    if early is not None:
+        return early
+
+    # Run the advisor agent (sync, blocking) off the shared worker threads
+    return await asyncio.get_running_loop().run_in_executor(_advisor_pool, _run_advisor_for, user_id)
 
 
 @app.post("/api/suggestions/{suggestion_id}/accept")
@@ -1087,104 +1283,113 @@ def api_accept_suggestion(request: Request, suggestion_id: int):
 
         user_id = user["user_id"]
 
-        # Get suggestion and validate ownership
-        suggestion = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
-        if not suggestion:
-            raise HTTPException(status_code=404, detail="Suggestion not found")
-        if suggestion["user_id"] != user_id:
-            raise HTTPException(status_code=403, detail="Not your suggestion")
-
-        # Check if already resolved
-        if suggestion["status"] != "pending":
-            return JSONResponse(
-                status_code=409,
-                content={
-                    "error": "already_resolved",
-                    "current_status": suggestion["status"],
-                    "suggestion_id": suggestion_id,
-                },
-            )
-
-        # Get current config (before snapshot)
-        current_config = get_user_config(conn, user_id=user_id)
-        config_before = current_config if current_config else {}
-
-        # Build new config (deep copy to preserve before snapshot)
-        config_after = copy.deepcopy(config_before)
-
-        suggestion_type = suggestion["suggestion_type"]
-        target_key = suggestion["target_key"]
-        suggested_value = suggestion["suggested_value"]
-
-        # Apply change based on suggestion_type
-        if suggestion_type == "add_topic":
-            topics = config_after.get("topics", [])
-            if suggested_value not in topics:
-                topics.append(suggested_value)
-            config_after["topics"] = topics
-
-        elif suggestion_type == "remove_topic":
-            topics = config_after.get("topics", [])
-            if suggested_value in topics:
-                topics.remove(suggested_value)
-            config_after["topics"] = topics
-
-        elif suggestion_type in ("boost_source", "reduce_source"):
-            # Guard: target_key required for source suggestions
-            if not target_key:
+        # Status check and every write share one transaction; taking the
+        # write lock first means a concurrent accept/reject of the same
+        # suggestion sees it resolved and gets the 409.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Get suggestion and validate ownership
+            suggestion = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
+            if not suggestion:
+                raise HTTPException(status_code=404, detail="Suggestion not found")
+            if suggestion["user_id"] != user_id:
+                raise HTTPException(status_code=403, detail="Not your suggestion")
+
+            # Check if already resolved
+            if suggestion["status"] != "pending":
                 return JSONResponse(
-                    status_code=400,
+                    status_code=409,
                     content={
-                        "error": "missing_target_key",
+                        "error": "already_resolved",
+                        "current_status": suggestion["status"],
                         "suggestion_id": suggestion_id,
-                        "suggestion_type": suggestion_type,
                     },
                 )
-            # Parse weight
-            try:
-                weight = float(suggested_value)
-            except (ValueError, TypeError):
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": "invalid_weight",
-                        "suggestion_id": suggestion_id,
-                        "value": suggested_value,
-                    },
-                )
-            source_weights = config_after.get("source_weights", {})
-            source_weights[target_key] = weight
-            config_after["source_weights"] = source_weights
-
-        # Save updated config
-        upsert_user_config(conn, user_id=user_id, config=config_after)
-
-        # Update suggestion status
-        update_suggestion_status(conn, suggestion_id=suggestion_id, status="accepted")
-
-        # Compute outcome value (target, not numeric weight)
-        outcome_value = target_key if target_key else suggested_value
-
-        # Insert outcome
-        outcome_id = insert_outcome(
-            conn,
-            suggestion_id=suggestion_id,
-            user_id=user_id,
-            suggestion_type=suggestion_type,
-            suggestion_value=outcome_value,
-            outcome="accepted",
-            config_before=config_before,
-            config_after=config_after,
-            evidence_summary=suggestion["evidence_items"],
-        )
 
-        # Update profile stats
-        increment_profile_stats(
-            conn,
-            user_id=user_id,
-            suggestion_type=suggestion_type,
-            outcome="accepted",
-        )
+            # Get current config (before snapshot)
+            current_config = get_user_config(conn, user_id=user_id)
+            config_before = current_config if current_config else {}
+
+            # Build new config; the one list/dict that changes is copied below,
+            # which keeps the before snapshot intact without a deepcopy
+            config_after = {**config_before}
+
+            suggestion_type = suggestion["suggestion_type"]
+            target_key = suggestion["target_key"]
+            suggested_value = suggestion["suggested_value"]
+
+            # Apply change based on suggestion_type
+            if suggestion_type == "add_topic":
+                topics = list(config_after.get("topics", []))
+                if suggested_value not in topics:
+                    topics.append(suggested_value)
+                config_after["topics"] = topics
+
+            elif suggestion_type == "remove_topic":
+                topics = list(config_after.get("topics", []))
+                if suggested_value in topics:
+                    topics.remove(suggested_value)
+                config_after["topics"] = topics
+
+            elif suggestion_type in ("boost_source", "reduce_source"):
+                # Guard: target_key required for source suggestions
+                if not target_key:
+                    return JSONResponse(
+                        status_code=400,
+                        content={
+                            "error": "missing_target_key",
+                            "suggestion_id": suggestion_id,
+                            "suggestion_type": suggestion_type,
+                        },
+                    )
+                # Parse weight
+                try:
+                    weight = float(suggested_value)
+                except (ValueError, TypeError):
+                    return JSONResponse(
+                        status_code=400,
+                        content={
+                            "error": "invalid_weight",
+                            "suggestion_id": suggestion_id,
+                            "value": suggested_value,
+                        },
+                    )
+                source_weights = dict(config_after.get("source_weights", {}))
+                source_weights[target_key] = weight
+                config_after["source_weights"] = source_weights
+
+            # Save updated config
+            upsert_user_config(conn, user_id=user_id, config=config_after, commit=False)
+
+            # Update suggestion status
+            update_suggestion_status(conn, suggestion_id=suggestion_id, status="accepted", commit=False)
+
+            # Compute outcome value (target, not numeric weight)
+            outcome_value = target_key if target_key else suggested_value
+
+            # Insert outcome
+            outcome_id = insert_outcome(
+                conn,
+                suggestion_id=suggestion_id,
+                user_id=user_id,
+                suggestion_type=suggestion_type,
+                suggestion_value=outcome_value,
+                outcome="accepted",
+                config_before=config_before,
+                config_after=config_after,
+                evidence_summary=suggestion["evidence_items"],
+                commit=False,
+            )
+
+            # Update profile stats
+            increment_profile_stats(
+                conn,
+                user_id=user_id,
+                suggestion_type=suggestion_type,
+                outcome="accepted",
+                commit=False,
+            )
 
         return {
             "success": True,
@@ -1208,54 +1413,60 @@ def api_reject_suggestion(request: Request, suggestion_id: int):
 
         user_id = user["user_id"]
 
-        # Get suggestion and validate ownership
-        suggestion = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
-        if not suggestion:
-            raise HTTPException(status_code=404, detail="Suggestion not found")
-        if suggestion["user_id"] != user_id:
-            raise HTTPException(status_code=403, detail="Not your suggestion")
-
-        # Check if already resolved
-        if suggestion["status"] != "pending":
-            return JSONResponse(
-                status_code=409,
-                content={
-                    "error": "already_resolved",
-                    "current_status": suggestion["status"],
-                    "suggestion_id": suggestion_id,
-                },
-            )
+        # Status check and writes share one transaction, as in accept
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
 
-        # Get current config for snapshot (no change)
-        current_config = get_user_config(conn, user_id=user_id)
-        config_before = current_config if current_config else {}
-
-        # Update suggestion status
-        update_suggestion_status(conn, suggestion_id=suggestion_id, status="rejected")
-
-        # Compute outcome value (target, not numeric weight)
-        target_key = suggestion["target_key"]
-        suggested_value = suggestion["suggested_value"]
-        outcome_value = target_key if target_key else suggested_value
-
-        # Insert outcome (no config_after since no change)
-        outcome_id = insert_outcome(
-            conn,
-            suggestion_id=suggestion_id,
-            user_id=user_id,
-            suggestion_type=suggestion["suggestion_type"],
-            suggestion_value=outcome_value,
-            outcome="rejected",
-            config_before=config_before,
-        )
+            # Get suggestion and validate ownership
+            suggestion = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
+            if not suggestion:
+                raise HTTPException(status_code=404, detail="Suggestion not found")
+            if suggestion["user_id"] != user_id:
+                raise HTTPException(status_code=403, detail="Not your suggestion")
 
-        # Update profile stats
-        increment_profile_stats(
-            conn,
-            user_id=user_id,
-            suggestion_type=suggestion["suggestion_type"],
-            outcome="rejected",
-        )
+            # Check if already resolved
+            if suggestion["status"] != "pending":
+                return JSONResponse(
+                    status_code=409,
+                    content={
+                        "error": "already_resolved",
+                        "current_status": suggestion["status"],
+                        "suggestion_id": suggestion_id,
+                    },
+                )
+
+            # Get current config for snapshot (no change)
+            current_config = get_user_config(conn, user_id=user_id)
+            config_before = current_config if current_config else {}
+
+            # Update suggestion status
+            update_suggestion_status(conn, suggestion_id=suggestion_id, status="rejected", commit=False)
+
+            # Compute outcome value (target, not numeric weight)
+            target_key = suggestion["target_key"]
+            suggested_value = suggestion["suggested_value"]
+            outcome_value = target_key if target_key else suggested_value
+
+            # Insert outcome (no config_after since no change)
+            outcome_id = insert_outcome(
+                conn,
+                suggestion_id=suggestion_id,
+                user_id=user_id,
+                suggestion_type=suggestion["suggestion_type"],
+                suggestion_value=outcome_value,
+                outcome="rejected",
+                config_before=config_before,
+                commit=False,
+            )
+
+            # Update profile stats
+            increment_profile_stats(
+                conn,
+                user_id=user_id,
+                suggestion_type=suggestion["suggestion_type"],
+                outcome="rejected",
+                commit=False,
+            )
 
         return {
             "success": True,
@@ -1279,135 +1490,123 @@ def api_accept_all_suggestions(request: Request):
 
         user_id = user["user_id"]
 
-        # Get all pending suggestions
-        pending = get_pending_suggestions(conn, user_id=user_id, status="pending")
-
         results = []
         accepted_count = 0
 
-        for suggestion in pending:
-            suggestion_id = suggestion["suggestion_id"]
+        # One write transaction for the whole batch. Taking the write lock
+        # before reading means every row returned below is still pending and
+        # owned by this user, so there's no per-suggestion re-check.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
 
-            # Re-check status and ownership (in case concurrent modification)
-            current = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
-            if not current or current["status"] != "pending":
-                results.append({
+            # Get all pending suggestions
+            pending = get_pending_suggestions(conn, user_id=user_id, status="pending")
+
+            # Config is applied in memory, suggestion by suggestion, and saved once
+            current_config = get_user_config(conn, user_id=user_id)
+            config = current_config if current_config else {}
+
+            statuses: list[tuple[int, str]] = []
+            outcomes: list[dict] = []
+            accepted_by_type: Counter[str] = Counter()
+
+            for suggestion in pending:
+                suggestion_id = suggestion["suggestion_id"]
+                config_before = config
+                config_after = {**config_before}
+
+                suggestion_type = suggestion["suggestion_type"]
+                target_key = suggestion["target_key"]
+                suggested_value = suggestion["suggested_value"]
+
+                # Apply change
+                if suggestion_type == "add_topic":
+                    topics = list(config_after.get("topics", []))
+                    if suggested_value not in topics:
+                        topics.append(suggested_value)
+                    config_after["topics"] = topics
+
+                elif suggestion_type == "remove_topic":
+                    topics = list(config_after.get("topics", []))
+                    if suggested_value in topics:
+                        topics.remove(suggested_value)
+                    config_after["topics"] = topics
+
+                elif suggestion_type in ("boost_source", "reduce_source"):
+                    # Guard: target_key required for source suggestions
+                    if not target_key:
+                        statuses.append((suggestion_id, "rejected"))
+                        outcomes.append({
+                            "suggestion_id": suggestion_id,
+                            "user_id": user_id,
+                            "suggestion_type": suggestion_type,
+                            "suggestion_value": suggested_value,
+                            "outcome": "rejected",
+                            "config_before": config_before,
+                        })
+                        results.append({
+                            "suggestion_id": suggestion_id,
+                            "status": "rejected",
+                            "error": "missing_target_key",
+                        })
+                        continue
+                    try:
+                        weight = float(suggested_value)
+                    except (ValueError, TypeError):
+                        statuses.append((suggestion_id, "rejected"))
+                        outcomes.append({
+                            "suggestion_id": suggestion_id,
+                            "user_id": user_id,
+                            "suggestion_type": suggestion_type,
+                            "suggestion_value": target_key,
+                            "outcome": "rejected",
+                            "config_before": config_before,
+                        })
+                        results.append({
+                            "suggestion_id": suggestion_id,
+                            "status": "rejected",
+                            "error": "invalid_weight",
+                            "value": suggested_value,
+                        })
+                        continue
+                    source_weights = dict(config_after.get("source_weights", {}))
+                    source_weights[target_key] = weight
+                    config_after["source_weights"] = source_weights
+
+                config = config_after
+                statuses.append((suggestion_id, "accepted"))
+                outcomes.append({
                     "suggestion_id": suggestion_id,
-                    "status": "failed",
-                    "error": "already_resolved",
-                    "current_status": current["status"] if current else "not_found",
+                    "user_id": user_id,
+                    "suggestion_type": suggestion_type,
+                    "suggestion_value": target_key if target_key else suggested_value,
+                    "outcome": "accepted",
+                    "config_before": config_before,
+                    "config_after": config_after,
+                    "evidence_summary": suggestion["evidence_items"],
                 })
-                continue
+                accepted_by_type[suggestion_type] += 1
 
-            # Re-validate user_id (security hardening)
-            if current["user_id"] != user_id:
                 results.append({
                     "suggestion_id": suggestion_id,
-                    "status": "failed",
-                    "error": "not_owned",
+                    "status": "accepted",
                 })
-                continue
-
-            # Get current config
-            current_config = get_user_config(conn, user_id=user_id)
-            config_before = current_config if current_config else {}
-            config_after = copy.deepcopy(config_before)
-
-            suggestion_type = suggestion["suggestion_type"]
-            target_key = suggestion["target_key"]
-            suggested_value = suggestion["suggested_value"]
-
-            # Apply change
-            if suggestion_type == "add_topic":
-                topics = config_after.get("topics", [])
-                if suggested_value not in topics:
-                    topics.append(suggested_value)
-                config_after["topics"] = topics
-
-            elif suggestion_type == "remove_topic":
-                topics = config_after.get("topics", [])
-                if suggested_value in topics:
-                    topics.remove(suggested_value)
-                config_after["topics"] = topics
-
-            elif suggestion_type in ("boost_source", "reduce_source"):
-                # Guard: target_key required for source suggestions
-                if not target_key:
-                    update_suggestion_status(conn, suggestion_id=suggestion_id, status="rejected")
-                    insert_outcome(
-                        conn,
-                        suggestion_id=suggestion_id,
-                        user_id=user_id,
-                        suggestion_type=suggestion_type,
-                        suggestion_value=suggested_value,
-                        outcome="rejected",
-                        config_before=config_before,
-                    )
-                    results.append({
-                        "suggestion_id": suggestion_id,
-                        "status": "rejected",
-                        "error": "missing_target_key",
-                    })
-                    continue
-                try:
-                    weight = float(suggested_value)
-                except (ValueError, TypeError):
-                    update_suggestion_status(conn, suggestion_id=suggestion_id, status="rejected")
-                    insert_outcome(
-                        conn,
-                        suggestion_id=suggestion_id,
-                        user_id=user_id,
-                        suggestion_type=suggestion_type,
-                        suggestion_value=target_key,
-                        outcome="rejected",
-                        config_before=config_before,
-                    )
-                    results.append({
-                        "suggestion_id": suggestion_id,
-                        "status": "rejected",
-                        "error": "invalid_weight",
-                        "value": suggested_value,
-                    })
-                    continue
-                source_weights = config_after.get("source_weights", {})
-                source_weights[target_key] = weight
-                config_after["source_weights"] = source_weights
-
-            # Save config
-            upsert_user_config(conn, user_id=user_id, config=config_after)
-
-            # Update status
-            update_suggestion_status(conn, suggestion_id=suggestion_id, status="accepted")
-
-            # Outcome value
-            outcome_value = target_key if target_key else suggested_value
-
-            # Insert outcome
-            insert_outcome(
-                conn,
-                suggestion_id=suggestion_id,
-                user_id=user_id,
-                suggestion_type=suggestion_type,
-                suggestion_value=outcome_value,
-                outcome="accepted",
-                config_before=config_before,
-                config_after=config_after,
-                evidence_summary=suggestion["evidence_items"],
-            )
-
-            # Update profile stats
-            increment_profile_stats(
-                conn,
-                user_id=user_id,
-                suggestion_type=suggestion_type,
-                outcome="accepted",
-            )
-
-            results.append({
-                "suggestion_id": suggestion_id,
-                "status": "accepted",
-            })
-            accepted_count += 1
+                accepted_count += 1
+
+            # Save config, statuses, outcomes and profile stats in one commit
+            if accepted_count:
+                upsert_user_config(conn, user_id=user_id, config=config, commit=False)
+            update_suggestion_statuses(conn, statuses=statuses, commit=False)
+            insert_outcomes(conn, outcomes=outcomes, commit=False)
+            for suggestion_type, count in accepted_by_type.items():
+                increment_profile_stats(
+                    conn,
+                    user_id=user_id,
+                    suggestion_type=suggestion_type,
+                    outcome="accepted",
+                    count=count,
+                    commit=False,
+                )
 
         return {
             "success": True,
@@ -1426,7 +1625,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     errors = exc.errors()
     if errors:
         first = errors[0]
-        loc = ".".join(str(x) for x in first.get("loc", []))  #e.g., "body.rating"
+        loc = ".".join(map(str, first.get("loc", ())))  #e.g., "body.rating"
         msg = first.get("msg", "Validation error")
         message = f"{loc}: {msg}"
     else:
@@ -9,40 +9,39 @@ from src.schemas import NewsItem
 from src.normalize import dedupe_key
 from src.redact import sanitize
 
-def insert_news_items(conn: sqlite3.Connection,items: list[NewsItem]) -> dict:
-    inserted = 0
-    duplicates = 0
 
+def _dumps(obj) -> str:
+    """Compact JSON for TEXT columns (no padding spaces after , and :)."""
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def insert_news_items(conn: sqlite3.Connection, items: list[NewsItem], *, commit: bool = True) -> dict:
     sql = """
     INSERT OR IGNORE INTO news_items
     (dedupe_key, source, url, published_at, title, evidence, created_at)
     VALUES (?, ?, ?, ?, ?, ?, ?);
     """
-    for item in items:
-        key = dedupe_key(str(item.url), item.title)
-        created_at = datetime.now(timezone.utc).isoformat()
-        published_at = item.published_at.isoformat()
-
-        cur = conn.execute(
-            sql,
-            (
-                key,
-                item.source,
-                str(item.url),
-                published_at,
-                item.title,
-                item.evidence,
-                created_at,
-            ),
+    created_at = datetime.now(timezone.utc).isoformat()
+    rows = [
+        (
+            dedupe_key(str(item.url), item.title),
+            item.source,
+            str(item.url),
+            item.published_at.isoformat(),
+            item.title,
+            item.evidence,
+            created_at,
         )
+        for item in items
+    ]
 
-        if cur.rowcount == 1:
-            inserted += 1
-        else:
-            duplicates += 1
+    # One statement for the whole batch; rowcount sums the rows actually
+    # inserted, everything else was ignored as a duplicate.
+    inserted = conn.executemany(sql, rows).rowcount if rows else 0
 
-    conn.commit()
-    return {"inserted": inserted, "duplicates": duplicates}
+    if commit:
+        conn.commit()
+    return {"inserted": inserted, "duplicates": len(rows) - inserted}
 
 
 def start_run(
@@ -63,7 +62,7 @@ def start_run(
     )
     conn.commit()
 
-def finish_run_ok(conn: sqlite3.Connection, run_id: str, finished_at: datetime, *, after_dedupe: int, inserted: int, duplicates: int) -> None:
+def finish_run_ok(conn: sqlite3.Connection, run_id: str, finished_at: datetime, *, after_dedupe: int, inserted: int, duplicates: int, commit: bool = True) -> None:
     conn.execute(
         """
         UPDATE runs
@@ -72,7 +71,8 @@ def finish_run_ok(conn: sqlite3.Connection, run_id: str, finished_at: datetime,
         """,
         (finished_at, "ok", after_dedupe, inserted, duplicates, run_id)
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 def finish_run_error(conn: sqlite3.Connection, run_id: str, finished_at: datetime, *, error_type: str, error_message: str) -> None:
     conn.execute(
@@ -354,29 +354,35 @@ def upsert_run_failures(
     run_id: str,
     breakdown: dict[str, int],
     sources: dict[str, list[str]] | None = None,
+    commit: bool = True,
 ) -> None:
     """Store failure counts and optionally the sources (URLs/paths) that failed.
 
     Args:
         breakdown: {error_code: count}
         sources: {error_code: [url1, url2, ...]} - optional, stores which feeds failed
+        commit: False leaves the transaction open for the caller to commit
     """
     conn.execute("DELETE FROM run_failures WHERE run_id = ?;", (run_id,))
 
     created_at = datetime.now(timezone.utc).isoformat()
     sources = sources or {}
 
-    for error_code, count in breakdown.items():
-        failed_sources = sources.get(error_code, [])
-        failed_sources_json = json.dumps(failed_sources) if failed_sources else None
-        conn.execute(
-            """
-            INSERT INTO run_failures (run_id, error_code, count, failed_sources, created_at)
-            VALUES (?, ?, ?, ?, ?);
-            """, (run_id, error_code, count, failed_sources_json, created_at)
-        )
+    rows = [
+        (run_id, error_code, count,
+         _dumps(sources[error_code]) if sources.get(error_code) else None,
+         created_at)
+        for error_code, count in breakdown.items()
+    ]
+    conn.executemany(
+        """
+        INSERT INTO run_failures (run_id, error_code, count, failed_sources, created_at)
+        VALUES (?, ?, ?, ?, ?);
+        """, rows
+    )
 
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def get_run_failures_with_sources(conn: sqlite3.Connection, *, run_id: str) -> dict:
@@ -407,7 +413,7 @@ def get_run_failures_with_sources(conn: sqlite3.Connection, *, run_id: str) -> d
     return {"by_code": by_code, "failed_sources": failed_sources}
 
 
-def insert_run_artifact(conn: sqlite3.Connection, *, run_id: str, kind: str, path: str) -> None:
+def insert_run_artifact(conn: sqlite3.Connection, *, run_id: str, kind: str, path: str, commit: bool = True) -> None:
     """
     Record an artifact produced by a run.
     Uses INSERT OR REPLACE so re-runs overwrite cleanly.
@@ -420,7 +426,8 @@ def insert_run_artifact(conn: sqlite3.Connection, *, run_id: str, kind: str, pat
         """,
         (run_id, kind, path, created_at),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 def get_run_artifacts(conn: sqlite3.Connection, *, run_id: str) -> dict[str, str]:
     """
@@ -501,7 +508,7 @@ def write_audit_log(conn: sqlite3.Connection, *, event_type: str, ts: datetime |
             """
             INSERT INTO audit_logs (ts, event_type, run_id, day, details_json)
             VALUES (?, ?, ?, ?, ?)
-            """,(ts_str, event_type, run_id, day, json.dumps(details_safe))
+            """,(ts_str, event_type, run_id, day, _dumps(details_safe))
         )
         conn.commit()
     except Exception:
@@ -648,14 +655,32 @@ def get_idempotency_response(conn: sqlite3.Connection, *, key: str) -> dict | No
     }
 
 def store_idempotency_response(conn: sqlite3.Connection, *, key: str, endpoint: str,
-                               response_json: str, created_at: str) -> None:
+                               response_json: str, created_at: str, commit: bool = True) -> None:
     """Store response for idempotency key. INSERT OR IGNORE for safety."""
     conn.execute(
         """INSERT OR IGNORE INTO idempotency_keys (key, endpoint, response_json, created_at)
            VALUES (?, ?, ?, ?)""",
         (key, endpoint, response_json, created_at)
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+
+
+def get_cached_summaries(conn: sqlite3.Connection, *, cache_keys: list[str]) -> dict[str, str]:
+    """
+    Look up several cached LLM summaries in one query.
+
+    Returns:
+        cache_key -> summary_json for the keys that are cached
+    """
+    if not cache_keys:
+        return {}
+    placeholders = ",".join("?" * len(cache_keys))
+    rows = conn.execute(
+        f"SELECT cache_key, summary_json FROM summary_cache WHERE cache_key IN ({placeholders})",
+        list(cache_keys),
+    ).fetchall()
+    return dict(rows)
 
 
 def upsert_run_feedback(
@@ -667,6 +692,7 @@ def upsert_run_feedback(
     created_at: str,
     updated_at: str,
     user_id: str | None = None,
+    commit: bool = True,
 ) -> int:
     """
     Insert or update feedback for a run (overall digest rating).
@@ -692,7 +718,8 @@ def upsert_run_feedback(
         (run_id, rating, comment, created_at, updated_at, user_id)
     )
     row = cur.fetchone()
-    conn.commit()
+    if commit:
+        conn.commit()
     return row[0]
 
 
@@ -707,6 +734,7 @@ def upsert_item_feedback(
     updated_at: str,
     reason_tag: str | None = None,
     user_id: str | None = None,
+    commit: bool = True,
 ) -> int:
     """
     Insert or update feedback for a specific item in a run.
@@ -734,7 +762,8 @@ def upsert_item_feedback(
         (run_id, item_url, useful, reason_tag, created_at, updated_at, user_id)
     )
     row = cur.fetchone()
-    conn.commit()
+    if commit:
+        conn.commit()
     return row[0]
 
 
@@ -767,6 +796,54 @@ def count_distinct_dates(conn: sqlite3.Connection) -> int:
     ).fetchone()[0]
 
 
+def get_dates_with_run_ratings(
+    conn: sqlite3.Connection,
+    *,
+    limit: int,
+    offset: int = 0,
+    user_id: str | None = None,
+) -> list[dict]:
+    """Get a page of distinct item dates with that day's latest ingest run and its rating.
+
+    One query instead of a run and feedback lookup per date. run_id is None
+    when the day has no run; rating is 0 when the run has no feedback.
+
+    Args:
+        limit: Max dates to return
+        offset: Skip first N dates (for pagination)
+        user_id: Filter runs and feedback by user_id. None = global/legacy (user_id IS NULL).
+
+    Returns:
+        [{"day": "2026-01-25", "run_id": "abc", "rating": 4}, ...], newest day first
+    """
+    rows = conn.execute(
+        """
+        WITH days AS (
+            SELECT DISTINCT substr(published_at, 1, 10) AS day
+            FROM news_items
+            ORDER BY day DESC
+            LIMIT ? OFFSET ?
+        ),
+        latest AS (
+            SELECT d.day,
+                   (SELECT r.run_id FROM runs r
+                    WHERE substr(r.started_at, 1, 10) = d.day
+                      AND r.run_type = 'ingest'
+                      AND r.user_id IS ?
+                    ORDER BY r.started_at DESC
+                    LIMIT 1) AS run_id
+            FROM days d
+        )
+        SELECT l.day, l.run_id, COALESCE(rf.rating, 0)
+        FROM latest l
+        LEFT JOIN run_feedback rf ON rf.run_id = l.run_id AND rf.user_id IS ?
+        ORDER BY l.day DESC;
+        """,
+        (limit, offset, user_id, user_id),
+    ).fetchall()
+    return [{"day": row[0], "run_id": row[1], "rating": row[2]} for row in rows]
+
+
 def count_items_for_dates(conn: sqlite3.Connection, *, dates: list[str]) -> int:
     """Count total news items for a list of dates."""
     if not dates:
@@ -969,6 +1046,16 @@ def get_all_item_feedback_for_run(
     }
 
 
+def get_content_version(conn: sqlite3.Connection) -> int:
+    """Change counter for the data behind a rendered digest page.
+
+    Bumped by triggers on every insert, update or delete of news_items
+    (including suggested_tags), item_feedback and summary_cache, so it can
+    be used as part of a render cache key.
+    """
+    return conn.execute("SELECT version FROM content_version WHERE id = 1;").fetchone()[0]
+
+
 def get_all_item_feedback_by_user(
     conn: sqlite3.Connection,
     *,
@@ -1041,6 +1128,35 @@ def get_cached_tags(conn: sqlite3.Connection, *, item_id: int) -> list[str] | No
         return None
 
 
+def get_cached_tags_for_items(conn: sqlite3.Connection, *, item_ids: list[int]) -> dict[int, list[str]]:
+    """
+    Get cached suggested tags for several items in one query.
+
+    Args:
+        item_ids: Database IDs of the news_items
+
+    Returns:
+        item_id -> list of tag strings; items without (valid) cached tags are omitted
+    """
+    if not item_ids:
+        return {}
+    placeholders = ",".join("?" * len(item_ids))
+    rows = conn.execute(
+        f"SELECT id, suggested_tags FROM news_items WHERE id IN ({placeholders}) AND suggested_tags IS NOT NULL",
+        list(item_ids),
+    ).fetchall()
+
+    out = {}
+    for item_id, tags_json in rows:
+        try:
+            tags = json.loads(tags_json)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if isinstance(tags, list):
+            out[item_id] = tags
+    return out
+
+
 def set_cached_tags(conn: sqlite3.Connection, *, item_id: int, tags: list[str]) -> None:
     """
     Cache suggested tags for an item.
@@ -1049,7 +1165,7 @@ def set_cached_tags(conn: sqlite3.Connection, *, item_id: int, tags: list[str])
         item_id: Database ID of the news_item
         tags: List of tag strings to cache
     """
-    tags_json = json.dumps(tags)
+    tags_json = _dumps(tags)
     conn.execute(
         "UPDATE news_items SET suggested_tags = ? WHERE id = ?",
         (tags_json, item_id)
@@ -1256,9 +1372,9 @@ def upsert_weight_snapshot(
         (
             cycle_date,
             user_id,
-            json.dumps(weights_before),
-            json.dumps(weights_after),
-            json.dumps(feedback_summary),
+            _dumps(weights_before),
+            _dumps(weights_after),
+            _dumps(feedback_summary),
             eval_before,
             eval_after,
             1 if applied else 0,
@@ -1601,6 +1717,41 @@ def get_session(conn: sqlite3.Connection, *, session_id: str) -> dict | None:
     }
 
 
+def get_session_user(conn: sqlite3.Connection, *, session_id: str) -> dict | None:
+    """
+    Look up the user behind a live session in one query.
+
+    Same expiry rule as get_session. Returns the get_user_by_id dict plus
+    "session_expires_at", or None if the session is missing, expired, or
+    its user no longer exists.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    row = conn.execute(
+        """
+        SELECT u.user_id, u.email, u.password_hash, u.role, u.created_at, u.last_login_at,
+               s.expires_at
+        FROM sessions s
+        JOIN users u ON u.user_id = s.user_id
+        WHERE s.session_id = ?
+          AND s.expires_at > ?
+        """,
+        (session_id, now),
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    return {
+        "user_id": row[0],
+        "email": row[1],
+        "password_hash": row[2],
+        "role": row[3],
+        "created_at": row[4],
+        "last_login_at": row[5],
+        "session_expires_at": row[6],
+    }
+
+
 def delete_session(conn: sqlite3.Connection, *, session_id: str) -> None:
     """
     Delete a session (logout).
@@ -1649,7 +1800,28 @@ def get_user_config(conn: sqlite3.Connection, *, user_id: str) -> dict | None:
         return None
 
 
-def upsert_user_config(conn: sqlite3.Connection, *, user_id: str, config: dict) -> None:
+def get_rank_config_inputs(conn: sqlite3.Connection, *, user_id: str | None) -> tuple[str | None, str | None]:
+    """
+    Raw JSON behind a user's effective RankConfig, in one query.
+
+    Returns:
+        (weights_after of the latest applied weight snapshot, user config_json);
+        either is None when missing. config_json is always None for user_id=None.
+    """
+    return conn.execute(
+        """
+        SELECT (SELECT weights_after
+                FROM weight_snapshots
+                WHERE applied = 1 AND user_id IS ?
+                ORDER BY cycle_date DESC, created_at DESC
+                LIMIT 1),
+               (SELECT config_json FROM user_configs WHERE user_id = ?)
+        """,
+        (user_id, user_id),
+    ).fetchone()
+
+
+def upsert_user_config(conn: sqlite3.Connection, *, user_id: str, config: dict, commit: bool = True) -> None:
     """
     Create or update a user's config.
 
@@ -1658,7 +1830,7 @@ def upsert_user_config(conn: sqlite3.Connection, *, user_id: str, config: dict)
         config: Partial RankConfig dict (overrides only)
     """
     now = datetime.now(timezone.utc).isoformat()
-    config_json = json.dumps(config)
+    config_json = _dumps(config)
 
     conn.execute(
         """
@@ -1670,7 +1842,8 @@ def upsert_user_config(conn: sqlite3.Connection, *, user_id: str, config: dict)
         """,
         (user_id, config_json, now, now),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def get_all_users(conn: sqlite3.Connection) -> list[dict]:
@@ -1731,7 +1904,7 @@ def insert_suggestion(
         suggestion_id of the new suggestion
     """
     now = datetime.now(timezone.utc).isoformat()
-    evidence_json = json.dumps(evidence_items)
+    evidence_json = _dumps(evidence_items)
     evidence_count = len(evidence_items)
 
     cur = conn.execute(
@@ -1796,6 +1969,33 @@ def get_pending_suggestions(
     ]
 
 
+def list_suggestions(
+    conn: sqlite3.Connection,
+    *,
+    user_id: str,
+    status: str = "pending",
+) -> list[dict]:
+    """
+    List a user's suggestions by status, without evidence items.
+
+    Same rows and order as get_pending_suggestions, minus the evidence_items
+    JSON (the largest column) so listing skips reading and parsing it.
+    """
+    cur = conn.execute(
+        """
+        SELECT suggestion_id, suggestion_type, field, target_key,
+               current_value, suggested_value, reason, evidence_count,
+               status, created_at
+        FROM config_suggestions
+        WHERE user_id = ? AND status = ?
+        ORDER BY created_at DESC
+        """,
+        (user_id, status),
+    )
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
 def get_suggestion_by_id(
     conn: sqlite3.Connection,
     *,
@@ -1843,6 +2043,7 @@ def update_suggestion_status(
     *,
     suggestion_id: int,
     status: str,
+    commit: bool = True,
 ) -> None:
     """
     Update a suggestion's status.
@@ -1860,7 +2061,64 @@ def update_suggestion_status(
         """,
         (status, now, suggestion_id),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+
+
+def update_suggestion_statuses(
+    conn: sqlite3.Connection,
+    *,
+    statuses: list[tuple[int, str]],
+    commit: bool = True,
+) -> None:
+    """
+    Update several suggestions' statuses with one executemany.
+
+    Args:
+        statuses: (suggestion_id, new status) pairs
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        """
+        UPDATE config_suggestions
+        SET status = ?, resolved_at = ?
+        WHERE suggestion_id = ?
+        """,
+        [(status, now, suggestion_id) for suggestion_id, status in statuses],
+    )
+    if commit:
+        conn.commit()
+
+
+def get_generate_gate(
+    conn: sqlite3.Connection,
+    *,
+    user_id: str,
+    day: str,
+) -> tuple[list[int], list[int]]:
+    """
+    Suggestion ids the generate endpoint checks, in one query.
+
+    Args:
+        user_id: User ID
+        day: Date string (YYYY-MM-DD)
+
+    Returns:
+        (pending_ids, ids created on day), each newest first
+    """
+    rows = conn.execute(
+        """
+        SELECT suggestion_id, status = 'pending', date(created_at) = ?
+        FROM config_suggestions
+        WHERE user_id = ? AND (status = 'pending' OR date(created_at) = ?)
+        ORDER BY created_at DESC
+        """,
+        (day, user_id, day),
+    ).fetchall()
+
+    pending_ids = [row[0] for row in rows if row[1]]
+    today_ids = [row[0] for row in rows if row[2]]
+    return pending_ids, today_ids
 
 
 def get_suggestions_for_today(
@@ -1913,6 +2171,43 @@ def get_suggestions_for_today(
 
 # --- Suggestion Outcomes (Milestone 4.5) ---
 
+_INSERT_OUTCOME_SQL = """
+    INSERT INTO suggestion_outcomes
+    (suggestion_id, user_id, suggestion_type, suggestion_value, outcome,
+     user_reason, config_before, config_after, evidence_summary,
+     created_at, decided_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _outcome_row(
+    now: str,
+    *,
+    suggestion_id: int,
+    user_id: str,
+    suggestion_type: str,
+    suggestion_value: str,
+    outcome: str,
+    user_reason: str | None = None,
+    config_before: dict | None = None,
+    config_after: dict | None = None,
+    evidence_summary: list[dict] | None = None,
+) -> tuple:
+    return (
+        suggestion_id,
+        user_id,
+        suggestion_type,
+        suggestion_value,
+        outcome,
+        user_reason,
+        _dumps(config_before) if config_before else None,
+        _dumps(config_after) if config_after else None,
+        _dumps(evidence_summary) if evidence_summary else None,
+        now,
+        now,
+    )
+
+
 def insert_outcome(
     conn: sqlite3.Connection,
     *,
@@ -1925,6 +2220,7 @@ def insert_outcome(
     config_before: dict | None = None,
     config_after: dict | None = None,
     evidence_summary: list[dict] | None = None,
+    commit: bool = True,
 ) -> int:
     """
     Insert a suggestion outcome (accept/reject snapshot).
@@ -1946,31 +2242,38 @@ def insert_outcome(
     now = datetime.now(timezone.utc).isoformat()
 
     cur = conn.execute(
-        """
-        INSERT INTO suggestion_outcomes
-        (suggestion_id, user_id, suggestion_type, suggestion_value, outcome,
-         user_reason, config_before, config_after, evidence_summary,
-         created_at, decided_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            suggestion_id,
-            user_id,
-            suggestion_type,
-            suggestion_value,
-            outcome,
-            user_reason,
-            json.dumps(config_before) if config_before else None,
-            json.dumps(config_after) if config_after else None,
-            json.dumps(evidence_summary) if evidence_summary else None,
-            now,
+        _INSERT_OUTCOME_SQL,
+        _outcome_row(
             now,
+            suggestion_id=suggestion_id,
+            user_id=user_id,
+            suggestion_type=suggestion_type,
+            suggestion_value=suggestion_value,
+            outcome=outcome,
+            user_reason=user_reason,
+            config_before=config_before,
+            config_after=config_after,
+            evidence_summary=evidence_summary,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return cur.lastrowid
 
 
+def insert_outcomes(conn: sqlite3.Connection, *, outcomes: list[dict], commit: bool = True) -> None:
+    """
+    Insert several suggestion outcomes with one executemany.
+
+    Args:
+        outcomes: Dicts with insert_outcome's keyword arguments
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    conn.executemany(_INSERT_OUTCOME_SQL, [_outcome_row(now, **o) for o in outcomes])
+    if commit:
+        conn.commit()
+
+
 def get_outcomes_by_user(
     conn: sqlite3.Connection,
     *,
@@ -2149,6 +2452,7 @@ def upsert_user_profile(
     trends: dict | None = None,
     total_outcomes: int = 0,
     last_outcome_at: str | None = None,
+    commit: bool = True,
 ) -> None:
     """
     Create or update a user's preference profile.
@@ -2179,15 +2483,16 @@ def upsert_user_profile(
         """,
         (
             user_id,
-            json.dumps(acceptance_stats),
-            json.dumps(patterns),
-            json.dumps(trends) if trends else None,
+            _dumps(acceptance_stats),
+            _dumps(patterns),
+            _dumps(trends) if trends else None,
             total_outcomes,
             last_outcome_at,
             now,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def increment_profile_stats(
@@ -2196,6 +2501,8 @@ def increment_profile_stats(
     user_id: str,
     suggestion_type: str,
     outcome: str,
+    count: int = 1,
+    commit: bool = True,
 ) -> None:
     """
     Increment acceptance stats for a user after accept/reject.
@@ -2204,6 +2511,7 @@ def increment_profile_stats(
         user_id: User ID
         suggestion_type: 'add_topic', 'remove_topic', 'boost_source', 'reduce_source'
         outcome: 'accepted' or 'rejected'
+        count: Number of outcomes to record (bulk accepts pass one total per type)
     """
     now = datetime.now(timezone.utc).isoformat()
 
@@ -2226,9 +2534,9 @@ def increment_profile_stats(
 
     # Increment the appropriate counter
     if outcome == "accepted":
-        acceptance_stats[suggestion_type]["accepted"] += 1
+        acceptance_stats[suggestion_type]["accepted"] += count
     elif outcome == "rejected":
-        acceptance_stats[suggestion_type]["rejected"] += 1
+        acceptance_stats[suggestion_type]["rejected"] += count
 
     # Recalculate rate
     accepted = acceptance_stats[suggestion_type]["accepted"]
@@ -2237,7 +2545,7 @@ def increment_profile_stats(
     acceptance_stats[suggestion_type]["rate"] = round(accepted / total, 2) if total > 0 else 0.0
 
     # Increment total outcomes
-    total_outcomes += 1
+    total_outcomes += count
 
     # Upsert profile
     upsert_user_profile(
@@ -2248,6 +2556,7 @@ def increment_profile_stats(
         trends=trends,
         total_outcomes=total_outcomes,
         last_outcome_at=now,
+        commit=commit,
     )
 
 
@@ -60,7 +60,25 @@ class ScoreBreakdown:
     total_score: float = 0.0
 
 
-def compute_score_breakdown(item: NewsItem, *, now: datetime, cfg: RankConfig) -> ScoreBreakdown:
+def match_terms(cfg: RankConfig) -> tuple[list[tuple[str, str]], list[tuple[str, str, float]]]:
+    """
+    Lowercased topics and keywords from cfg, blanks dropped.
+
+    Returns ([(topic, lowered)], [(keyword, lowered, boost)]). rank_items
+    builds this once per call instead of re-normalizing per item.
+    """
+    topics = [(t, t.strip().lower()) for t in cfg.topics]
+    keywords = [(kw, kw.strip().lower(), float(boost)) for kw, boost in cfg.keyword_boosts.items()]
+    return [t for t in topics if t[1]], [k for k in keywords if k[1]]
+
+
+def compute_score_breakdown(
+    item: NewsItem,
+    *,
+    now: datetime,
+    cfg: RankConfig,
+    terms: tuple[list[tuple[str, str]], list[tuple[str, str, float]]] | None = None,
+) -> ScoreBreakdown:
     """Compute all score components for an item. Used by both score_item and explain_item."""
     # Recency calculation
     age_seconds = (now - item.published_at).total_seconds()
@@ -75,18 +93,10 @@ def compute_score_breakdown(item: NewsItem, *, now: datetime, cfg: RankConfig) -
     recency_decay = 1.0 / (1.0 + (age_hours / half_life))
 
     # Topic and keyword matching
+    topics, keywords = terms if terms is not None else match_terms(cfg)
     text = build_search_text(item, cfg)
-    matched_topics: list[str] = []
-    for topic in cfg.topics:
-        t = topic.strip().lower()
-        if t and t in text:
-            matched_topics.append(topic)
-
-    matched_keywords: list[dict] = []
-    for kw, boost in cfg.keyword_boosts.items():
-        k = kw.strip().lower()
-        if k and k in text:
-            matched_keywords.append({"keyword": kw, "boost": float(boost)})
+    matched_topics = [topic for topic, t in topics if t in text]
+    matched_keywords = [{"keyword": kw, "boost": boost} for kw, k, boost in keywords if k in text]
 
     # Source weight
     source_weight = float(cfg.source_weights.get(item.source.lower(), 1.0))
@@ -106,9 +116,9 @@ def compute_score_breakdown(item: NewsItem, *, now: datetime, cfg: RankConfig) -
     )
 
 
-def score_item(item: NewsItem, *, now: datetime, cfg: RankConfig) -> float:
+def score_item(item: NewsItem, *, now: datetime, cfg: RankConfig, terms=None) -> float:
     """Return the total score for a single item."""
-    breakdown = compute_score_breakdown(item, now=now, cfg=cfg)
+    breakdown = compute_score_breakdown(item, now=now, cfg=cfg, terms=terms)
     return breakdown.total_score
 
 
@@ -121,9 +131,10 @@ def rank_items(
     ai_scores: dict[str, float] | None = None,
 ) -> list[NewsItem]:
     """Rank items by score, optionally boosted by ai_score similarity."""
+    terms = match_terms(cfg)
     scored: list[tuple[float, datetime, int, NewsItem]] = []
     for idx, it in enumerate(items):
-        base_score = score_item(it, now=now, cfg=cfg)
+        base_score = score_item(it, now=now, cfg=cfg, terms=terms)
         item_ai_score = ai_scores.get(str(it.url), 0.0) if ai_scores else 0.0
         final_score = base_score + (cfg.ai_score_alpha * item_ai_score)
         scored.append((final_score, it.published_at, idx, it))
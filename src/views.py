@@ -7,32 +7,88 @@ Separates display logic from routes so UI changes don't require editing main.py.
 from __future__ import annotations
 
 import json
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 
-from src.scoring import RankConfig, score_item
+from src.ai_score import build_tfidf_model, compute_ai_scores
+from src.scoring import RankConfig, match_terms, score_item
 from src.explain import explain_item
 from src.cache_utils import compute_cache_key
 from src.clients.llm_openai import MODEL
 from src.repo import (
-    get_cached_summary,
-    get_cached_tags,
+    get_cached_summaries,
+    get_cached_tags_for_items,
     set_cached_tags,
     get_distinct_dates,
     count_distinct_dates,
-    get_run_by_day,
-    get_run_feedback,
+    get_dates_with_run_ratings,
     get_recent_runs_summary,
     count_items_for_dates,
     count_runs_for_dates,
     get_items_count_by_date,
-    get_user_config,
-    get_active_source_weights,
+    get_rank_config_inputs,
+    get_positive_feedback_items,
+    get_all_historical_items,
 )
 from src.llm_schemas.summary import SummaryResult
 from src.schemas import NewsItem
 from src.clients.llm_openai import suggest_feedback_tags
 
 
+# Fitted TF-IDF models keyed by (NEWS_DB_PATH, row count, max id) of
+# news_items. Items are only ever inserted, so an unchanged key means an
+# unchanged corpus and the previous fit can be reused across requests.
+_TFIDF_MODELS: OrderedDict[tuple, dict | None] = OrderedDict()
+_TFIDF_MODELS_MAX = 4
+_TFIDF_LOCK = threading.Lock()
+
+
+def compute_item_ai_scores(
+    conn,
+    items: list[NewsItem],
+    *,
+    as_of_date: str,
+    user_id: str | None = None,
+) -> dict[str, float]:
+    """
+    Return url -> ai_score for items (Milestone 3c).
+
+    TF-IDF is fit on all historical items (richer vocabulary); similarity is
+    measured against the user's positives only. With no positives every
+    score is 0.0, so no model is fit at all.
+    """
+    item_dicts = [{"url": str(it.url), "title": it.title, "evidence": it.evidence} for it in items]
+    positives = get_positive_feedback_items(conn, as_of_date=as_of_date, user_id=user_id)
+    if not positives:
+        return {d["url"]: 0.0 for d in item_dicts}
+
+    model = _tfidf_model(conn, as_of_date=as_of_date)
+    scores = compute_ai_scores(model, positives, item_dicts)
+    return dict(zip((d["url"] for d in item_dicts), scores))
+
+
+def _tfidf_model(conn, *, as_of_date: str) -> dict | None:
+    """Fitted TF-IDF model for the current corpus, refit only when rows were added."""
+    count, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM news_items;").fetchone()
+    key = (os.environ.get("NEWS_DB_PATH"), count, max_id)
+    with _TFIDF_LOCK:
+        if key in _TFIDF_MODELS:
+            _TFIDF_MODELS.move_to_end(key)
+            return _TFIDF_MODELS[key]
+
+    corpus = get_all_historical_items(conn, as_of_date=as_of_date)
+    model = build_tfidf_model(corpus) if corpus else None
+
+    with _TFIDF_LOCK:
+        _TFIDF_MODELS[key] = model
+        while len(_TFIDF_MODELS) > _TFIDF_MODELS_MAX:
+            _TFIDF_MODELS.popitem(last=False)
+    return model
+
+
 def build_ranked_display_items(
     conn,
     items_with_ids: list[tuple[int, NewsItem]],
@@ -56,9 +112,10 @@ def build_ranked_display_items(
         List of display dicts with keys: id, item, score, expl, summary
     """
     # Score each item (base_score + ai_score boost)
+    terms = match_terms(cfg)
     scored_pairs = []
     for idx, (db_id, item) in enumerate(items_with_ids):
-        base_score = score_item(item, now=now, cfg=cfg)
+        base_score = score_item(item, now=now, cfg=cfg, terms=terms)
         item_ai_score = ai_scores.get(str(item.url), 0.0) if ai_scores else 0.0
         final_score = base_score + (cfg.ai_score_alpha * item_ai_score)
         scored_pairs.append((final_score, item.published_at, idx, db_id, item))
@@ -66,14 +123,23 @@ def build_ranked_display_items(
     # Sort by score desc, published_at desc, index asc
     scored_pairs.sort(key=lambda t: (-t[0], -t[1].timestamp(), t[2]))
 
+    top = scored_pairs[:top_n]
+
+    # Cached tags and summaries for the whole page in two queries
+    cached_tags = get_cached_tags_for_items(conn, item_ids=[db_id for _, _, _, db_id, _ in top])
+    summary_keys = [compute_cache_key(MODEL, item.evidence) if item.evidence else None for _, _, _, _, item in top]
+    cached_summaries = get_cached_summaries(conn, cache_keys=[k for k in summary_keys if k])
+
     # Build display objects for top N
     display_items = []
-    for score, _, _, db_id, item in scored_pairs[:top_n]:
-        expl = explain_item(item, now=now, cfg=cfg)
-        summary = _fetch_cached_summary(conn, item)
+    for (score, _, _, db_id, item), summary_key in zip(top, summary_keys):
+        expl = explain_item(item, now=now, cfg=cfg, terms=terms)
+        summary = _parse_cached_summary(cached_summaries.get(summary_key))
 
-        # Fetch or generate feedback tags (on-demand + cached)
-        feedback_tags = _fetch_or_generate_tags(conn, db_id, item)
+        # Cached feedback tags, or generate on demand (and cache)
+        feedback_tags = cached_tags.get(db_id)
+        if feedback_tags is None:
+            feedback_tags = _generate_tags(conn, db_id, item)
 
         display_items.append({
             "id": db_id,
@@ -87,17 +153,12 @@ def build_ranked_display_items(
     return display_items
 
 
-def _fetch_or_generate_tags(conn, item_id: int, item: NewsItem) -> list[str]:
-    """Fetch cached feedback tags or generate new ones via LLM.
+def _generate_tags(conn, item_id: int, item: NewsItem) -> list[str]:
+    """Generate feedback tags via LLM and cache them in news_items.suggested_tags.
 
-    Uses hybrid approach: on-demand generation + cache in news_items.suggested_tags.
+    Only called for items without cached tags.
     Falls back to ["Other"] if LLM fails.
     """
-    # Check cache first
-    cached = get_cached_tags(conn, item_id=item_id)
-    if cached is not None:
-        return cached
-
     # Generate via LLM (exempt from daily cap per design)
     tags = suggest_feedback_tags(item)
 
@@ -107,20 +168,13 @@ def _fetch_or_generate_tags(conn, item_id: int, item: NewsItem) -> list[str]:
     return tags
 
 
-def _fetch_cached_summary(conn, item: NewsItem) -> SummaryResult | None:
-    """Fetch cached LLM summary for an item, if available."""
-    evidence = item.evidence or ""
-    if not evidence:
-        return None
-
-    cache_key = compute_cache_key(MODEL, evidence)
-    cached = get_cached_summary(conn, cache_key=cache_key)
-
-    if not cached:
+def _parse_cached_summary(summary_json: str | None) -> SummaryResult | None:
+    """Parse a cached LLM summary, if there is a usable one."""
+    if not summary_json:
         return None
 
     try:
-        return SummaryResult(**json.loads(cached["summary_json"]))
+        return SummaryResult.model_validate_json(summary_json)
     except Exception:
         return None
 
@@ -152,18 +206,9 @@ def build_homepage_data(
     # Get total and paginated dates (news_items are global/shared)
     total = count_distinct_dates(conn)
     offset = (page - 1) * per_page
-    dates = get_distinct_dates(conn, limit=per_page, offset=offset)
-
-    # Enrich each date with run_id and rating (user-scoped)
-    dates_with_stats = []
-    for day in dates:
-        run = get_run_by_day(conn, day=day, user_id=user_id)
-        run_id = run["run_id"] if run else None
-        rating = 0
-        if run_id:
-            feedback = get_run_feedback(conn, run_id=run_id, user_id=user_id)
-            rating = feedback["rating"] if feedback else 0
-        dates_with_stats.append({"day": day, "run_id": run_id, "rating": rating})
+
+    # Enrich each date with run_id and rating (user-scoped), in one query
+    dates_with_stats = get_dates_with_run_ratings(conn, limit=per_page, offset=offset, user_id=user_id)
 
     # Get recent runs (user-scoped)
     runs = get_recent_runs_summary(conn, limit=10, user_id=user_id)
@@ -230,6 +275,9 @@ def get_effective_rank_config(conn, *, user_id: str | None = None) -> RankConfig
 
     Enforces bounds: ai_score_alpha clamped to [0.0, 0.2]
 
+    The merged config is cached by the raw stored JSON, so repeat requests
+    cost one query; the returned RankConfig is shared and must not be mutated.
+
     Args:
         conn: Database connection
         user_id: User ID (None for global/legacy config)
@@ -237,26 +285,41 @@ def get_effective_rank_config(conn, *, user_id: str | None = None) -> RankConfig
     Returns:
         RankConfig with all overrides applied
     """
+    weights_json, config_json = get_rank_config_inputs(conn, user_id=user_id)
+    return _merge_rank_config(weights_json, config_json if user_id else None)
+
+
+@lru_cache(maxsize=4096)
+def _merge_rank_config(weights_json: str | None, config_json: str | None) -> RankConfig:
     # Start with defaults
     cfg_dict = RankConfig().model_dump()
 
     # Overlay active source weights (learned from feedback, Milestone 3b)
     # These are applied first so user_config can override them
-    active_weights = get_active_source_weights(conn, user_id=user_id)
+    active_weights = dict(cfg_dict["source_weights"])
+    if weights_json is not None:
+        try:
+            active_weights.update(json.loads(weights_json))
+        except (json.JSONDecodeError, TypeError):
+            pass
     cfg_dict["source_weights"] = active_weights
 
     # Overlay user config if provided (explicit overrides take precedence)
-    if user_id:
-        user_config = get_user_config(conn, user_id=user_id)
-        if user_config:
-            # Merge user overrides (only specified fields)
-            for key, value in user_config.items():
-                if key in cfg_dict and value is not None:
-                    if key == "source_weights" and isinstance(value, dict):
-                        # Merge source weights: user overrides specific sources
-                        cfg_dict["source_weights"] = {**cfg_dict["source_weights"], **value}
-                    else:
-                        cfg_dict[key] = value
+    user_config = None
+    if config_json is not None:
+        try:
+            user_config = json.loads(config_json)
+        except (json.JSONDecodeError, TypeError):
+            user_config = None
+    if user_config:
+        # Merge user overrides (only specified fields)
+        for key, value in user_config.items():
+            if key in cfg_dict and value is not None:
+                if key == "source_weights" and isinstance(value, dict):
+                    # Merge source weights: user overrides specific sources
+                    cfg_dict["source_weights"] = {**cfg_dict["source_weights"], **value}
+                else:
+                    cfg_dict[key] = value
 
     # Enforce bounds on ai_score_alpha
     cfg_dict["ai_score_alpha"] = max(0.0, min(0.2, cfg_dict.get("ai_score_alpha", 0.1)))
@@ -223,3 +223,50 @@ class TestRankItemsWithAiScores:
 
         # Order should be identical when alpha=0
         assert [str(it.url) for it in ranked_without] == [str(it.url) for it in ranked_with]
+
+
+class TestComputeItemAiScores:
+    """DB-backed ai_score helper shared by the endpoints and jobs."""
+
+    def _item(self, n: int, title: str) -> NewsItem:
+        return NewsItem(
+            source="test",
+            url=f"https://example.com/{n}",
+            published_at=datetime(2026, 1, 20, 12, 0, 0, tzinfo=timezone.utc),
+            title=title,
+            evidence=f"{title} evidence",
+        )
+
+    def test_model_reused_until_corpus_grows(self, tmp_path, monkeypatch):
+        import src.views as views
+        from src.db import get_conn, init_db
+        from src.repo import insert_news_items, start_run, upsert_item_feedback
+
+        monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "ai.db"))
+        fits = []
+        monkeypatch.setattr(views, "build_tfidf_model", lambda corpus: (fits.append(1), build_tfidf_model(corpus))[1])
+
+        conn = get_conn()
+        try:
+            init_db(conn)
+            items = [self._item(1, "Rust compiler release"), self._item(2, "Cooking pasta at home")]
+            insert_news_items(conn, items)
+
+            # Cold start: no positives, so no model is fit
+            scores = views.compute_item_ai_scores(conn, items, as_of_date="2026-01-20")
+            assert scores == {"https://example.com/1": 0.0, "https://example.com/2": 0.0}
+            assert fits == []
+
+            start_run(conn, "run_1", "2026-01-20T12:00:00+00:00", received=2)
+            upsert_item_feedback(conn, run_id="run_1", item_url="https://example.com/1", useful=1,
+                                 created_at="2026-01-20T12:00:00+00:00", updated_at="2026-01-20T12:00:00+00:00")
+
+            views.compute_item_ai_scores(conn, items, as_of_date="2026-01-20")
+            views.compute_item_ai_scores(conn, items, as_of_date="2026-01-20")
+            assert len(fits) == 1
+
+            insert_news_items(conn, [self._item(3, "Rust compiler internals")])
+            views.compute_item_ai_scores(conn, items, as_of_date="2026-01-20")
+            assert len(fits) == 2
+        finally:
+            conn.close()
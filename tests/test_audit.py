@@ -45,8 +45,17 @@ def test_audit_log_redacts_pii(tmp_path, monkeypatch):
     assert "[REDACTED_EMAIL]" in logs[0]["details"]["error_message"]
 
 
+def test_audit_log_details_stored_compact(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+    conn = get_conn()
+    init_db(conn)
 
+    write_audit_log(conn, event_type="COMPACT", ts="2026-01-15T10:00:00+00:00",
+                    details={"a": 1, "b": [1, 2]})
 
+    stored = conn.execute("SELECT details_json FROM audit_logs").fetchone()[0]
+    assert stored == '{"a":1,"b":[1,2]}'
+    assert get_audit_logs(conn)[0]["details"] == {"a": 1, "b": [1, 2]}
 
-
-
+    conn.close()
@@ -184,6 +184,21 @@ class TestSessionManagement:
         session = get_session(conn, session_id=session_id)
         assert session is None, "Expired session should return None"
 
+    def test_get_session_user_joins_user(self, conn):
+        """get_session_user returns the session's user, and enforces expiry."""
+        from src.repo import get_session_user
+
+        password_hash = hash_password("testpass")
+        user_id = create_user(conn, email="joined@test.com", password_hash=password_hash)
+        live = create_session(conn, user_id=user_id, expires_hours=24)
+        expired = create_session(conn, user_id=user_id, expires_hours=0)
+
+        user = get_session_user(conn, session_id=live)
+        assert user.pop("session_expires_at")
+        assert user == get_user_by_id(conn, user_id=user_id)
+        assert get_session_user(conn, session_id=expired) is None
+        assert get_session_user(conn, session_id="nonexistent-session-id") is None
+
     def test_delete_session(self, conn):
         """delete_session removes session."""
         password_hash = hash_password("testpass")
@@ -260,6 +275,32 @@ class TestAuthEndpoints:
         assert data["email"] == "login@test.com"
         assert "session_id" in resp.cookies
 
+    def test_login_checks_password_on_bcrypt_pool(self, client, monkeypatch):
+        """Password verification runs on the dedicated bcrypt threads."""
+        import threading
+        import src.main as main_mod
+
+        conn = get_conn()
+        try:
+            init_db(conn)
+            create_user(conn, email="pool@test.com", password_hash=hash_password("testpass"))
+        finally:
+            conn.close()
+
+        threads = []
+        real_verify = main_mod.verify_password
+
+        def recording_verify(password, password_hash):
+            threads.append(threading.current_thread().name)
+            return real_verify(password, password_hash)
+
+        monkeypatch.setattr(main_mod, "verify_password", recording_verify)
+
+        resp = client.post("/auth/login", params={"email": "pool@test.com", "password": "testpass"})
+
+        assert resp.status_code == 200
+        assert len(threads) == 1 and threads[0].startswith("bcrypt")
+
     def test_login_wrong_password(self, client):
         """POST /auth/login fails with wrong password."""
         conn = get_conn()
@@ -322,6 +363,36 @@ class TestAuthEndpoints:
         resp = client.get("/auth/me")
         assert resp.status_code == 401
 
+    def test_session_user_cached_until_logout(self, client, monkeypatch):
+        """Repeated requests reuse the resolved user; logout drops it."""
+        import src.main as main_mod
+
+        conn = get_conn()
+        try:
+            init_db(conn)
+            password_hash = hash_password("testpass")
+            create_user(conn, email="cached@test.com", password_hash=password_hash)
+        finally:
+            conn.close()
+
+        client.post("/auth/login", params={"email": "cached@test.com", "password": "testpass"})
+
+        calls = []
+        real_lookup = main_mod.get_session_user
+
+        def counting_lookup(conn, *, session_id):
+            calls.append(session_id)
+            return real_lookup(conn, session_id=session_id)
+
+        monkeypatch.setattr(main_mod, "get_session_user", counting_lookup)
+
+        assert client.get("/auth/me").json()["email"] == "cached@test.com"
+        assert client.get("/auth/me").json()["email"] == "cached@test.com"
+        assert len(calls) == 1
+
+        client.post("/auth/logout")
+        assert client.get("/auth/me").status_code == 401
+
 
 class TestAdminAccess:
     """Tests for admin-only access control."""
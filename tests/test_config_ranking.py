@@ -69,6 +69,15 @@ class TestGetEffectiveRankConfig:
         assert cfg.source_weights.get("techcrunch") == 2.0
         assert cfg.source_weights.get("theverge") == 0.5
 
+    def test_reuses_merged_config_until_user_config_changes(self, db_conn, test_user):
+        """Unchanged stored config returns the cached merge; an update is seen at once."""
+        upsert_user_config(db_conn, user_id=test_user, config={"ai_score_alpha": 0.05})
+        first = get_effective_rank_config(db_conn, user_id=test_user)
+        assert get_effective_rank_config(db_conn, user_id=test_user) is first
+
+        upsert_user_config(db_conn, user_id=test_user, config={"ai_score_alpha": 0.15})
+        assert get_effective_rank_config(db_conn, user_id=test_user).ai_score_alpha == 0.15
+
 
 class TestUserConfigAffectsRanking:
     """Tests that user_configs overrides actually affect ranking scores."""
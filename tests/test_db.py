@@ -36,3 +36,317 @@ def test_init_db_creates_runs_table(tmp_path, monkeypatch):
         assert row[0] == "runs"
     finally:
         conn.close()
+
+
+def test_get_conn_applies_wal_and_pragmas(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+
+    conn = get_conn()
+    try:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store;").fetchone()[0] == 2  # MEMORY
+    finally:
+        conn.close()
+
+
+def test_get_conn_skips_wal_on_network_fs(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+    monkeypatch.setattr("src.db._on_network_fs", lambda directory: True)
+
+    conn = get_conn()
+    try:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "delete"
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_get_conn_sets_busy_timeout(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+
+    conn = get_conn()
+    try:
+        assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 5000
+    finally:
+        conn.close()
+
+    monkeypatch.setenv("NEWS_DB_BUSY_TIMEOUT_MS", "250")
+    conn = get_conn()
+    try:
+        assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 250
+    finally:
+        conn.close()
+
+
+def test_init_db_runs_once_per_file(tmp_path, monkeypatch):
+    import src.db as db
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+    calls = []
+    real_create = db._create_schema
+    monkeypatch.setattr(db, "_create_schema", lambda conn: (calls.append(1), real_create(conn)))
+
+    for _ in range(3):
+        conn = get_conn()
+        try:
+            init_db(conn)
+        finally:
+            conn.close()
+
+    assert len(calls) == 1
+
+    # A different file gets its own initialization
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "other.db"))
+    conn = get_conn()
+    try:
+        init_db(conn)
+        assert conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='runs';"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+    assert len(calls) == 2
+
+
+def test_init_db_migrates_legacy_db_by_user_version(tmp_path, monkeypatch):
+    import sqlite3
+    from src.db import SCHEMA_VERSION
+
+    db_file = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(str(db_file))
+    legacy.execute("""
+        CREATE TABLE runs (
+            run_id TEXT PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            status TEXT NOT NULL,
+            received INTEGER NOT NULL DEFAULT 0,
+            after_dedupe INTEGER NOT NULL DEFAULT 0,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            duplicates INTEGER NOT NULL DEFAULT 0,
+            error_type TEXT,
+            error_message TEXT
+        )
+    """)
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(runs);")}
+        assert {"run_type", "llm_cache_hits", "llm_total_latency_ms", "user_id"} <= cols
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
+def test_db_conn_reuses_connection_per_thread(tmp_path, monkeypatch):
+    from src.db import db_conn
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "pooled.db"))
+
+    with db_conn() as first:
+        pass
+    with db_conn() as second:
+        assert second is first
+        # Still open after the previous block exited
+        assert second.execute("SELECT 1;").fetchone() == (1,)
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "other.db"))
+    with db_conn() as third:
+        assert third is not first
+
+
+def test_db_conn_rolls_back_uncommitted_work_on_exit(tmp_path, monkeypatch):
+    from src.db import db_conn
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "pooled.db"))
+
+    with db_conn() as conn:
+        conn.execute(
+            "INSERT INTO audit_logs (ts, event_type) VALUES ('2026-01-01', 'uncommitted')"
+        )
+
+    with db_conn() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM audit_logs;").fetchone()[0] == 0
+
+
+def test_db_conn_fresh_closes_on_exit(tmp_path, monkeypatch):
+    import sqlite3
+    import pytest
+    from src.db import db_conn
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "fresh.db"))
+
+    with db_conn(fresh=True) as conn:
+        conn.execute("SELECT 1;")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1;")
+
+
+def test_get_conn_sizes_statement_cache(tmp_path, monkeypatch):
+    import sqlite3
+    from src.db import STATEMENT_CACHE_SIZE
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+    seen = {}
+    real_connect = sqlite3.connect
+
+    def spy_connect(*args, **kwargs):
+        seen.update(kwargs)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", spy_connect)
+    get_conn().close()
+
+    assert seen["cached_statements"] == STATEMENT_CACHE_SIZE
+
+
+def test_failed_migration_leaves_version_unchanged(tmp_path, monkeypatch):
+    import sqlite3
+    import pytest
+    import src.db as db
+
+    db_file = tmp_path / "broken.db"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+    monkeypatch.setattr(db, "MIGRATIONS", db.MIGRATIONS + (
+        (db.SCHEMA_VERSION + 1, ("ALTER TABLE no_such_table ADD COLUMN x TEXT;",)),
+    ))
+    monkeypatch.setattr(db, "SCHEMA_VERSION", db.SCHEMA_VERSION + 1)
+
+    conn = get_conn()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            init_db(conn)
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == 0
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(runs);")}
+        assert "user_id" not in cols  # earlier migrations rolled back too
+    finally:
+        conn.close()
+
+
+def test_fresh_db_conn_runs_optimize_before_close(tmp_path, monkeypatch):
+    import src.db as db
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "fresh.db"))
+    pragmas = []
+    real_optimize = db._optimize
+    monkeypatch.setattr(db, "_optimize", lambda conn, pragma="PRAGMA optimize;": (
+        pragmas.append(pragma), real_optimize(conn, pragma)))
+
+    with db.db_conn(fresh=True):
+        pass
+
+    assert pragmas == ["PRAGMA optimize;"]
+
+
+def test_day_lookups_use_expression_indexes(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM news_items WHERE substr(published_at, 1, 10) = ?",
+            ("2026-01-01",),
+        ))
+        assert "idx_news_published_day" in plan
+
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT run_id FROM runs WHERE substr(started_at, 1, 10) = ?",
+            ("2026-01-01",),
+        ))
+        assert "idx_runs_started_day" in plan
+    finally:
+        conn.close()
+
+
+def test_db_path_resolved_once_per_env_value(tmp_path, monkeypatch):
+    import shutil
+    from src.db import _resolve_db_path, _reset_db_path_cache
+
+    db_dir = tmp_path / "nested"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_dir / "test.db"))
+
+    get_conn().close()
+    assert db_dir.exists()
+    hits = _resolve_db_path.cache_info().hits
+    get_conn().close()
+    assert _resolve_db_path.cache_info().hits == hits + 1
+
+    # After the directory disappears, a reset re-validates and recreates it
+    shutil.rmtree(db_dir)
+    _reset_db_path_cache()
+    get_conn().close()
+    assert db_dir.exists()
+
+
+def test_pooled_connection_can_be_closed_from_another_thread(tmp_path, monkeypatch):
+    import sqlite3
+    import threading
+    import pytest
+    from src.db import db_conn, _release
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "pooled.db"))
+    holder = {}
+
+    def worker():
+        with db_conn() as conn:
+            holder["conn"] = conn
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    _release(holder["conn"])
+    with pytest.raises(sqlite3.ProgrammingError):
+        holder["conn"].execute("SELECT 1;")
+
+
+def test_shared_cache_is_opt_in(tmp_path, monkeypatch):
+    import sqlite3
+
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "shared.db"))
+    calls = []
+    real_connect = sqlite3.connect
+
+    def spy_connect(target, **kwargs):
+        calls.append((target, kwargs.get("uri", False)))
+        return real_connect(target, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", spy_connect)
+
+    get_conn().close()
+    assert calls[-1][1] is False
+
+    monkeypatch.setenv("NEWS_DB_SHARED_CACHE", "1")
+    conn = get_conn()
+    try:
+        init_db(conn)
+        assert conn.execute("SELECT COUNT(*) FROM runs;").fetchone() == (0,)
+    finally:
+        conn.close()
+    target, uri = calls[-1]
+    assert uri is True
+    assert target.startswith("file:") and "cache=shared" in target
+
+
+def test_write_transactions_begin_immediate(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        assert conn.isolation_level == "IMMEDIATE"
+        conn.execute("INSERT INTO audit_logs (ts, event_type) VALUES ('2026-01-01', 'x')")
+        assert conn.in_transaction
+        conn.rollback()
+        assert conn.execute("SELECT COUNT(*) FROM audit_logs;").fetchone()[0] == 0
+    finally:
+        conn.close()
@@ -30,3 +30,10 @@ def test_eval_cases_pass_with_fixed_now():
         )
     assert out["passed"] == 52  # 50 original + 2 source weight cases (Milestone 3b)
 
+
+
+def test_parallel_run_all_matches_serial():
+    now = datetime(2026, 1, 14, 23, 59, 59, tzinfo=timezone.utc)
+    serial = run_all(now=now)
+    parallel = run_all(now=now, max_workers=4)
+    assert parallel == serial
@@ -402,3 +402,77 @@ def test_idempotency_skips_processing_on_second_request(monkeypatch):
     )
     assert response2.status_code == 200
     assert call_count["value"] == 1  # Still 1! Should NOT have called again 
+
+
+def test_idempotency_repeat_answered_from_memory(monkeypatch):
+    """A repeated key is replayed without looking it up in SQLite again."""
+    lookups = []
+    original_lookup = get_idempotency_response
+
+    def counting_lookup(conn, *, key):
+        lookups.append(key)
+        return original_lookup(conn, key=key)
+
+    monkeypatch.setattr("src.main.get_idempotency_response", counting_lookup)
+
+    client = TestClient(app)
+    body = {"run_id": "run-memory-test", "item_url": "https://example.com/a", "useful": True}
+    headers = {"X-Idempotency-Key": "memory-key-123"}
+
+    response1 = client.post("/feedback/item", json=body, headers=headers)
+    response2 = client.post("/feedback/item", json=body, headers=headers)
+
+    assert response1.status_code == response2.status_code == 200
+    assert response2.json()["feedback_id"] == response1.json()["feedback_id"]
+    assert lookups == ["memory-key-123"]  # only the first request reached the DB
+
+
+def test_idempotency_cache_evicts_least_recently_used(monkeypatch):
+    """The in-memory idempotency cache is bounded and drops the coldest key first."""
+    from src import main
+
+    monkeypatch.setattr(main, "IDEMPOTENCY_CACHE_MAX", 2)
+    main._idempotency_cache_put("key-a", '{"a":1}')
+    main._idempotency_cache_put("key-b", '{"b":1}')
+    assert main._idempotency_cache_get("key-a") == '{"a":1}'  # key-a now most recent
+
+    main._idempotency_cache_put("key-c", '{"c":1}')
+
+    assert main._idempotency_cache_get("key-b") is None
+    assert main._idempotency_cache_get("key-a") == '{"a":1}'
+    assert main._idempotency_cache_get("key-c") == '{"c":1}'
+
+
+def test_feedback_and_idempotency_key_commit_together(monkeypatch):
+    """If storing the key fails, the feedback write is rolled back with it."""
+    def failing_store(conn, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("src.main.store_idempotency_response", failing_store)
+
+    client = TestClient(app, raise_server_exceptions=False)
+    response = client.post(
+        "/feedback/run",
+        json={"run_id": "run-atomic-test", "rating": 4},
+        headers={"X-Idempotency-Key": "atomic-key-1"},
+    )
+    assert response.status_code == 500
+
+    conn = get_conn()
+    assert get_run_feedback(conn, run_id="run-atomic-test") is None
+    assert get_idempotency_response(conn, key="atomic-key-1") is None
+    conn.close()
+
+
+def test_feedback_saved_event_is_logged_deferred(monkeypatch):
+    """The success log line is queued for the background writer, not written inline."""
+    queued = []
+    monkeypatch.setattr("src.main.log_event_deferred", lambda event, **fields: queued.append(event))
+    monkeypatch.setattr("src.main.log_event", lambda event, **fields: queued.append(f"sync:{event}"))
+
+    client = TestClient(app)
+    response = client.post("/feedback/run", json={"run_id": "run-log-test", "rating": 3})
+
+    assert response.status_code == 200
+    assert "run_feedback_saved" in queued
+    assert "sync:run_feedback_saved" not in queued
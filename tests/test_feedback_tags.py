@@ -179,6 +179,17 @@ class TestSuggestFeedbackTags:
 
         assert tags == ["Other"]
 
+    def test_returns_other_for_empty_title_without_api_call(self, sample_item):
+        """Should skip the API when there is no title to tag."""
+        item = sample_item.model_copy(update={"title": "  "})
+
+        with patch("src.clients.llm_openai.OPENAI_API_KEY", "test-key"):
+            with patch("src.clients.llm_openai.urllib.request.urlopen") as mock_urlopen:
+                tags = suggest_feedback_tags(item)
+
+        assert tags == ["Other"]
+        mock_urlopen.assert_not_called()
+
 
 class TestCachedTags:
     """Tests for tag caching in news_items."""
@@ -224,6 +235,33 @@ class TestCachedTags:
         raw = db_conn.execute("SELECT suggested_tags FROM news_items WHERE id = ?", (item_id,)).fetchone()[0]
         assert json.loads(raw) == tags
 
+    def test_ranked_display_items_batch_cache_lookups(self, db_conn):
+        """Tags and summaries for a page are fetched with one query each, not per item."""
+        from src.scoring import RankConfig
+        from src.views import build_ranked_display_items
+
+        now = datetime.now(timezone.utc)
+        items = [
+            NewsItem(source="S", url=f"https://example.com/{i}", published_at=now,
+                     title=f"Article {i}", evidence=f"Evidence {i}")
+            for i in range(5)
+        ]
+        insert_news_items(db_conn, items)
+        ids = [row[0] for row in db_conn.execute("SELECT id FROM news_items ORDER BY id")]
+        for item_id in ids:
+            set_cached_tags(db_conn, item_id=item_id, tags=[f"Tag {item_id}"])
+
+        statements = []
+        db_conn.set_trace_callback(statements.append)
+        try:
+            display = build_ranked_display_items(db_conn, list(zip(ids, items)), now, RankConfig(), top_n=5)
+        finally:
+            db_conn.set_trace_callback(None)
+
+        assert {d["id"]: d["feedback_tags"] for d in display} == {i: [f"Tag {i}"] for i in ids}
+        assert sum("FROM news_items" in s for s in statements) == 1
+        assert sum("FROM summary_cache" in s for s in statements) == 1
+
 
 class TestReasonTagStorage:
     """Tests for reason_tag in item_feedback."""
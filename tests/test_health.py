@@ -15,3 +15,15 @@ def test_health():
     assert resp.json() == {"status": "ok"}
 
 
+
+
+def test_startup_resizes_worker_threadpool(monkeypatch):
+    import anyio.to_thread
+
+    monkeypatch.setenv("NEWS_API_THREADS", "7")
+
+    async def pool_size():
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    with TestClient(app) as client:
+        assert client.portal.call(pool_size) == 7
@@ -1,4 +1,4 @@
-from src.json_utils  import safe_parse_json
+from src.json_utils  import safe_parse_json, strip_code_fences
 
 
 def test_valid_json():
@@ -40,4 +40,9 @@ def test_json_with_trailing_text_returns_none():
 
 def test_trailing_comma_returns_none():
     # Invalid JSON - we don't fix it
-    assert safe_parse_json('{"a": 1,}') is None
\ No newline at end of file
+    assert safe_parse_json('{"a": 1,}') is None
+
+def test_strip_code_fences_returns_inner_text():
+    assert strip_code_fences('```json\n{"a": 1}\n```') == '{"a": 1}'
+    assert strip_code_fences('  {"a": 1}  ') == '{"a": 1}'
+    assert strip_code_fences('   ') is None
@@ -6,10 +6,11 @@ from src.clients.llm_openai import (
     _try_parse,
     _merge_usage,
     _elapsed_ms,
+    _estimate_prompt_tokens,
 )
 from src.schemas import NewsItem
 from src.llm_schemas.summary import SummaryResult
-from src.error_codes import LLM_DISABLED, LLM_API_FAIL, LLM_PARSE_FAIL
+from src.error_codes import LLM_DISABLED, LLM_API_FAIL, LLM_PARSE_FAIL, COST_BUDGET_EXCEEDED, NO_EVIDENCE
 from datetime import datetime, timezone
 
 
@@ -225,11 +226,359 @@ def test_merge_usage_combines_token_counts():
 def test_elapsed_ms_returns_positive_int():
     """Elapsed time is a positive integer."""
     import time
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
     time.sleep(0.01)  # 10ms
 
     result = _elapsed_ms(t0)
 
     assert isinstance(result, int)
     assert result >= 10  # At least 10ms
-    assert result < 1000  # Less than 1 second
\ No newline at end of file
+    assert result < 1000  # Less than 1 second
+
+def test_summarize_requests_json_mode():
+    """Summary calls ask the API for a JSON object response."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="Test evidence"
+    )
+
+    valid_output = {
+        "summary": "A summary.",
+        "tags": [],
+        "citations": [{"source_url": "https://example.com", "evidence_snippet": "Test evidence"}],
+        "confidence": 0.9
+    }
+    captured = []
+
+    def fake_urlopen(req, **kwargs):
+        captured.append(json.loads(req.data))
+        mock = Mock()
+        mock.read.return_value = json.dumps({
+            "choices": [{"message": {"content": json.dumps(valid_output)}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5}
+        }).encode("utf-8")
+        mock.__enter__ = Mock(return_value=mock)
+        mock.__exit__ = Mock(return_value=False)
+        return mock
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            result, _ = summarize(item, "Test evidence")
+
+    assert result.summary == "A summary."
+    assert len(captured) == 1
+    assert captured[0]["response_format"] == {"type": "json_object"}
+
+
+def test_estimate_prompt_tokens_grows_with_evidence():
+    """Local token estimate scales with evidence length."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="x"
+    )
+
+    short = _estimate_prompt_tokens(item, "word " * 10)
+    long = _estimate_prompt_tokens(item, "word " * 1000)
+
+    assert short > 0
+    assert long - short >= 1000
+
+
+def test_summarize_refuses_when_projected_cost_exceeds_cap():
+    """Spend just under the cap still refuses if this call would cross it, without calling the API."""
+    from src.db import get_conn, init_db
+    from src.repo import start_run, update_run_llm_stats
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        start_run(conn, "run1", "2026-01-28T10:00:00+00:00", received=1)
+        update_run_llm_stats(conn, "run1", cache_hits=0, cache_misses=1,
+                             total_cost_usd=0.9999, saved_cost_usd=0.0, total_latency_ms=0)
+    finally:
+        conn.close()
+
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="Test evidence"
+    )
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("src.clients.llm_openai.LLM_DAILY_CAP_USD", 1.0):
+            with patch("urllib.request.urlopen") as mock_urlopen:
+                result, usage = summarize(item, "Test evidence", day="2026-01-28")
+
+    assert result.refusal == COST_BUDGET_EXCEEDED
+    assert usage["cost_usd"] == 0.0
+    mock_urlopen.assert_not_called()
+
+
+def test_summarize_puts_evidence_before_item_metadata():
+    """Evidence leads the user message so repeated passages share a cacheable prefix."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="Test evidence"
+    )
+
+    captured = []
+
+    def fake_urlopen(req, **kwargs):
+        captured.append(json.loads(req.data))
+        mock = Mock()
+        mock.read.return_value = json.dumps({
+            "choices": [{"message": {"content": json.dumps({
+                "summary": "A summary.",
+                "tags": [],
+                "citations": [{"source_url": "https://example.com", "evidence_snippet": "Test evidence"}],
+                "confidence": 0.9
+            })}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5}
+        }).encode("utf-8")
+        mock.__enter__ = Mock(return_value=mock)
+        mock.__exit__ = Mock(return_value=False)
+        return mock
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            summarize(item, "Shared passage")
+
+    user_content = captured[0]["messages"][1]["content"]
+    assert user_content.startswith("Evidence:\nShared passage")
+    assert user_content.index("Shared passage") < user_content.index("Title: Test Title")
+
+
+def test_read_completion_reports_cached_tokens():
+    """cached_tokens is taken from usage.prompt_tokens_details, defaulting to 0."""
+    from src.clients.llm_openai import _read_completion
+
+    def make_resp(usage):
+        resp = Mock()
+        resp.read.return_value = json.dumps({
+            "choices": [{"message": {"content": "{}"}}],
+            "usage": usage
+        }).encode("utf-8")
+        return resp
+
+    _, usage = _read_completion(make_resp({
+        "prompt_tokens": 1200, "completion_tokens": 50,
+        "prompt_tokens_details": {"cached_tokens": 1024}
+    }))
+    assert usage["cached_tokens"] == 1024
+
+    _, usage = _read_completion(make_resp({"prompt_tokens": 10, "completion_tokens": 5}))
+    assert usage["cached_tokens"] == 0
+
+
+def test_try_parse_strips_markdown_fences():
+    """Fenced JSON still parses straight into SummaryResult."""
+    raw = "```json\n" + json.dumps({
+        "summary": "Fenced summary",
+        "tags": [],
+        "citations": [{"source_url": "https://x.com", "evidence_snippet": "quote"}],
+        "confidence": 0.5
+    }) + "\n```"
+
+    result = _try_parse(raw)
+
+    assert isinstance(result, SummaryResult)
+    assert result.summary == "Fenced summary"
+
+
+def test_try_parse_wrong_shape_returns_none():
+    """Valid JSON that doesn't match the schema returns None."""
+    assert _try_parse('["not", "an", "object"]') is None
+    assert _try_parse('{"tags": "not-a-list"}') is None
+    assert _try_parse("") is None
+
+
+def _http_error(code, headers=None):
+    import urllib.error
+    from email.message import Message
+    msg = Message()
+    for k, v in (headers or {}).items():
+        msg[k] = v
+    return urllib.error.HTTPError("https://api.openai.com", code, "error", msg, None)
+
+
+def _ok_response():
+    mock = Mock()
+    mock.read.return_value = json.dumps({
+        "choices": [{"message": {"content": json.dumps({
+            "summary": "Recovered.",
+            "tags": [],
+            "citations": [{"source_url": "https://example.com", "evidence_snippet": "Test evidence"}],
+            "confidence": 0.9
+        })}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5}
+    }).encode("utf-8")
+    mock.__enter__ = Mock(return_value=mock)
+    mock.__exit__ = Mock(return_value=False)
+    return mock
+
+
+def test_summarize_retries_transient_http_errors():
+    """429/5xx are retried with backoff before giving up."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="Test evidence"
+    )
+
+    responses = [_http_error(429, {"Retry-After": "1"}), _http_error(503), _ok_response()]
+
+    def fake_urlopen(*args, **kwargs):
+        r = responses.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            with patch("time.sleep") as mock_sleep:
+                result, usage = summarize(item, "Test evidence")
+
+    assert result.summary == "Recovered."
+    assert mock_sleep.call_count == 2
+    assert mock_sleep.call_args_list[0].args[0] == 1.0  # Retry-After honored
+
+
+def test_summarize_does_not_retry_client_errors():
+    """A 400 fails straight to LLM_API_FAIL without sleeping."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence="Test evidence"
+    )
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=_http_error(400)) as mock_urlopen:
+            with patch("time.sleep") as mock_sleep:
+                result, _ = summarize(item, "Test evidence")
+
+    assert result.refusal == LLM_API_FAIL
+    assert mock_urlopen.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_summarize_empty_evidence_skips_api():
+    """Blank evidence refuses with NO_EVIDENCE without an API call."""
+    item = NewsItem(
+        source="test",
+        url="https://example.com",
+        published_at=datetime.now(timezone.utc),
+        title="Test Title",
+        evidence=""
+    )
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen") as mock_urlopen:
+            for evidence in (None, "", "   \n"):
+                result, usage = summarize(item, evidence)
+                assert result.refusal == NO_EVIDENCE
+                assert usage["cost_usd"] == 0.0
+
+    mock_urlopen.assert_not_called()
+
+
+def _batch_items(n):
+    return [
+        NewsItem(
+            source="test",
+            url=f"https://example.com/{i}",
+            published_at=datetime.now(timezone.utc),
+            title=f"Title {i}",
+            evidence=f"Evidence {i}"
+        )
+        for i in range(n)
+    ]
+
+
+def _completion(content, prompt_tokens=90, completion_tokens=30):
+    mock = Mock()
+    mock.read.return_value = json.dumps({
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+    }).encode("utf-8")
+    mock.__enter__ = Mock(return_value=mock)
+    mock.__exit__ = Mock(return_value=False)
+    return mock
+
+
+def test_summarize_batch_one_call_for_many_items():
+    """Items are sent in a single request and results mapped back in order."""
+    from src.clients.llm_openai import summarize_batch
+
+    items = _batch_items(3)
+    evidences = [it.evidence for it in items]
+    batch_output = {"results": [
+        {"summary": f"Summary {i}", "tags": [],
+         "citations": [{"source_url": str(items[i].url), "evidence_snippet": f"Evidence {i}"}],
+         "confidence": 0.9}
+        for i in range(3)
+    ]}
+    captured = []
+
+    def fake_urlopen(req, **kwargs):
+        captured.append(json.loads(req.data))
+        return _completion(json.dumps(batch_output))
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            results = summarize_batch(items, evidences)
+
+    assert len(captured) == 1
+    assert [r.summary for r, _ in results] == ["Summary 0", "Summary 1", "Summary 2"]
+    assert sum(u["prompt_tokens"] for _, u in results) == 90
+    assert sum(u["completion_tokens"] for _, u in results) == 30
+
+
+def test_summarize_batch_falls_back_per_item_on_count_mismatch():
+    """If the batch response can't be matched to items, each item is summarized alone."""
+    from src.clients.llm_openai import summarize_batch
+
+    items = _batch_items(2)
+    single = {"summary": "Solo", "tags": [],
+              "citations": [{"source_url": "https://example.com", "evidence_snippet": "Evidence"}],
+              "confidence": 0.8}
+    responses = [
+        _completion(json.dumps({"results": [single]})),  # one result for two items
+        _completion(json.dumps(single)),
+        _completion(json.dumps(single)),
+    ]
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen", side_effect=responses) as mock_urlopen:
+            results = summarize_batch(items, [it.evidence for it in items])
+
+    assert mock_urlopen.call_count == 3
+    assert [r.summary for r, _ in results] == ["Solo", "Solo"]
+
+
+def test_summarize_batch_refuses_empty_evidence_locally():
+    """Items without evidence are refused without being sent."""
+    from src.clients.llm_openai import summarize_batch
+
+    items = _batch_items(1)
+
+    with patch("src.clients.llm_openai.OPENAI_API_KEY", "fake-key"):
+        with patch("urllib.request.urlopen") as mock_urlopen:
+            results = summarize_batch(items, [""])
+
+    assert results[0][0].refusal == NO_EVIDENCE
+    mock_urlopen.assert_not_called()
@@ -0,0 +1,104 @@
+import json
+import logging
+
+from src.logging_utils import log_event, log_event_deferred, flush_deferred
+
+
+def test_log_event_emits_json_line(caplog):
+    with caplog.at_level(logging.INFO, logger="news_digest"):
+        log_event("unit_test_event", run_id="abc", count=3)
+
+    payload = json.loads(caplog.records[-1].getMessage())
+    assert payload["event"] == "unit_test_event"
+    assert payload["run_id"] == "abc"
+    assert payload["count"] == 3
+    assert "ts" in payload
+
+
+def test_log_event_deferred_written_after_flush(caplog):
+    with caplog.at_level(logging.INFO, logger="news_digest"):
+        log_event_deferred("deferred_event_1", n=1)
+        log_event_deferred("deferred_event_2", n=2)
+        flush_deferred()
+
+    events = [json.loads(r.getMessage())["event"] for r in caplog.records]
+    assert events[-2:] == ["deferred_event_1", "deferred_event_2"]
+
+
+def test_buffered_handler_batches_until_flush(capsys):
+    from src.logging_utils import _BufferedStreamHandler
+
+    handler = _BufferedStreamHandler(capacity=3)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger("news_digest.test_buffer")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    try:
+        log.info("one")
+        log.info("two")
+        assert capsys.readouterr().err == ""
+
+        log.info("three")  # capacity reached
+        assert capsys.readouterr().err == "one\ntwo\nthree\n"
+
+        log.info("four")
+        log.warning("five")  # warnings flush immediately
+        assert capsys.readouterr().err == "four\nfive\n"
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+
+
+def test_buffered_handler_flushes_lone_record_on_timer(capsys):
+    """A single INFO record is written within the interval with no further logging."""
+    import time
+    from src.logging_utils import _BufferedStreamHandler
+
+    handler = _BufferedStreamHandler(flush_interval_s=0.05)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger("news_digest.test_buffer_timer")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    try:
+        log.info("lone")
+        err = ""
+        deadline = time.monotonic() + 2.0
+        while "lone" not in err and time.monotonic() < deadline:
+            time.sleep(0.01)
+            err += capsys.readouterr().err
+        assert err == "lone\n"
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+
+
+def test_utc_iso_matches_datetime_isoformat():
+    from datetime import datetime, timezone
+    from src.logging_utils import _utc_iso
+
+    for t in (1768435200.0, 1768435200.25, 1768435201.5, 1768435201.000123):
+        expected = datetime.fromtimestamp(t, timezone.utc).isoformat()
+        assert _utc_iso(t)[:19] == expected[:19]
+        assert _utc_iso(t).endswith("+00:00")
+    assert _utc_iso(1768435200.0) == "2026-01-15T00:00:00+00:00"
+    assert _utc_iso(1768435200.25) == "2026-01-15T00:00:00.250000+00:00"
+
+
+def test_log_event_skips_serialization_when_info_disabled(monkeypatch):
+    import src.logging_utils as lu
+
+    calls = []
+    monkeypatch.setattr(lu, "_emit", lambda *a: calls.append(a))
+    log = logging.getLogger("news_digest")
+    old_level = log.level
+    log.setLevel(logging.WARNING)
+    try:
+        lu.log_event("quiet_event", n=1)
+        lu.log_event_deferred("quiet_deferred", n=2)
+        lu.flush_deferred()
+    finally:
+        log.setLevel(old_level)
+
+    assert calls == []
@@ -9,6 +9,7 @@ from src.repo import (
     get_run_failures_with_sources, insert_run_artifact, get_run_artifacts,
     get_run_by_day, report_top_sources,
     report_failures_by_code, update_run_llm_stats, get_run_by_id,
+    get_dates_with_run_ratings, upsert_run_feedback,
 )
 from src.schemas import NewsItem
 
@@ -465,4 +466,84 @@ def test_upsert_run_failures_without_sources_backwards_compatible(tmp_path, monk
         assert result["by_code"] == {"SOME_ERROR": 3}
         assert result["failed_sources"] == {}  # Empty, not error
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def test_run_writes_can_share_one_transaction(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setenv("NEWS_DB_PATH", str(db_file))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        start_run(conn, "run_tx", "2026-01-15T00:00:00+00:00", received=0, run_type="eval")
+
+        finish_run_ok(conn, "run_tx", "2026-01-15T00:01:00+00:00",
+                      after_dedupe=3, inserted=2, duplicates=1, commit=False)
+        upsert_run_failures(conn, run_id="run_tx", breakdown={"X": 1}, commit=False)
+        insert_run_artifact(conn, run_id="run_tx", kind="eval_report", path="r.md", commit=False)
+        assert conn.in_transaction
+        conn.rollback()
+
+        assert get_run_by_id(conn, run_id="run_tx")["status"] == "started"
+        assert get_run_failures_with_sources(conn, run_id="run_tx")["by_code"] == {}
+        assert get_run_artifacts(conn, run_id="run_tx") == {}
+    finally:
+        conn.close()
+
+
+def test_get_dates_with_run_ratings_matches_per_day_lookups(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        insert_news_items(conn, [
+            NewsItem(source="s", url=f"https://example.com/{day}", published_at=f"{day}T12:00:00Z",
+                     title=f"Item {day}", evidence="e")
+            for day in ("2026-01-10", "2026-01-11", "2026-01-12")
+        ])
+        # Two global runs on the 11th (latest one rated), one user run on the 12th
+        start_run(conn, "old", datetime(2026, 1, 11, 1, tzinfo=timezone.utc), 1)
+        start_run(conn, "new", datetime(2026, 1, 11, 9, tzinfo=timezone.utc), 1)
+        start_run(conn, "mine", datetime(2026, 1, 12, 9, tzinfo=timezone.utc), 1, user_id="u1")
+        upsert_run_feedback(conn, run_id="new", rating=4, comment=None,
+                            created_at="2026-01-11T10:00:00Z", updated_at="2026-01-11T10:00:00Z")
+        upsert_run_feedback(conn, run_id="mine", rating=2, comment=None,
+                            created_at="2026-01-12T10:00:00Z", updated_at="2026-01-12T10:00:00Z", user_id="u1")
+
+        assert get_dates_with_run_ratings(conn, limit=10) == [
+            {"day": "2026-01-12", "run_id": None, "rating": 0},
+            {"day": "2026-01-11", "run_id": "new", "rating": 4},
+            {"day": "2026-01-10", "run_id": None, "rating": 0},
+        ]
+        assert get_dates_with_run_ratings(conn, limit=1, user_id="u1") == [
+            {"day": "2026-01-12", "run_id": "mine", "rating": 2},
+        ]
+        assert get_dates_with_run_ratings(conn, limit=2, offset=2) == [
+            {"day": "2026-01-10", "run_id": None, "rating": 0},
+        ]
+    finally:
+        conn.close()
+
+
+def test_insert_news_items_counts_mixed_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DB_PATH", str(tmp_path / "test.db"))
+
+    conn = get_conn()
+    try:
+        init_db(conn)
+        items = [
+            NewsItem(source="s", url=f"https://example.com/{i}", published_at="2026-01-10T12:00:00Z",
+                     title=f"Item {i}", evidence="e")
+            for i in range(3)
+        ]
+        insert_news_items(conn, items[:1])
+
+        # One already stored, one repeated within the batch, two new
+        result = insert_news_items(conn, items + items[2:])
+
+        assert result == {"inserted": 2, "duplicates": 2}
+        assert insert_news_items(conn, []) == {"inserted": 0, "duplicates": 0}
+        assert conn.execute("SELECT COUNT(*) FROM news_items;").fetchone()[0] == 3
+    finally:
+        conn.close()
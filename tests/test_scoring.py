@@ -153,3 +153,26 @@ def test_top_n_truncates():
     ranked = rank_items([b, c, a], now=now, top_n=2, cfg=cfg)
     assert len(ranked) == 2
     assert ranked[0].url == a.url
+
+
+def test_rank_items_normalizes_terms_once(monkeypatch):
+    import src.scoring as scoring
+
+    now = datetime(2026, 1, 13, 12, 0, 0, tzinfo=timezone.utc)
+    cfg = RankConfig(topics=["  AI ", ""], keyword_boosts={"Merger": 2.0}, source_weights={})
+    items = [
+        NewsItem(source="blog", url=f"https://a.com/{i}", published_at=now,
+                 title=f"AI merger {i}", evidence="")
+        for i in range(5)
+    ]
+    calls = []
+    real = scoring.match_terms
+    monkeypatch.setattr(scoring, "match_terms", lambda c: (calls.append(1), real(c))[1])
+
+    ranked = rank_items(items, now=now, top_n=5, cfg=cfg)
+
+    assert len(ranked) == 5
+    assert len(calls) == 1
+    breakdown = scoring.compute_score_breakdown(items[0], now=now, cfg=cfg)
+    assert breakdown.matched_topics == ["  AI "]
+    assert breakdown.matched_keywords == [{"keyword": "Merger", "boost": 2.0}]
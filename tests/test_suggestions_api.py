@@ -152,6 +152,28 @@ class TestGenerateSuggestions:
         assert data["status"] == "skipped"
         assert "reason" in data
 
+    def test_advisor_runs_on_its_own_pool(self, auth_client, monkeypatch):
+        """The advisor call runs off the shared worker threads, with its own conn."""
+        import threading
+        import src.advisor
+
+        seen = {}
+
+        def fake_run_advisor(user_id, conn):
+            seen["thread"] = threading.current_thread().name
+            seen["conn"] = conn
+            return {"status": "completed", "suggestions": []}
+
+        monkeypatch.setattr("src.main.query_user_feedback", lambda conn, *, user_id: {})
+        monkeypatch.setattr(src.advisor, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(src.advisor, "run_advisor", fake_run_advisor)
+
+        resp = auth_client.post("/api/suggestions/generate")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "completed"
+        assert seen["thread"].startswith("advisor")
+        assert seen["conn"] is not None
+
 
 class TestAcceptSuggestion:
     """Tests for POST /api/suggestions/{id}/accept."""
@@ -220,6 +242,27 @@ class TestAcceptSuggestion:
         resp = auth_client.post("/api/suggestions/9999/accept")
         assert resp.status_code == 404
 
+    def test_accept_rolls_back_config_when_outcome_fails(self, user_with_suggestion, monkeypatch):
+        """Config, status and outcome commit together; a failed outcome leaves all unchanged."""
+        def failing_insert_outcome(conn, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr("src.main.insert_outcome", failing_insert_outcome)
+
+        client = TestClient(app, raise_server_exceptions=False)
+        client.cookies = user_with_suggestion["client"].cookies
+        suggestion_id = user_with_suggestion["suggestion_id"]
+
+        resp = client.post(f"/api/suggestions/{suggestion_id}/accept")
+        assert resp.status_code == 500
+
+        conn = get_conn()
+        config = get_user_config(conn, user_id=user_with_suggestion["user_id"])
+        suggestion = get_suggestion_by_id(conn, suggestion_id=suggestion_id)
+        conn.close()
+        assert not config or "techcrunch" not in config.get("source_weights", {})
+        assert suggestion["status"] == "pending"
+
 
 class TestRejectSuggestion:
     """Tests for POST /api/suggestions/{id}/reject."""
@@ -310,6 +353,61 @@ class TestAcceptAll:
         assert len(data["results"]) == 1
         assert data["results"][0]["status"] == "accepted"
 
+    def test_accept_all_applies_every_suggestion_in_one_batch(self, user_with_suggestion):
+        """Config changes accumulate across the batch; stats count every accept."""
+        client = user_with_suggestion["client"]
+        user_id = user_with_suggestion["user_id"]
+
+        conn = get_conn()
+        for topic in ("rust", "wasm"):
+            insert_suggestion(
+                conn,
+                user_id=user_id,
+                suggestion_type="add_topic",
+                field="topics",
+                target_key=None,
+                current_value=None,
+                suggested_value=topic,
+                evidence_items=[{"url": "b", "title": "b"}] * 3,
+                reason=f"You liked {topic}",
+            )
+        insert_suggestion(
+            conn,
+            user_id=user_id,
+            suggestion_type="boost_source",
+            field="source_weights",
+            target_key="theverge",
+            current_value="1.0",
+            suggested_value="not-a-number",
+            evidence_items=[{"url": "c", "title": "c"}] * 3,
+            reason="Bad weight",
+        )
+        conn.close()
+
+        resp = client.post("/api/suggestions/accept-all")
+        data = resp.json()
+        assert data["accepted_count"] == 3
+        assert sorted(r["status"] for r in data["results"]) == ["accepted"] * 3 + ["rejected"]
+
+        conn = get_conn()
+        try:
+            config = get_user_config(conn, user_id=user_id)
+            assert sorted(config["topics"]) == ["rust", "wasm"]
+            assert config["source_weights"] == {"techcrunch": 1.3}
+
+            statuses = conn.execute(
+                "SELECT status, COUNT(*) FROM config_suggestions WHERE user_id = ? GROUP BY status",
+                (user_id,),
+            ).fetchall()
+            assert dict(statuses) == {"accepted": 3, "rejected": 1}
+            assert conn.execute("SELECT COUNT(*) FROM suggestion_outcomes").fetchone()[0] == 4
+
+            stats = get_user_profile(conn, user_id=user_id)["acceptance_stats"]
+            assert stats["add_topic"]["accepted"] == 2
+            assert stats["boost_source"]["accepted"] == 1
+        finally:
+            conn.close()
+
 
 class TestUserIsolation:
     """Tests for user isolation - users can only access their own suggestions."""
@@ -7,9 +7,11 @@ from src.repo import (
     create_user,
     insert_suggestion,
     get_pending_suggestions,
+    list_suggestions,
     get_suggestion_by_id,
     update_suggestion_status,
     get_suggestions_for_today,
+    get_generate_gate,
     insert_outcome,
     get_outcomes_by_user,
     get_outcomes_by_type,
@@ -191,6 +193,27 @@ class TestConfigSuggestions:
         accepted = get_pending_suggestions(db_conn, user_id=test_user, status="accepted")
         assert len(accepted) == 1
 
+    def test_list_suggestions_omits_evidence(self, db_conn, test_user):
+        """Listing returns the same rows as get_pending_suggestions without evidence items."""
+        insert_suggestion(
+            db_conn,
+            user_id=test_user,
+            suggestion_type="add_topic",
+            field="topics",
+            current_value=None,
+            suggested_value="kubernetes",
+            evidence_items=[{"url": "a", "title": "a", "feedback": "liked"}] * 3,
+            reason="Topic appears frequently",
+        )
+
+        listed = list_suggestions(db_conn, user_id=test_user)
+        full = get_pending_suggestions(db_conn, user_id=test_user)
+
+        assert len(listed) == 1
+        assert "evidence_items" not in listed[0]
+        assert listed[0]["evidence_count"] == 3
+        assert {k: full[0][k] for k in listed[0]} == listed[0]
+
     def test_get_suggestions_for_today(self, db_conn, test_user):
         """Can get suggestions for idempotency check."""
         insert_suggestion(
@@ -214,6 +237,34 @@ class TestConfigSuggestions:
         suggestions = get_suggestions_for_today(db_conn, user_id=test_user, day="2020-01-01")
         assert len(suggestions) == 0
 
+    def test_get_generate_gate_splits_pending_and_today(self, db_conn, test_user):
+        """One query returns pending ids and ids created on the given day."""
+        from datetime import datetime, timezone
+
+        ids = [
+            insert_suggestion(
+                db_conn,
+                user_id=test_user,
+                suggestion_type="add_topic",
+                field="topics",
+                current_value=None,
+                suggested_value=topic,
+                evidence_items=[{"url": "a", "title": "a", "feedback": "liked"}] * 3,
+                reason="Topic appears frequently",
+            )
+            for topic in ("rust", "wasm")
+        ]
+        update_suggestion_status(db_conn, suggestion_id=ids[0], status="accepted")
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        pending_ids, today_ids = get_generate_gate(db_conn, user_id=test_user, day=today)
+        assert pending_ids == [ids[1]]
+        assert sorted(today_ids) == sorted(ids)
+
+        pending_ids, today_ids = get_generate_gate(db_conn, user_id=test_user, day="2020-01-01")
+        assert pending_ids == [ids[1]]
+        assert today_ids == []
+
     def test_user_isolation_suggestions(self, db_conn, test_user, another_user):
         """User A cannot see User B's suggestions."""
         # User A's suggestion
@@ -92,6 +92,68 @@ def test_ui_date_400_invalid_date_returns_html(client: TestClient):
     assert "Invalid date" in resp.text
 
 
+def test_ui_date_reuses_rendered_page_until_content_changes(client: TestClient, monkeypatch):
+    import src.main as main_mod
+
+    day = "2026-01-20"
+    seed_items_for_day(day)
+
+    calls = []
+    real_build = main_mod.build_ranked_display_items
+
+    def counting_build(*args, **kwargs):
+        calls.append(1)
+        return real_build(*args, **kwargs)
+
+    client.get(f"/ui/date/{day}")  # generates and caches feedback tags, so isn't stored
+
+    monkeypatch.setattr(main_mod, "build_ranked_display_items", counting_build)
+
+    first = client.get(f"/ui/date/{day}")
+    second = client.get(f"/ui/date/{day}")
+    assert second.text == first.text
+    assert len(calls) == 1
+
+    conn = get_conn()
+    try:
+        insert_news_items(conn, [NewsItem(
+            source="test-source",
+            url=f"https://example.com/{day}/article-3",
+            published_at=datetime.fromisoformat(f"{day}T10:00:00+00:00"),
+            title="Test Article Three",
+            evidence="Evidence for article three",
+        )])
+    finally:
+        conn.close()
+
+    third = client.get(f"/ui/date/{day}")
+    assert "Test Article Three" in third.text
+    assert len(calls) == 2
+
+
+def test_ui_date_page_cache_sees_regenerated_tags(client: TestClient):
+    from src.repo import set_cached_tags
+
+    day = "2026-01-21"
+    item_ids = seed_items_for_day(day)
+    conn = get_conn()
+    try:
+        start_run(conn, "tags-run", datetime.fromisoformat(f"{day}T12:00:00+00:00"), received=2)
+    finally:
+        conn.close()
+
+    client.get(f"/ui/date/{day}")  # renders and caches the page (tags generated on demand)
+    assert "Freshly Regenerated" not in client.get(f"/ui/date/{day}").text
+
+    conn = get_conn()
+    try:
+        set_cached_tags(conn, item_id=item_ids[0], tags=["Freshly Regenerated"])
+    finally:
+        conn.close()
+
+    assert "Freshly Regenerated" in client.get(f"/ui/date/{day}").text
+
+
 # --- /ui/item/{id} tests ---
 
 def test_ui_item_renders_detail(client: TestClient):
@@ -383,27 +445,61 @@ def test_suggestions_page_missing_values_hides_boost_label(tmp_path, monkeypatch
     assert "Big boost" not in resp.text
 
 
-def test_boost_label_helpers():
-    """Unit tests for _compute_boost_label and _format_weight_details."""
-    from src.main import _compute_boost_label, _format_weight_details
+def test_build_display_fields():
+    """Unit tests for _build_display_fields."""
+    from src.main import _build_display_fields
 
     # Both values present and numeric
-    assert _compute_boost_label("1.0", "1.1", "boost") == "Small boost"
-    assert _compute_boost_label("1.0", "1.2", "boost") == "Moderate boost"
-    assert _compute_boost_label("1.0", "1.4", "boost") == "Big boost"
-    assert _compute_boost_label("1.0", "0.8", "reduction") == "Moderate reduction"
-
-    # Missing values → None
-    assert _compute_boost_label(None, "1.3", "boost") is None
-    assert _compute_boost_label("1.0", None, "boost") is None
-    assert _compute_boost_label(None, None, "boost") is None
-
-    # Non-numeric → None
-    assert _compute_boost_label("abc", "1.3", "boost") is None
-    assert _compute_boost_label("1.0", "xyz", "boost") is None
-
-    # Details formatting
-    assert _format_weight_details("1.0", "1.3") == "Current: 1.0 → Proposed: 1.3"
-    assert _format_weight_details(None, "1.3") == "Weight adjustment"
-    assert _format_weight_details("1.0", None) == "Weight adjustment"
-    assert _format_weight_details("abc", "1.3") == "Weight adjustment"
+    assert _build_display_fields("1.0", "1.1", "boost") == ("Small boost", "Current: 1.0 → Proposed: 1.1")
+    assert _build_display_fields("1.0", "1.2", "boost")[0] == "Moderate boost"
+    assert _build_display_fields("1.0", "1.4", "boost")[0] == "Big boost"
+    assert _build_display_fields("1.0", "0.8", "reduction")[0] == "Moderate reduction"
+
+    # Threshold deltas are inclusive
+    assert _build_display_fields("1.0", "1.25", "boost")[0] == "Moderate boost"
+
+    # Missing values → neutral fields
+    assert _build_display_fields(None, "1.3", "boost") == (None, "Weight adjustment")
+    assert _build_display_fields("1.0", None, "boost") == (None, "Weight adjustment")
+    assert _build_display_fields(None, None, "boost") == (None, "Weight adjustment")
+
+    # Non-numeric → neutral fields
+    assert _build_display_fields("abc", "1.3", "boost") == (None, "Weight adjustment")
+    assert _build_display_fields("1.0", "xyz", "boost") == (None, "Weight adjustment")
+
+
+def test_ui_date_gzipped_when_accepted(client: TestClient):
+    day = "2026-01-20"
+    seed_items_for_day(day)
+
+    resp = client.get(f"/ui/date/{day}", headers={"Accept-Encoding": "gzip"})
+    plain = client.get(f"/ui/date/{day}", headers={"Accept-Encoding": "identity"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert resp.text == plain.text  # httpx decodes the gzip body
+
+
+def test_templates_served_from_env_cache_without_auto_reload(client: TestClient, monkeypatch):
+    """With auto reload off (NEWS_TEMPLATE_AUTO_RELOAD=0), repeat renders never touch the loader."""
+    from src import main
+
+    env = main.templates.env
+    monkeypatch.setattr(env, "auto_reload", False)
+    env.cache.clear()
+
+    loads = []
+    original_get_source = env.loader.get_source
+
+    def counting_get_source(environment, name):
+        loads.append(name)
+        return original_get_source(environment, name)
+
+    monkeypatch.setattr(env.loader, "get_source", counting_get_source)
+
+    assert client.get("/ui/config").status_code == 200
+    first_loads = list(loads)
+    assert "config.html" in first_loads
+
+    assert client.get("/ui/config").status_code == 200
+    assert loads == first_loads  # second render came from the compiled-template cache